@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du coût d'import de ``main`` et des modules de ``src.etl``.
+
+Chaque module est importé dans un interpréteur neuf lancé avec
+``python -X importtime`` (meilleur de ``--repeat`` exécutions). Pour chaque
+module sont affichés le temps d'import cumulé, le nombre de modules chargés
+et les dépendances lourdes tirées par l'import, dont la pile base de données
+(SQLAlchemy, ``src.etl.load``, ``src.etl.elt``) qu'une exécution limitée à
+l'extraction ou à la transformation ne doit pas charger.
+
+``--baseline`` compare les temps à une référence (écart relatif
+``--threshold`` et absolu ``--min-delta`` en secondes, comme
+``bench_pipeline.py``) ; le code de sortie vaut 1 en cas de régression ou si
+un module importe la pile base de données sans y être autorisé.
+
+Utilisation :
+    python benchmark/bench_import_time.py [--modules main src.etl.transform]
+        [--repeat 5] [--baseline benchmark/import_baseline.json] [--update-baseline]
+"""
+import argparse
+import json
+import platform
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "main",
+    "src.etl.extract",
+    "src.etl.transform",
+    "src.etl.merge",
+    "src.etl.handoff",
+    "src.etl.instrumentation",
+    "src.etl.profiling",
+    "src.etl.metrics",
+    "src.etl.load",
+    "src.etl.elt",
+]
+
+# dépendances suivies (paquets de premier niveau ou modules du dépôt)
+HEAVY_MODULES = [
+    "pandas", "numpy", "pyarrow", "sqlalchemy", "prometheus_client",
+    "psutil", "yaml", "dotenv", "unidecode", "pyparsing",
+    "src.etl.load", "src.etl.elt", "src.etl.cache",
+]
+
+# pile base de données, interdite hors des modules de chargement
+DB_STACK = ["sqlalchemy", "src.etl.load", "src.etl.elt", "src.etl.cache"]
+DB_MODULES = {"src.etl.load", "src.etl.elt", "src.etl.cache", "src.etl.load_async"}
+
+DEFAULT_BASELINE = ROOT / "benchmark" / "import_baseline.json"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def fct_import_time(module: str) -> Dict[str, int]:
+    """
+    Importe ``module`` dans un nouvel interpréteur ``-X importtime``.
+
+    Retour :
+        dict : module chargé -> temps cumulé (µs), tel que rapporté par
+        ``-X importtime`` (premier import de chaque module)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def bench_module(module: str, repeat: int) -> Dict:
+    """
+    Meilleur temps d'import de ``module`` sur ``repeat`` interpréteurs neufs.
+
+    Retour :
+        dict : ``seconds``, ``modules`` (nombre de modules chargés) et
+        ``heavy`` (dépendances suivies -> secondes, imports du meilleur run)
+    """
+    runs = [fct_import_time(module) for _ in range(repeat)]
+    best = min(runs, key=lambda timings: timings.get(module, 0))
+    return {
+        "seconds": best.get(module, 0) / 1e6,
+        "modules": len(best),
+        "heavy": {name: best[name] / 1e6 for name in HEAVY_MODULES if name in best},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="écart relatif toléré (0.2 : +20 %%)")
+    parser.add_argument("--min-delta", type=float, default=0.02,
+                        help="écart absolu minimal (s) pour signaler une régression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="écrire aussi les mesures détaillées (JSON)")
+    args = parser.parse_args()
+
+    results = {module: bench_module(module, args.repeat) for module in args.modules}
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        content = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline = content["results"]
+        print(f"Référence : {args.baseline} ({content.get('machine', '?')})")
+
+    failures = []
+    print(f"\n{'module':<26}{'modules':>9}{'import':>12}{'référence':>12}{'écart':>9}  pile BD")
+    for module, result in results.items():
+        seconds = result["seconds"]
+        reference = baseline.get(module)
+        delta, status = "", ""
+        if reference is not None:
+            ratio = seconds / reference - 1 if reference else 0.0
+            delta = f"{ratio:+.0%}"
+            if ratio > args.threshold and seconds - reference > args.min_delta:
+                status = "RÉGRESSION"
+                failures.append(module)
+        db_stack = [name for name in DB_STACK if name in result["heavy"] and name != module]
+        if db_stack and module not in DB_MODULES:
+            status = f"{status} PILE BD".strip()
+            failures.append(module)
+        reference_text = f"{reference * 1000:>9.1f} ms" if reference is not None else " " * 12
+        print(f"{module:<26}{result['modules']:>9}{seconds * 1000:>9.1f} ms{reference_text}{delta:>9}  "
+              f"{', '.join(db_stack) or '-'}  {status}")
+
+    if "main" in results:
+        print("\nDépendances chargées par main :")
+        for name, seconds in sorted(results["main"]["heavy"].items(), key=lambda item: -item[1]):
+            print(f"  {name:<22}{seconds * 1000:>9.1f} ms")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({
+            "machine": f"{platform.node()} {platform.machine()} Python {platform.python_version()}",
+            "results": {module: result["seconds"] for module, result in results.items()},
+        }, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"\nRéférence mise à jour : {args.baseline}")
+    elif not baseline:
+        print(f"\nAucune référence ({args.baseline}) : relancer avec --update-baseline pour l'enregistrer")
+
+    if failures:
+        print(f"\nÉchec : {', '.join(sorted(set(failures)))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du chargement : ``DataFrame.to_sql(method="multi")`` contre
+``copy_dataframe_to_table`` (COPY FROM STDIN) sur un PostgreSQL local.
+
+Utilisation :
+    DB_HOST=localhost DB_DATABASE=worldcup_bench DB_USER=... DB_PASSWORD=... \\
+        python benchmark/bench_load_copy.py [--rows 200000] [--chunksize 50000]
+
+La table ``bench_matches`` est créée puis supprimée dans la base indiquée.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from benchmark.synthetic import fct_synthetic_matches
+from src.etl.load import create_postgres_engine, copy_dataframe_to_table
+
+TABLE = "bench_matches"
+
+
+def reset_table(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(text(
+            f"CREATE TABLE {TABLE} (match_id INTEGER, date DATE, home_team VARCHAR(100), "
+            "away_team VARCHAR(100), home_result INTEGER, away_result INTEGER, "
+            "stage VARCHAR(50), edition INTEGER, city VARCHAR(100))"
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    load_dotenv()
+    engine = create_postgres_engine(
+        host=os.getenv("DB_HOST", "localhost"),
+        database=os.getenv("DB_DATABASE"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD")
+    )
+    df = fct_synthetic_matches(args.rows)
+    print(f"{len(df)} lignes")
+
+    reset_table(engine)
+    start = time.perf_counter()
+    df.to_sql(TABLE, engine, if_exists="append", index=False, method="multi",
+              chunksize=args.chunksize)
+    t_to_sql = time.perf_counter() - start
+
+    reset_table(engine)
+    start = time.perf_counter()
+    copy_dataframe_to_table(df, TABLE, engine, chunksize=args.chunksize)
+    t_copy = time.perf_counter() - start
+
+    with engine.begin() as conn:
+        n_loaded = conn.execute(text(f"SELECT count(*) FROM {TABLE}")).scalar()
+        conn.execute(text(f"DROP TABLE {TABLE}"))
+    assert n_loaded == len(df)
+
+    print(f"to_sql(method='multi') : {t_to_sql:7.2f} s  ({len(df) / t_to_sql:,.0f} lignes/s)")
+    print(f"COPY FROM STDIN        : {t_copy:7.2f} s  ({len(df) / t_copy:,.0f} lignes/s, x{t_to_sql / t_copy:.1f})")
+
+
+if __name__ == "__main__":
+    main()
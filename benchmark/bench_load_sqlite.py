@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du chargement SQLite local : ``DataFrame.to_sql`` (journal par
+défaut, une transaction par morceau) contre ``sqlite_load_table`` (WAL,
+synchronous=OFF, executemany dans une seule transaction, index construits
+après le chargement). Ne nécessite aucun serveur.
+
+Utilisation :
+    python benchmark/bench_load_sqlite.py [--rows 200000] [--chunksize 50000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import MetaData, create_engine, text
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from benchmark.synthetic import fct_bench_matches
+from src.etl.load import build_matches_table, create_sqlite_engine, sqlite_load_table
+
+INDEXES = ["home_team", "away_team", "date"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = fct_bench_matches(args.rows)
+    chunks = [df.iloc[i:i + args.chunksize] for i in range(0, len(df), args.chunksize)]
+    workdir = Path(tempfile.mkdtemp())
+    print(f"{len(df)} lignes")
+
+    # Référence : to_sql morceau par morceau, index créés avec la table
+    engine = create_engine(f"sqlite:///{workdir / 'to_sql.db'}")
+    table = build_matches_table(MetaData(), indexes=INDEXES)
+    table.create(engine)
+    start = time.perf_counter()
+    for chunk in chunks:
+        chunk.to_sql("matches", engine, if_exists="append", index=False)
+    t_to_sql = time.perf_counter() - start
+
+    engine = create_sqlite_engine(workdir / "sink.db")
+    start = time.perf_counter()
+    n_rows = sqlite_load_table(chunks, build_matches_table(MetaData(), indexes=INDEXES), engine,
+                               chunksize=args.chunksize)
+    t_sink = time.perf_counter() - start
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM matches")).scalar() == n_rows == len(df)
+
+    print(f"to_sql               : {t_to_sql:7.2f} s  ({len(df) / t_to_sql:,.0f} lignes/s)")
+    print(f"sqlite_load_table    : {t_sink:7.2f} s  ({len(df) / t_sink:,.0f} lignes/s, x{t_to_sql / t_sink:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des requêtes usuelles sur ``matches`` avec et sans conception
+physique (index btree home_team / away_team / date, partitionnement LIST par
+édition sur PostgreSQL).
+
+Les deux variantes sont chargées par ``swap_load_table`` (index construits
+après le chargement), puis chaque requête est exécutée ``--repeat`` fois.
+
+Utilisation :
+    # PostgreSQL (variables DB_HOST, DB_DATABASE, DB_USER, DB_PASSWORD)
+    python benchmark/bench_matches_queries.py --postgres [--rows 200000]
+    # SQLite (fichier temporaire ; pas de partitionnement)
+    python benchmark/bench_matches_queries.py [--rows 200000]
+
+Les tables ``bench_plain`` et ``bench_designed`` sont supprimées en fin de run.
+Au-delà de ~240 000 lignes, les rangs par édition dépassent 9 999 :
+``fct_assign_match_id`` lève une ValueError.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import MetaData, text
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from benchmark.synthetic import fct_bench_matches
+from src.etl.load import build_matches_table, build_postgres_dsn, get_engine, swap_load_table
+
+QUERIES = {
+    "édition": ("SELECT * FROM {table} WHERE edition = :edition", {"edition": 1998}),
+    "équipe": (
+        "SELECT * FROM {table} WHERE home_team = :team OR away_team = :team",
+        {"team": "Team 17"}
+    ),
+    "période": (
+        "SELECT * FROM {table} WHERE date BETWEEN :start AND :end",
+        {"start": "1998-06-10", "end": "1998-06-20"}
+    ),
+}
+
+
+def time_query(engine, query: str, params: dict, repeat: int) -> float:
+    """
+    Durée médiane (ms) d'une requête, résultat entièrement lu.
+    """
+    durations = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(query), params).fetchall()
+            durations.append(time.perf_counter() - start)
+    return 1000 * float(np.median(durations))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--postgres", action="store_true")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if args.postgres:
+        dsn = build_postgres_dsn(
+            host=os.getenv("DB_HOST", "localhost"),
+            database=os.getenv("DB_DATABASE"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD")
+        )
+    else:
+        dsn = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = get_engine(dsn)
+    df = fct_bench_matches(args.rows)
+    editions = sorted(int(e) for e in df["edition"].unique())
+    print(f"{len(df)} lignes, {engine.dialect.name}")
+
+    tables = {
+        "sans index": build_matches_table(MetaData(), "bench_plain"),
+        "index + partitions": build_matches_table(
+            MetaData(), "bench_designed",
+            indexes=["home_team", "away_team", "date"],
+            partition_by="edition"
+        ),
+    }
+    timings = {}
+    for label, table in tables.items():
+        start = time.perf_counter()
+        swap_load_table([df], table, engine, partition_values=editions)
+        print(f"chargement {label:<20}: {time.perf_counter() - start:6.2f} s")
+        if args.postgres:
+            with engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {table.name}"))
+        timings[label] = {
+            name: time_query(engine, query.format(table=table.name), params, args.repeat)
+            for name, (query, params) in QUERIES.items()
+        }
+
+    plain, designed = timings.values()
+    print(f"\n{'requête':<10}{'sans index':>14}{'index + partitions':>22}{'gain':>8}")
+    for name in QUERIES:
+        print(f"{name:<10}{plain[name]:>11.2f} ms{designed[name]:>19.2f} ms"
+              f"{plain[name] / designed[name]:>7.1f}x")
+
+    with engine.begin() as conn:
+        for table in tables.values():
+            conn.execute(text(f"DROP TABLE IF EXISTS {table.name}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks du pipeline sur données synthétiques, comparée à une
+référence.
+
+Pour chaque échelle (1x = taille des fichiers d'origine), les sources sont
+générées par ``benchmark/synthetic.py`` puis chaque étape est chronométrée
+(meilleur de ``--repeat`` exécutions) :
+
+- ``extract_<édition>`` : ``fct_read_csv`` / ``fct_read_json_nested`` ;
+- ``transform_<édition>`` : les quatre transformations ;
+- ``merge`` : écriture des runs triés et fusion k-way ;
+- ``load`` : ``sqlite_load_table`` dans un fichier SQLite temporaire.
+
+Les durées sont comparées à celles du fichier de référence
+(``benchmark/baseline.json``, versionné) : une étape est en régression si
+elle dépasse la référence de plus de ``--threshold`` (relatif) et de plus de
+``--min-delta`` secondes (absolu, pour ignorer le bruit des étapes de
+quelques millisecondes). Le code de sortie vaut 1 en cas de régression, 2 si
+la référence est absente ou ne couvre pas une étape mesurée (sauf
+``--allow-missing-baseline``). ``--update-baseline`` enregistre les mesures
+comme nouvelle référence (à faire sur la machine qui exécute la comparaison).
+
+Utilisation :
+    python benchmark/bench_pipeline.py [--scales 1 10 100] [--repeat 5]
+        [--baseline benchmark/baseline.json] [--threshold 0.2] [--update-baseline]
+
+Les match_id sont ceux attribués par les transformations. Les échelles
+vont jusqu'à ``synthetic.MAX_SCALE`` (1000x) : au-delà de
+``synthetic.MATCHES_PER_EDITION`` matchs par édition, les sources sont
+réparties sur des éditions synthétiques, aucune édition ne dépassant les
+9 999 matchs que permet ``match_id = édition * 10000 + rang``.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+from sqlalchemy import MetaData
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from benchmark.synthetic import fct_write_synthetic_sources
+from src.etl.extract import fct_read_csv, fct_read_json_nested
+from src.etl.load import add_row_hash, build_matches_table, create_sqlite_engine, sqlite_load_table
+from src.etl.merge import fct_merge_sorted_runs, fct_write_sorted_run
+from src.etl.transform import (
+    fct_transform_2010, fct_transform_data_2018, transform_2022_data, trf_file_wcup_2014
+)
+from src.etl.utils import fct_load_config, fct_to_match_date
+
+DEFAULT_BASELINE = ROOT / "benchmark" / "baseline.json"
+
+# édition -> (lecture, clé du chemin source, transformation), comme main.EDITION_STAGES
+EDITIONS = {
+    "2010": (fct_read_csv, "root_csv_2010", fct_transform_2010),
+    "2014": (fct_read_csv, "root_csv_2014", trf_file_wcup_2014),
+    "2018": (fct_read_json_nested, "root_json_2018", fct_transform_data_2018),
+    "2022": (fct_read_csv, "root_csv_2022", transform_2022_data),
+}
+
+
+def best_of(func: Callable, repeat: int):
+    """
+    Meilleure durée (s) sur ``repeat`` exécutions, et le résultat de la dernière.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def bench_scale(scale: float, repeat: int, config: Dict, workdir: Path) -> Dict[str, Dict]:
+    """
+    Chronomètre chaque étape à une échelle donnée.
+
+    Retour
+    ------
+    dict
+        ``<étape>@<échelle>x`` -> ``{"seconds", "rows", "rows_per_s"}``
+    """
+    config = {**config, **fct_write_synthetic_sources(workdir / "sources", scale)}
+    results = {}
+
+    def record(stage: str, seconds: float, rows: int) -> None:
+        results[f"{stage}@{scale:g}x"] = {
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "rows_per_s": round(rows / seconds) if seconds else None,
+        }
+
+    frames = {}
+    for edition, (read_func, source_key, transform_func) in EDITIONS.items():
+        seconds, extracted = best_of(lambda: read_func(config[source_key]), repeat)
+        record(f"extract_{edition}", seconds,
+               sum(map(len, extracted.values())) if isinstance(extracted, dict) else len(extracted))
+        seconds, frames[edition] = best_of(lambda: transform_func(extracted, config), repeat)
+        record(f"transform_{edition}", seconds, len(frames[edition]))
+
+    run_dir = workdir / "runs"
+    run_dir.mkdir(exist_ok=True)
+
+    def merge() -> List[pd.DataFrame]:
+        run_paths = [fct_write_sorted_run(df, run_dir, edition) for edition, df in frames.items()]
+        return list(fct_merge_sorted_runs(run_paths, key="date"))
+
+    seconds, chunks = best_of(merge, repeat)
+    n_rows = sum(map(len, chunks))
+    record("merge", seconds, n_rows)
+
+    # mêmes conversions que main.run_stages avant le chargement
+    table = build_matches_table(MetaData())
+    chunks = [add_row_hash(chunk.assign(date=fct_to_match_date(chunk["date"])), table) for chunk in chunks]
+
+    def load() -> int:
+        db_path = workdir / "bench.db"
+        db_path.unlink(missing_ok=True)
+        engine = create_sqlite_engine(db_path)
+        try:
+            return sqlite_load_table(chunks, build_matches_table(MetaData()), engine)
+        finally:
+            engine.dispose()
+
+    seconds, n_loaded = best_of(load, repeat)
+    assert n_loaded == n_rows
+    record("load", seconds, n_loaded)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, float], threshold: float, min_delta: float) -> List[str]:
+    """
+    Affiche les mesures face à la référence et renvoie les étapes en régression.
+    """
+    regressions = []
+    print(f"\n{'étape':<22}{'lignes':>10}{'durée':>12}{'référence':>12}{'écart':>9}")
+    for name, result in results.items():
+        seconds = result["seconds"]
+        reference = baseline.get(name)
+        if reference is None:
+            status, delta = "(nouvelle)", ""
+        else:
+            ratio = seconds / reference - 1 if reference else 0.0
+            delta = f"{ratio:+.0%}"
+            regressed = ratio > threshold and seconds - reference > min_delta
+            status = "RÉGRESSION" if regressed else ""
+            if regressed:
+                regressions.append(name)
+        reference_text = f"{reference * 1000:>9.1f} ms" if reference is not None else " " * 12
+        print(f"{name:<22}{result['rows']:>10}{seconds * 1000:>9.1f} ms{reference_text}{delta:>9}  {status}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="écart relatif toléré (0.2 : +20 %%)")
+    parser.add_argument("--min-delta", type=float, default=0.02,
+                        help="écart absolu minimal (s) pour signaler une régression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="ne pas échouer si la référence est absente ou incomplète")
+    parser.add_argument("--output", type=Path, help="écrire aussi les mesures détaillées (JSON)")
+    args = parser.parse_args()
+
+    config = fct_load_config(str(ROOT / "config.yaml"))
+    results = {}
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(prefix="etl_bench_") as workdir:
+            results.update(bench_scale(scale, args.repeat, config, Path(workdir)))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        baseline = {
+            "machine": f"{platform.node()} {platform.machine()} Python {platform.python_version()}",
+            "results": {**baseline.get("results", {}),
+                        **{name: result["seconds"] for name, result in results.items()}},
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding="utf-8")
+        compare(results, {}, args.threshold, args.min_delta)
+        print(f"\nRéférence mise à jour : {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        compare(results, {}, args.threshold, args.min_delta)
+        print(f"\nAucune référence ({args.baseline}) : relancer avec --update-baseline pour l'enregistrer")
+        if not args.allow_missing_baseline:
+            sys.exit(2)
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    print(f"Référence : {args.baseline} ({baseline.get('machine', '?')})")
+    regressions = compare(results, baseline["results"], args.threshold, args.min_delta)
+    missing = [name for name in results if name not in baseline["results"]]
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de +{args.threshold:.0%} : {', '.join(regressions)}")
+        sys.exit(1)
+    if missing:
+        print(f"\nÉtapes absentes de la référence : {', '.join(missing)}")
+        if not args.allow_missing_baseline:
+            sys.exit(2)
+        return
+    print("\nAucune régression")
+
+
+if __name__ == "__main__":
+    main()
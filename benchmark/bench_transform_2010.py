@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du parsing des scores et des équipes du fichier 1930-2010.
+
+Compare l'ancienne chaîne de traitement (slice + split + deux extractions,
+split des équipes sur '(' en colonnes jetables) à l'extraction en une passe
+par colonne (fct_regex_extract avec SCORE_PATTERN_2010 / TEAM_PATTERN_2010),
+sur le fichier 2010 répliqué 10 fois.
+
+Utilisation :
+    python benchmark/bench_transform_2010.py [--replicate 10] [--repeat 5]
+
+Si ``data/matches_19302010.csv`` est absent, un fichier synthétique au même
+format est généré.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from benchmark.synthetic import fct_synthetic_2010
+from src.etl.extract import fct_read_csv
+from src.etl.transform import SCORE_PATTERN_2010, TEAM_PATTERN_2010, fct_transform_2010
+from src.etl.utils import fct_load_config, fct_regex_extract
+
+
+def legacy_parse(df: pd.DataFrame) -> pd.DataFrame:
+    """Ancienne implémentation du parsing (avant motifs compilés)."""
+    df = df.copy()
+    df['score'] = df['score'].str.slice(0, 3)
+    df[['home_result', 'away_result']] = df['score'].str.split('-', expand=True)
+    for column in ['home_result', 'away_result']:
+        df[column] = (df[column].astype("string")
+                      .str.extract(r"(\d+)", expand=False)
+                      .astype("Int64").fillna(-999))
+    df[['team1', 'team1_lanorig']] = df['team1'].str.split('(', n=1, expand=True)
+    df[['team2', 'team2_lanorig']] = df['team2'].str.split('(', n=1, expand=True)
+    return df
+
+
+def single_pass_parse(df: pd.DataFrame) -> pd.DataFrame:
+    """Nouvelle implémentation : une extraction par colonne."""
+    df = df.copy()
+    df_score = fct_regex_extract(df['score'], SCORE_PATTERN_2010)
+    for column in ['home_result', 'away_result']:
+        df[column] = df_score[column].astype("Int64").fillna(-999)
+    df['team1'] = fct_regex_extract(df['team1'], TEAM_PATTERN_2010)['team']
+    df['team2'] = fct_regex_extract(df['team2'], TEAM_PATTERN_2010)['team']
+    return df
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replicate", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = fct_load_config(str(ROOT / "config.yaml"))
+    source = ROOT / config["root_csv_2010"]
+    df_source = fct_read_csv(str(source)) if source.exists() else fct_synthetic_2010()
+    df = pd.concat([df_source] * args.replicate, ignore_index=True)
+    print(f"{len(df)} lignes ({len(df_source)} x {args.replicate})")
+
+    t_legacy = best_of(legacy_parse, df, args.repeat)
+    t_single = best_of(single_pass_parse, df, args.repeat)
+    t_full = best_of(lambda d: fct_transform_2010(d.copy(), config), df, args.repeat)
+
+    print(f"parsing ancien      : {t_legacy * 1000:8.1f} ms")
+    print(f"parsing une passe   : {t_single * 1000:8.1f} ms  (x{t_legacy / t_single:.2f})")
+    print(f"fct_transform_2010  : {t_full * 1000:8.1f} ms  ({len(df) / t_full:,.0f} lignes/s)")
+
+
+if __name__ == "__main__":
+    main()
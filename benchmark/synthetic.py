@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de données synthétiques pour les benchmarks.
+
+Produit des fichiers au format de chaque source, avec les particularités
+que traitent les transformations :
+
+- 1930-2010 (CSV) : scores ``"2-1 (1-0) a.e.t. 4-3 PSO"``, équipes
+  ``"France (Frankreich)"``, villes suffixées d'un point, doublons ;
+- 2014 (CSV) : ``Datetime`` ``"12 Jun 2014 - 17:00 "``, villes avec espace
+  final, noms d'équipes à corriger (``C�te d'Ivoire``) ;
+- 2018 (JSON imbriqué) : équipes, stades, chaînes TV, groupes et tours à
+  élimination directe référencés par identifiant ;
+- 2022 (CSV) : équipes en majuscules, heures ``"17 : 00"``.
+
+L'échelle 1 correspond à la taille des fichiers d'origine (``BASE_ROWS``) ;
+les benchmarks vont de 1x à ``MAX_SCALE`` (1000x). Un match_id valant
+``édition * 10000 + rang``, une édition compte au plus 9 999 matchs : au-delà
+de ``MATCHES_PER_EDITION`` matchs par édition, les lignes d'une source sont
+réparties sur des éditions synthétiques supplémentaires, propres à chaque
+source (``fct_synthetic_editions``). Les données sont déterministes pour une
+graine donnée.
+
+Utilisation :
+    python benchmark/synthetic.py OUTPUT_DIR [--scale 10] [--seed 0]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.etl.utils import MATCH_ID_EDITION_FACTOR, fct_assign_match_id
+
+# matchs par source à l'échelle 1
+BASE_ROWS = {"2010": 900, "2014": 64, "2018": 64, "2022": 64}
+
+# plus grande échelle des benchmarks
+MAX_SCALE = 1000
+
+# matchs par édition au-delà desquels une source s'étend sur des éditions
+# synthétiques (marge sous MATCH_ID_EDITION_FACTOR pour le tirage aléatoire 2010)
+MATCHES_PER_EDITION = 9 * MATCH_ID_EDITION_FACTOR // 10
+
+# fichiers écrits par fct_write_synthetic_sources (clé de config.yaml -> nom)
+SOURCE_FILES = {
+    "root_csv_2010": "matches_19302010.csv",
+    "root_csv_2014": "WorldCupMatches2014.csv",
+    "root_json_2018": "data_2018.json",
+    "root_csv_2022": "Fifa_world_cup_matches.csv",
+}
+
+TEAMS_2010 = [
+    "France (Frankreich)", "Brazil (Brasilien)", "Italy (Italien)", "Germany FR (Deutschland BR)",
+    "Korea Republic (Südkorea)", "Uruguay (Uruguay)", "Mexico (Mexiko)", "Argentina (Argentinien)",
+    "Czechoslovakia (Tschechoslowakei)", "England", "Spain (Spanien)", "Chile",
+]
+ROUNDS_2010 = [
+    "GROUP_STAGE", "GROUP_STAGE", "GROUP_STAGE", "1/8_FINAL", "1/4_FINAL", "1/2_FINAL",
+    "PLACES_3&4", "_FINAL", "PRELIMINARY-Europe", "PRELIMINARY-S.America", "FINAL_ROUND",
+]
+SCORE_SUFFIXES_2010 = ["", " (1-0)", " (0-0)", " (0-0) a.e.t.", " (1-1) a.e.t. 4-3 PSO"]
+HOSTS_2010 = {
+    1930: "URUGUAY", 1934: "ITALY", 1938: "FRANCE", 1950: "BRAZIL", 1954: "SWITZERLAND",
+    1958: "SWEDEN", 1962: "CHILE", 1966: "ENGLAND", 1970: "MEXICO", 1974: "GERMANY",
+    1978: "ARGENTINA", 1982: "SPAIN", 1986: "MEXICO", 1990: "ITALY", 1994: "USA",
+    1998: "FRANCE", 2002: "KOREA-JAPAN", 2006: "GERMANY", 2010: "SOUTH-AFRICA",
+}
+
+TEAMS = [
+    "Brazil", "Croatia", "Mexico", "Cameroon", "Spain", "Netherlands", "Chile", "Australia",
+    "Colombia", "Greece", "C�te d'Ivoire", "Japan", "Uruguay", "Costa Rica", "England",
+    "Italy", "Switzerland", "Ecuador", "France", "Honduras", "Argentina", 'rn">Bosnia and Herzegovina',
+    "Iran", "Nigeria", "Germany", "Portugal", "Ghana", "USA", "Belgium", "Algeria", "Russia",
+    "Korea Republic",
+]
+CITIES = ["Sao Paulo ", "Natal ", "Salvador ", "Cuiaba ", "Belo Horizonte ", "Fortaleza ",
+          "Manaus ", "Recife ", "Brasilia ", "Porto Alegre ", "Rio De Janeiro ", "Curitiba "]
+STAGES_2014 = [f"Group {g}" for g in "ABCDEFGH"] * 6 + [
+    "Round of 16", "Quarter-finals", "Semi-finals", "Play-off for third place", "Final",
+]
+STAGES_2022 = [f"Group {g}" for g in "ABCDEFGH"] * 6 + [
+    "Round of 16", "Quarter-final", "Semi-final", "Play-off for third place", "Final",
+]
+ROUNDS_2018 = {
+    "round_16": "Round of 16", "round_8": "Quarter-finals", "round_4": "Semi-finals",
+    "round_2_loser": "Third place play-off", "round_2": "Final",
+}
+
+
+def _pairs(rng: np.random.Generator, teams: list, n_rows: int):
+    """
+    Équipes à domicile et à l'extérieur tirées au hasard, toujours distinctes.
+    """
+    home = rng.integers(0, len(teams), n_rows)
+    away = (home + rng.integers(1, len(teams), n_rows)) % len(teams)
+    teams = np.array(teams)
+    return teams[home], teams[away]
+
+
+def fct_synthetic_editions(source: str, n_rows: int) -> list:
+    """
+    Éditions sur lesquelles répartir ``n_rows`` matchs d'une source, à
+    raison d'au plus ``MATCHES_PER_EDITION`` par édition en moyenne.
+
+    Les éditions d'origine viennent en premier ; les éditions synthétiques
+    ne recouvrent ni une édition réelle ni celles d'une autre source (sinon
+    deux partitions attribueraient les mêmes match_id) : années antérieures
+    à 1930 pour 1930-2010, années postérieures à 2022 entrelacées pour 2014,
+    2018 et 2022.
+    """
+    n_editions = -(-n_rows // MATCHES_PER_EDITION)
+    if source == "2010":
+        editions = list(HOSTS_2010)
+        extra = [min(HOSTS_2010) - 4 * (i + 1) for i in range(n_editions - len(editions))]
+    else:
+        editions = [int(source)]
+        offset = ["2014", "2018", "2022"].index(source)
+        extra = [2023 + 3 * i + offset for i in range(n_editions - 1)]
+    return editions + extra
+
+
+def _years(rng: np.random.Generator, source: str, n_rows: int) -> np.ndarray:
+    """
+    Année de chaque ligne d'une source à une seule édition ; aucun tirage
+    tant que l'édition d'origine suffit (données inchangées jusque-là).
+    """
+    editions = fct_synthetic_editions(source, n_rows)
+    if len(editions) == 1:
+        return np.full(n_rows, editions[0])
+    return rng.choice(np.array(editions), n_rows)
+
+
+def _with_year(dates: pd.Index, years: np.ndarray, start: int) -> list:
+    """
+    Remplace l'année (4 caractères à partir de ``start``) de dates formatées.
+    """
+    return [date[:start] + str(year) + date[start + 4:] for date, year in zip(dates, years)]
+
+
+def fct_synthetic_2010(n_rows: int = 900, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère un DataFrame au format de matches_19302010.csv (environ 1 % de
+    lignes dupliquées, supprimées par la transformation).
+    """
+    rng = np.random.default_rng(seed)
+    years = rng.choice(np.array(fct_synthetic_editions("2010", n_rows)), n_rows)
+    team1, team2 = _pairs(rng, TEAMS_2010, n_rows)
+    home = rng.integers(0, 11, n_rows)
+    away = rng.integers(0, 6, n_rows)
+    df = pd.DataFrame({
+        "edition": [f"{year}-{HOSTS_2010.get(year, 'SYNTHETIC')}" for year in years],
+        "round": rng.choice(ROUNDS_2010, n_rows),
+        "score": [f"{h}-{a}{s}" for h, a, s in zip(home, away, rng.choice(SCORE_SUFFIXES_2010, n_rows))],
+        "team1": team1,
+        "team2": team2,
+        "url": [f"https://www.fifa.com/match/{i}" for i in range(n_rows)],
+        "venue": rng.choice(["Montevideo.", "Paris.", "Rome.", "Santa Fe.", "Mexico City."], n_rows),
+        "year": years,
+    })
+    duplicated = rng.random(n_rows) < 0.01
+    df.loc[duplicated, "url"] = "https://www.fifa.com/match/0"
+    df.loc[duplicated, df.columns.drop("url")] = df.loc[0, df.columns.drop("url")].values
+    return df
+
+
+def fct_synthetic_2014(n_rows: int = 64, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère un DataFrame au format de WorldCupMatches2014.csv.
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2014-06-12 13:00")
+    datetimes = start + pd.to_timedelta(rng.integers(0, 32 * 24, n_rows), unit="h")
+    home, away = _pairs(rng, TEAMS, n_rows)
+    years = _years(rng, "2014", n_rows)
+    return pd.DataFrame({
+        "Year": years,
+        "Datetime": _with_year(datetimes.strftime("%d %b %Y - %H:%M "), years, 7),
+        "Stage": rng.choice(STAGES_2014, n_rows),
+        "Stadium": "Arena",
+        "City": rng.choice(CITIES, n_rows),
+        "Home Team Name": home,
+        "Home Team Goals": rng.integers(0, 8, n_rows),
+        "Away Team Goals": rng.integers(0, 8, n_rows),
+        "Away Team Name": away,
+    })
+
+
+def fct_synthetic_2018(n_matches: int = 64, seed: int = 0) -> dict:
+    """
+    Génère le contenu de data_2018.json : 3/4 des matchs en phase de groupes
+    (groupes a à h), le reste réparti sur les tours à élimination directe.
+    """
+    rng = np.random.default_rng(seed)
+    teams = [{"id": i + 1, "name": name, "fifaCode": name[:3].upper(), "iso2": name[:2].lower()}
+             for i, name in enumerate(TEAMS)]
+    stadiums = [{"id": i + 1, "name": f"Stadium {i + 1}", "city": city.strip() + ".", "lat": 55.0, "lng": 37.0}
+                for i, city in enumerate(CITIES)]
+    channels = [{"id": i + 1, "name": f"Channel {i + 1}", "icon": "", "country": "France",
+                 "iso2": "FR", "lang": ["fra"]} for i in range(8)]
+    start = pd.Timestamp("2018-06-14 18:00")
+    n_group = n_matches * 3 // 4
+    years = _years(rng, "2018", n_matches)
+
+    def match(number: int, knockout: bool) -> dict:
+        date = start + pd.Timedelta(hours=int(rng.integers(0, 31 * 24)))
+        date = date.replace(year=int(years[number - 1]))
+        home, away = rng.choice(len(teams), 2, replace=False) + 1
+        result = {
+            "name": number,
+            "type": "winner" if knockout else "group",
+            "home_team": int(home),
+            "away_team": int(away),
+            "home_result": int(rng.integers(0, 6)),
+            "away_result": int(rng.integers(0, 6)),
+            "date": date.strftime("%Y-%m-%dT%H:%M:%S+03:00"),
+            "stadium": int(rng.integers(1, len(stadiums) + 1)),
+            "channels": sorted(int(c) for c in rng.choice(len(channels), 2, replace=False) + 1),
+            "finished": True,
+            "matchday": int(rng.integers(1, 8)),
+        }
+        if knockout:
+            result.update({"home_penalty": None, "away_penalty": None, "winner": int(home)})
+        return result
+
+    numbers = iter(range(1, n_matches + 1))
+    groups = {
+        group: {"name": f"Group {group.upper()}", "winner": 1, "runnerup": 2, "matches": []}
+        for group in "abcdefgh"
+    }
+    for i in range(n_group):
+        groups["abcdefgh"[i % 8]]["matches"].append(match(next(numbers), False))
+    knockout = {key: {"name": name, "matches": []} for key, name in ROUNDS_2018.items()}
+    for i in range(n_matches - n_group):
+        knockout[list(ROUNDS_2018)[i % len(ROUNDS_2018)]]["matches"].append(match(next(numbers), True))
+    return {"stadiums": stadiums, "tvchannels": channels, "teams": teams,
+            "groups": groups, "knockout": knockout}
+
+
+def fct_synthetic_2022(n_rows: int = 64, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère un DataFrame au format de Fifa_world_cup_matches.csv.
+    """
+    rng = np.random.default_rng(seed)
+    team1, team2 = _pairs(rng, [team.upper() for team in TEAMS], n_rows)
+    days = pd.Timestamp("2022-11-20") + pd.to_timedelta(rng.integers(0, 29, n_rows), unit="D")
+    years = _years(rng, "2022", n_rows)
+    return pd.DataFrame({
+        "team1": team1,
+        "team2": team2,
+        "number of goals team1": rng.integers(0, 8, n_rows),
+        "number of goals team2": rng.integers(0, 8, n_rows),
+        "date": _with_year(days.strftime("%d %b %Y").str.upper(), years, 7),
+        "hour": [f"{hour} : 00" for hour in rng.choice([10, 13, 16, 19, 22], n_rows)],
+        "category": rng.choice(STAGES_2022, n_rows),
+    })
+
+
+def fct_write_synthetic_sources(directory: Path, scale: float = 1, seed: int = 0) -> Dict[str, str]:
+    """
+    Écrit les quatre fichiers sources à l'échelle ``scale`` dans ``directory``.
+
+    Retour
+    ------
+    dict
+        Chemins par clé de config.yaml (``root_csv_2010``...), à fusionner
+        dans la configuration
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = {edition: max(1, int(round(n * scale))) for edition, n in BASE_ROWS.items()}
+    paths = {key: str(directory / name) for key, name in SOURCE_FILES.items()}
+    fct_synthetic_2010(rows["2010"], seed).to_csv(paths["root_csv_2010"], index=False)
+    fct_synthetic_2014(rows["2014"], seed).to_csv(paths["root_csv_2014"], index=False)
+    fct_synthetic_2022(rows["2022"], seed).to_csv(paths["root_csv_2022"], index=False)
+    Path(paths["root_json_2018"]).write_text(
+        json.dumps(fct_synthetic_2018(rows["2018"], seed)), encoding="utf-8"
+    )
+    return paths
+
+
+def fct_synthetic_matches(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère un DataFrame au schéma de la table ``matches``.
+    """
+    rng = np.random.default_rng(seed)
+    teams = np.array(["France", "Brazil", "Italy", "Germany", "Korea Republic", "Uruguay"])
+    editions = rng.choice(np.arange(1930, 2023, 4), n_rows)
+    home_result = pd.array(rng.integers(0, 8, n_rows), dtype="Int64")
+    home_result[rng.random(n_rows) < 0.01] = pd.NA
+    return pd.DataFrame({
+        "match_id": pd.array(editions * 10_000 + np.arange(n_rows) % 10_000 + 1, dtype="Int64"),
+        "date": pd.to_datetime(editions.astype(str) + "-06-15").date,
+        "home_team": rng.choice(teams, n_rows),
+        "away_team": rng.choice(teams, n_rows),
+        "home_result": home_result,
+        "away_result": pd.array(rng.integers(0, 8, n_rows), dtype="Int64"),
+        "stage": rng.choice(["group_a", "round_of_16", "final"], n_rows),
+        "edition": pd.array(editions, dtype="Int64"),
+        "city": rng.choice(["Montevideo", "Rome", None], n_rows),
+    })
+
+
+def fct_bench_matches(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Matchs synthétiques : dates étalées sur la compétition, 200 équipes,
+    identifiants uniques par édition.
+    """
+    rng = np.random.default_rng(seed)
+    df = fct_synthetic_matches(n_rows, seed)
+    teams = np.array([f"Team {i}" for i in range(200)])
+    df["home_team"] = rng.choice(teams, n_rows)
+    df["away_team"] = rng.choice(teams, n_rows)
+    df["date"] = (
+        pd.to_datetime(df["edition"].astype(str) + "-06-01")
+        + pd.to_timedelta(rng.integers(0, 45, n_rows), unit="D")
+    ).dt.date
+    return fct_assign_match_id(df.drop(columns="match_id"))[
+        ["match_id", "date", "home_team", "away_team", "home_result",
+         "away_result", "stage", "edition", "city"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for key, path in fct_write_synthetic_sources(args.output_dir, args.scale, args.seed).items():
+        print(f"{key:<16}{path}")
+
+
+if __name__ == "__main__":
+    main()
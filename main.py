@@ -7,63 +7,439 @@ Goal:
     It utilizes functions from the eda.config module to load configurations.
     It utilizes functions from the eda.extract module to perform these tasks.
 """
-from dotenv import load_dotenv
-import pandas as pd  # pour la manipulation de DataFrames
 import os             # pour gérer les chemins et interactions système
 from pathlib import Path  # pour manipuler les chemins de fichiers de manière portable
-from typing import Dict   # pour typer les dictionnaires dans les fonctions
-import numpy as np    # pour les opérations numériques avancées
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union   # pour typer les dictionnaires dans les fonctions
+import tempfile       # pour les fichiers Arrow IPC échangés entre étapes
+from concurrent.futures import ProcessPoolExecutor  # éditions en parallèle
+from functools import partial  # rappel de mise à jour des métriques par étape
 
-from sqlalchemy import (
-    MetaData, Table, Column,
-    Integer, String, Date
-    )
-from sqlalchemy.orm import sessionmaker
+import pandas as pd  # pour la manipulation de DataFrames
 
 from src.etl.extract import fct_read_csv, fct_read_json_nested
 from src.etl.transform import (
     fct_transform_2010,
     trf_file_wcup_2014,
     fct_transform_data_2018,
+    fct_transform_star_2018,
     transform_2022_data
     )
-from src.etl.load import create_postgres_engine
-from src.etl.utils import fct_load_config
+from src.etl.merge import fct_write_sorted_run, fct_merge_sorted_runs
+from src.etl.handoff import (
+    fct_default_handoff_dir,
+    fct_write_ipc,
+    fct_read_ipc,
+    fct_write_ipc_dict,
+    fct_read_ipc_dict
+    )
+from src.etl.utils import fct_load_config, fct_to_match_date, fct_invalid_match_dates
+from src.etl.instrumentation import (
+    fct_new_run_report,
+    fct_measure_stage,
+    fct_measure_iterator,
+    fct_add_stages,
+    fct_count_rows,
+    fct_finish_run_report,
+    fct_write_run_report,
+    fct_format_run_report
+    )
+from src.etl.profiling import (
+    fct_profiling_settings,
+    fct_profile_stage,
+    fct_install_helper_profiling,
+    fct_write_profiles
+    )
+from src.etl.metrics import (
+    fct_build_metrics,
+    fct_record_stage_metrics,
+    fct_record_run_metrics,
+    fct_observe_batches,
+    fct_start_metrics_server,
+    fct_write_metrics_textfile
+    )
+
+# Import sans effet de bord : la configuration et les variables
+# d'environnement (.env) sont lues par main(). La pile base de données
+# (SQLAlchemy, src.etl.load, src.etl.elt) n'est importée que par les étapes
+# qui en ont besoin : extraction et transformation seules ne la chargent pas.
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+
+# fichier de configuration par défaut (./config.yaml)
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+# Étapes par édition : (fonction d'extraction, clé du chemin source dans
+# config.yaml, fonction de transformation)
+EDITION_STAGES = {
+    "2010": (fct_read_csv, "root_csv_2010", fct_transform_2010),
+    "2014": (fct_read_csv, "root_csv_2014", trf_file_wcup_2014),
+    "2018": (fct_read_json_nested, "root_json_2018", fct_transform_data_2018),
+    "2022": (fct_read_csv, "root_csv_2022", transform_2022_data),
+}
+
+
+def match_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the pipeline ``date`` column for the DATE column of the tables
+    (see ``fct_to_match_date``). Year-only dates are kept as NULL; invalid
+    source dates are also loaded as NULL and reported row by row instead of
+    aborting the load.
+    """
+    invalid = fct_invalid_match_dates(df["date"])
+    for match_id, value in df.loc[invalid, ["match_id", "date"]].itertuples(index=False):
+        print(f"Date invalide pour le match {match_id} : {value!r} (chargée à NULL)")
+    return df.assign(date=fct_to_match_date(df["date"]))
+
+
+def extract_stage(
+    edition: str,
+    config: Dict,
+    handoff_dir: str,
+    report: Optional[Dict] = None
+) -> Union[Path, Dict[str, Path]]:
+    """
+    Extract one edition and hand it off as Arrow IPC file(s).
+
+    Returns the path of the IPC file, or a mapping table name -> path when
+    the source yields several tables (nested 2018 JSON). The step is
+    recorded in ``report`` when given (see ``src.etl.instrumentation``).
+    """
+    read_func, source_key, _ = EDITION_STAGES[edition]
+    with fct_measure_stage(report, "extract", edition) as record:
+        extracted = read_func(config[source_key])
+        record["rows_out"] = fct_count_rows(extracted)
+    if isinstance(extracted, dict):
+        return fct_write_ipc_dict(extracted, handoff_dir, f"extract_{edition}")
+    return fct_write_ipc(extracted, Path(handoff_dir) / f"extract_{edition}.arrow")
+
+
+def transform_stage(
+    edition: str,
+    extract_paths: Union[Path, Dict[str, Path]],
+    config: Dict,
+    handoff_dir: str,
+    report: Optional[Dict] = None
+) -> Path:
+    """
+    Transform one extracted edition (read from Arrow IPC by memory-map) and
+    hand it off as a date-sorted run for the merge stage.
+    """
+    _, _, transform_func = EDITION_STAGES[edition]
+    with fct_measure_stage(report, "transform", edition) as record:
+        if isinstance(extract_paths, dict):
+            extracted = fct_read_ipc_dict(extract_paths)
+        else:
+            extracted = fct_read_ipc(extract_paths)
+        record["rows_in"] = fct_count_rows(extracted)
+        df_clean = transform_func(extracted, config)
+        record["rows_out"] = len(df_clean)
+        return fct_write_sorted_run(df_clean, handoff_dir, edition)
+
+
+def edition_stage(
+    edition: str,
+    config: Dict,
+    handoff_dir: str,
+    instrument: bool = False,
+    profiling: Optional[Dict] = None
+) -> Tuple[Path, List[Dict]]:
+    """
+    Run extract then transform for one edition; only file paths cross the
+    stage boundaries, so this can run in a worker process.
+
+    Returns the run path and the stage records measured in this process
+    (empty unless ``instrument``), to be appended to the run report. With
+    ``profiling`` settings, both stages are profiled (see
+    ``src.etl.profiling``); a worker process writes its own profiles.
+    """
+    report = {"stages": []} if instrument else None
+    in_worker = profiling is not None and os.getpid() != profiling["pid"]
+    if in_worker:
+        fct_install_helper_profiling(profiling)
+    with fct_profile_stage(profiling, f"extract_{edition}"):
+        extract_paths = extract_stage(edition, config, handoff_dir, report)
+    with fct_profile_stage(profiling, f"transform_{edition}"):
+        run_path = transform_stage(edition, extract_paths, config, handoff_dir, report)
+    if in_worker:
+        fct_write_profiles(profiling)
+    return run_path, report["stages"] if report else []
+
+
+def database_load_stage(
+    config: Dict,
+    run_paths: List[Path],
+    chunks_final: Iterator[pd.DataFrame],
+    matches: "Table",
+    report: Optional[Dict] = None,
+    metrics: Optional[Dict] = None
+) -> int:
+    """
+    Load the merged stream into the ``matches`` table of a PostgreSQL
+    database, or of a local SQLite file with ``load.sink: sqlite`` (full
+    reload or delta sync), then optionally the 2018 star schema.
+
+    With ``pipeline.mode: elt``, the raw 2010, 2014 and 2022 files are staged
+    in the database and transformed there by SQL; ``chunks_final`` then only
+    carries the editions transformed in pandas.
+
+    Returns the number of rows written to ``matches`` (inserted, updated or
+    deleted in delta mode). Steps are recorded in ``report`` and the write
+    latency of each chunk in ``metrics`` when given.
+    """
+    from src.etl.load import (
+        create_postgres_engine,
+        create_sqlite_engine,
+        sqlite_load_table,
+        build_team_edition_stats_table,
+        swap_load_table,
+        delta_load_table,
+        build_star_2018_tables,
+        load_star_schema
+        )
+    from src.etl.elt import stage_elt_sources, select_editions, drop_elt_staging
+
+    load_config = config.get("load") or {}
+    sink = load_config.get("sink", "postgres")
+    chunks_final = fct_observe_batches(metrics, chunks_final, sink)
+    # agrégats par équipe et par édition, recalculés côté serveur dans la
+    # transaction du chargement (éditions modifiées seulement en mode delta)
+    stats_table = (
+        build_team_edition_stats_table(matches.metadata)
+        if load_config.get("team_edition_stats", True) else None
+    )
+    if sink == "sqlite":
+        # base locale (développement, CI) : même schéma et mêmes index
+        engine = create_sqlite_engine((load_config.get("sqlite") or {}).get("path", "data/matches.db"))
+    else:
+        engine = create_postgres_engine(
+            host=os.getenv("DB_HOST"),
+            database=os.getenv("DB_DATABASE"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            # moteur partagé par DSN : un second run dans le même processus
+            # réutilise les connexions déjà ouvertes du pool
+            **(config.get("engine") or {})
+        )
+
+    # Mode ELT : fichiers bruts en staging, transformations SQL insérées
+    # côté serveur dans la table de staging du chargement complet
+    elt_selects = {}
+    if (config.get("pipeline") or {}).get("mode", "etl") == "elt":
+        with fct_measure_stage(report, "elt_staging"):
+            elt_selects = stage_elt_sources(
+                config, engine, matches, chunksize=load_config.get("chunksize", 50_000)
+            )
+
+    # Chargement des données dans la base
+    # - mode "full" : flux de morceaux issu de la fusion, COPY dans une table
+    #   de staging sans index, contraintes construites ensuite, puis échange
+    #   atomique : les lecteurs ne voient jamais une table vide ou partielle.
+    # - mode "delta" : chaque run (une partition complète d'éditions) est
+    #   comparé aux empreintes stockées ; seules les lignes insérées,
+    #   modifiées ou supprimées sont envoyées.
+    if load_config.get("mode", "full") == "delta":
+        partitions = (
+            match_dates(df) for df in map(fct_read_ipc, run_paths)
+        )
+        counts = delta_load_table(
+            fct_observe_batches(metrics, partitions, sink),
+            matches,
+            engine,
+            chunksize=load_config.get("chunksize", 50_000),
+            stats_table=stats_table
+        )
+        print(
+            f"Table 'matches' synchronisée : {counts['inserted']} insérées, "
+            f"{counts['updated']} modifiées, {counts['deleted']} supprimées, "
+            f"{counts['unchanged']} inchangées"
+        )
+        n_rows = counts["inserted"] + counts["updated"] + counts["deleted"]
+    elif engine.dialect.name == "sqlite":
+        # executemany dans une seule transaction, synchronous=OFF, index ensuite
+        n_rows = sqlite_load_table(
+            chunks_final,
+            matches,
+            engine,
+            chunksize=load_config.get("chunksize", 50_000),
+            stats_table=stats_table,
+            selects=elt_selects.values()
+        )
+        print(f"{n_rows} lignes chargées avec succès dans la table 'matches' (SQLite)")
+    else:
+        # valeurs de partition lues dans les runs (colonne seule, memory-map)
+        # et, en mode ELT, dans les requêtes SQL des éditions
+        partition_values = sorted({
+            int(value)
+            for path in run_paths
+            for value in fct_read_ipc(path, columns=[matches.info["partition_by"]]).iloc[:, 0].dropna()
+        }.union(select_editions(engine, elt_selects.values()))) if matches.info["partition_by"] else None
+        n_rows = swap_load_table(
+            chunks_final,
+            matches,
+            engine,
+            chunksize=load_config.get("chunksize", 50_000),
+            unlogged=load_config.get("unlogged_staging", True),
+            partition_values=partition_values,
+            stats_table=stats_table,
+            selects=elt_selects.values()
+        )
+        print(f"{n_rows} lignes chargées avec succès dans la table 'matches'")
+    if elt_selects:
+        drop_elt_staging(engine, elt_selects)
+
+    # Schéma en étoile 2018 (option) : dimensions à clés de substitution,
+    # faits des matchs et liaison match-chaîne TV
+    if load_config.get("star_schema_2018", False):
+        with fct_measure_stage(report, "star_schema", "2018") as record:
+            star_frames = fct_transform_star_2018(fct_read_json_nested(config["root_json_2018"]), config)
+            fact_match = star_frames["fact_match"]
+            star_frames["fact_match"] = match_dates(fact_match)
+            counts = load_star_schema(
+                star_frames,
+                build_star_2018_tables(matches.metadata),
+                engine,
+                chunksize=load_config.get("chunksize", 50_000)
+            )
+            record["rows_out"] = sum(counts.values())
+        print(f"Schéma en étoile 2018 chargé : {counts}")
+    return n_rows
 
-load_dotenv()
-# chargement des paraètres de configuration à partir de ./config.yaml
-config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
-config = fct_load_config(config_path)
 
-# Récupération des chemins vers les fichiers sources
-root_csv_2010 = config['root_csv_2010']
-root_csv_2014 = config['root_csv_2014']
-root_csv_2022 = config['root_csv_2022']
-root_json_2018 = config['root_json_2018']
+def run_stages(
+    config: Dict,
+    editions: List[str],
+    handoff_dir: str,
+    report: Optional[Dict] = None,
+    metrics: Optional[Dict] = None,
+    profiling: Optional[Dict] = None
+) -> None:
+    """
+    Extract and transform each edition, merge the sorted runs and load the
+    merged stream (see ``main``). Steps are recorded in ``report``, load
+    batch latencies in ``metrics`` and profiles with ``profiling`` when given.
+    """
+    from sqlalchemy import MetaData
+    from src.etl.load import build_matches_table, add_row_hash, dataframe_chunks_to_parquet
+
+    pipeline_config = config.get("pipeline") or {}
+    load_config = config.get("load") or {}
+    workers = pipeline_config.get("workers") or 1
+
+    # --------------------
+    # Extraction + Transformation (par édition)
+    # --------------------
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            edition_results = list(executor.map(
+                edition_stage,
+                editions,
+                [config] * len(editions),
+                [handoff_dir] * len(editions),
+                [report is not None] * len(editions),
+                [profiling] * len(editions)
+            ))
+    else:
+        edition_results = [
+            edition_stage(edition, config, handoff_dir, report is not None, profiling)
+            for edition in editions
+        ]
+    run_paths = [run_path for run_path, _ in edition_results]
+    for _, stages in edition_results:
+        fct_add_stages(report, stages)
 
-# Charger les variables d'environnement à partir du fichier .env
+    # --------------------
+    # Merge (k-way merge des runs triés par date)
+    # --------------------
+    # Chaque partition porte des match_id stables (édition * 10000 + rang) :
+    # la fusion n'a qu'à entrelacer les runs par date, sans renumérotation.
+    # Les dates du pipeline (YYYYMMDDhhmmss / YYYY) sont converties pour la
+    # colonne DATE de la table, morceau par morceau.
+    # Conception physique (config.yaml) : index btree et partitionnement LIST
+    # par édition, construits après le chargement en masse
+    design_config = config.get("physical_design") or {}
+    metadata = MetaData()
+    matches = build_matches_table(
+        metadata,
+        indexes=design_config.get("indexes"),
+        partition_by=design_config.get("partition_by")
+    )
+    # La fusion est paresseuse : sa mesure ne compte que la production des
+    # morceaux, qui a lieu pendant le chargement (inclus dans l'étape load)
+    # L'empreinte row_hash ne sert qu'au chargement en base (différentiel) :
+    # le jeu Parquet destiné aux consommateurs n'en a pas besoin
+    sink = load_config.get("sink", "postgres")
+    chunks_final = fct_measure_iterator(report, "merge", (
+        match_dates(chunk) if sink == "parquet" else add_row_hash(match_dates(chunk), matches)
+        for chunk in fct_merge_sorted_runs(run_paths, key="date")
+    ))
+
+    # Load
+    # - sink "postgres" / "sqlite" : table 'matches' (et schéma en étoile 2018 en option)
+    # - sink "parquet" : jeu de données Parquet partitionné par édition, lu
+    #   directement par pandas / pyarrow sans passer par la base
+    try:
+        with fct_profile_stage(profiling, "load"), fct_measure_stage(report, "load") as record:
+            if sink == "parquet":
+                parquet_config = load_config.get("parquet") or {}
+                parquet_path = parquet_config.get("path", "data/parquet/matches")
+                n_rows = dataframe_chunks_to_parquet(
+                    fct_observe_batches(metrics, chunks_final, sink),
+                    parquet_path,
+                    partition_cols=parquet_config.get("partition_cols", ["edition"]),
+                    row_group_size=parquet_config.get("row_group_size", 100_000),
+                    compression=parquet_config.get("compression", "zstd")
+                )
+                print(f"{n_rows} lignes écrites dans le jeu Parquet '{parquet_path}'")
+            else:
+                n_rows = database_load_stage(config, run_paths, chunks_final, matches, report, metrics)
+            record["rows_out"] = n_rows
+    except Exception as e:
+        print("Erreur lors du chargement des données")
+        print(f"Détails : {e}")
+        raise
 
-host=os.getenv("HOST")
-database=os.getenv("DATABASE")
-user=os.getenv("DB_USER")
-password=os.getenv("PASSWORD")
 
-def main() -> None:
+def main(config: Optional[Dict] = None) -> None:
     """
     Run the complete ETL pipeline.
 
     This function performs the following steps:
     1. Extract data from CSV and JSON source files.
     2. Transform and normalize datasets for each World Cup edition.
-    3. Merge all datasets into a single consolidated DataFrame.
-    4. Generate a unique incremental match identifier.
-    5. Load the final dataset into a PostgreSQL database.
+    3. Merge all datasets out-of-core: each edition is written to disk as a
+       date-sorted run, then runs are k-way merged into a stream of chunks
+       (match identifiers are assigned per edition during transformation).
+    Stages exchange Arrow IPC files (memory-mapped) rather than pickled
+    DataFrames; with ``pipeline.workers > 1`` editions are extracted and
+    transformed in parallel worker processes.
+    4. Load the merged stream with COPY FROM STDIN into an unlogged staging
+       table, build the primary key afterwards and atomically swap it in
+       place of the ``matches`` table of a PostgreSQL database; with
+       ``load.mode: delta``, only rows whose content hash changed are sent.
+       With ``load.sink: parquet``, the stream is written instead as a
+       Parquet dataset partitioned by edition. With ``pipeline.mode: elt``,
+       the CSV editions are staged raw and transformed by SQL in the
+       database (see ``src.etl.elt``).
+    Each step is timed (wall and CPU time, rows in and out, rows per
+    second, peak RSS) and a JSON run report is written to
+    ``instrumentation.report_dir`` (see ``src.etl.instrumentation``).
+    With ``metrics.enabled``, Prometheus metrics are served over HTTP
+    during the run and/or written to a textfile (see ``src.etl.metrics``).
+    With ``profiling.enabled``, the stages and selected ``utils`` helpers are
+    profiled and dumps are written per stage (see ``src.etl.profiling``).
+
+    Parameters
+    ----------
+    config : dict, optional
+        Pipeline configuration; read from ``config.yaml`` (``CONFIG_PATH``)
+        when omitted. Variables from ``.env`` are loaded into the environment
+        here, not at import time.
 
-    Environment variables required:
-    - HOST: database host
-    - DATABASE: database name
-    - USER: database user
-    - PASSWORD: database password
+    Environment variables required (PostgreSQL sink):
+    - DB_HOST: database host
+    - DB_DATABASE: database name
+    - DB_USER: database user
+    - DB_PASSWORD: database password
 
     Returns
     -------
@@ -71,81 +447,73 @@ def main() -> None:
         This function does not return any value.
         Data is loaded into the database.
     """
-    # --------------------
-    # Extraction
-    # --------------------
-    df_2010 = fct_read_csv(root_csv_2010)
-    df_2014 = fct_read_csv(root_csv_2014)
-    dfs_2018 = fct_read_json_nested(root_json_2018)
-    df_2022 = fct_read_csv (root_csv_2022)
+    from dotenv import load_dotenv
 
-    # --------------------
-    # Transformation
-    # --------------------
-    df_2010_clean = fct_transform_2010(df_2010, config)
-    df_2014_clean = trf_file_wcup_2014(df_2014, config)
-    df_2018_clean = fct_transform_data_2018(dfs_2018, config)
-    df_2022_clean = transform_2022_data(df_2022, config)
+    # Charger les variables d'environnement à partir du fichier .env
+    load_dotenv()
+    # chargement des paramètres de configuration à partir de ./config.yaml
+    if config is None:
+        config = fct_load_config(CONFIG_PATH)
+    pipeline_config = config.get("pipeline") or {}
 
-    # --------------------
-    # Merge (concatenation verticale)
-    # --------------------
-    df_concat = pd.concat(
-        [df_2010_clean,df_2014_clean, df_2018_clean, df_2022_clean],
-        ignore_index=True)
-
-    # Reset and regenerate match_id
-    df_concat["match_id"] = None
-    df_final = df_concat.sort_values("date").reset_index(drop=True)
-    df_final["match_id"] = range(1, len(df_final) + 1)
-
-    # Load
-    engine = create_postgres_engine(
-        host=os.getenv("DB_HOST"),
-        database=os.getenv("DB_DATABASE"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD")
+    # Rapport d'exécution : une mesure par étape et par édition, écrit en
+    # JSON en fin de run (y compris en cas d'échec). Les métriques Prometheus
+    # en sont dérivées : le rapport est tenu dès que l'un des deux est actif.
+    instrumentation_config = config.get("instrumentation") or {}
+    metrics_config = config.get("metrics") or {}
+    metrics = fct_build_metrics() if metrics_config.get("enabled", False) else None
+    # les métriques d'une étape sont mises à jour dès sa clôture
+    report = (
+        fct_new_run_report(on_stage_close=partial(fct_record_stage_metrics, metrics) if metrics is not None else None)
+        if instrumentation_config.get("enabled", True) or metrics is not None else None
     )
+    # Profilage à la demande (cProfile, tracemalloc ou échantillonnage) des
+    # étapes et des fonctions de utils ; désactivé, rien n'est enveloppé
+    profiling = fct_profiling_settings(config)
+    fct_install_helper_profiling(profiling)
+    if metrics is not None and metrics_config.get("http_port"):
+        # exposition pendant le run (runs longs) ; un run planifié court
+        # passe plutôt par le textfile collector
+        fct_start_metrics_server(metrics, metrics_config["http_port"], metrics_config.get("http_addr", "0.0.0.0"))
 
-    metadata = MetaData()
+    # Mode ELT : les éditions CSV sont transformées en SQL par la base, seule
+    # l'édition 2018 (JSON imbriqué) passe par pandas
+    load_config = config.get("load") or {}
+    editions = list(EDITION_STAGES)
+    if pipeline_config.get("mode", "etl") == "elt":
+        from src.etl.elt import ELT_EDITIONS
 
-    matches = Table(
-        "matches",
-        metadata,
-        Column("match_id", Integer, primary_key=True),
-        Column("date", Date, nullable=False),
-        Column("home_team", String(100)),
-        Column("away_team", String(100)),
-        Column("home_result", Integer),
-        Column("away_result", Integer),
-        Column("stage", String(50)),
-        Column("edition", Integer),
-        Column("city", String(100)),
-        )
+        if load_config.get("sink", "postgres") == "parquet" or load_config.get("mode", "full") == "delta":
+            raise ValueError("Le mode ELT nécessite load.sink postgres ou sqlite et load.mode full")
+        editions = [edition for edition in EDITION_STAGES if edition not in ELT_EDITIONS]
 
-    metadata.create_all(engine)
-
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    # Chargement des données dans la base
+    # Les étapes échangent des fichiers Arrow IPC (memory-map, /dev/shm si
+    # disponible) et non des DataFrames sérialisés : chaque édition est
+    # extraite puis transformée, éventuellement dans un processus distinct,
+    # et seul le chemin de son run trié remonte au processus principal.
+    handoff_dir = tempfile.TemporaryDirectory(
+        prefix="etl_handoff_",
+        dir=pipeline_config.get("handoff_dir") or fct_default_handoff_dir()
+    )
+    status = "error"
     try:
-        df_final.to_sql(
-            "matches",
-            session.bind,
-            if_exists="replace",
-            index=False,
-            method="multi"
-        )
-        session.commit()
-        print("Données chargées avec succès dans la table 'matches'")
-    except Exception as e:
-        session.rollback()
-        print("Erreur lors du chargement des données dans la base")
-        print(f"Détails : {e}")
-        raise
+        run_stages(config, editions, handoff_dir.name, report, metrics, profiling)
+        status = "ok"
     finally:
-        session.close()
-        print("Connexion à la base de données fermée")
+        handoff_dir.cleanup()
+        if report is not None:
+            fct_finish_run_report(report, status)
+        if instrumentation_config.get("enabled", True):
+            report_path = fct_write_run_report(report, instrumentation_config.get("report_dir", "reports"))
+            print("\n".join(fct_format_run_report(report)))
+            print(f"Rapport d'exécution : {report_path}")
+        if profiling is not None:
+            fct_write_profiles(profiling)
+            print(f"Profils : {profiling['output_dir']}")
+        if metrics is not None:
+            fct_record_run_metrics(metrics, report)
+            if metrics_config.get("textfile"):
+                fct_write_metrics_textfile(metrics, metrics_config["textfile"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de résultats en lecture pour ``load.execute_select`` et
+``load.select_to_dataframe``.
+
+Les tableaux de bord répètent les mêmes requêtes alors que les données ne
+changent qu'au passage de l'ETL. ``cached_execute_select`` et
+``cached_select_to_dataframe`` servent ces requêtes depuis la mémoire :
+
+- clé : moteur (empreinte de l'URL complète, identifiants compris), SQL
+  normalisé (espaces hors littéraux, ``;`` final) et paramètres ;
+- éviction LRU, durée de vie (TTL) et budget mémoire global ;
+- invalidation par la version des données (``load.get_load_version``),
+  incrémentée par chaque chargement réussi : une entrée calculée pour une
+  version antérieure n'est jamais servie.
+
+La version est relue au plus une fois par ``version_check_interval``
+secondes et par moteur ; un chargement fait par un autre processus est donc
+visible avec ce délai au plus.
+"""
+
+import hashlib
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from src.etl.load import execute_select, select_to_dataframe, get_load_version
+
+
+_SETTINGS: Dict[str, Any] = {
+    "max_entries": 256,
+    "max_bytes": 64 * 1024 * 1024,
+    "ttl": 300.0,
+    "version_check_interval": 1.0,
+}
+
+# clé -> (résultat, taille estimée, expiration, version des données)
+_ENTRIES: "OrderedDict[Tuple, Tuple[Any, int, Optional[float], int]]" = OrderedDict()
+# moteur -> (version, instant de la lecture)
+_VERSIONS: Dict[str, Tuple[int, float]] = {}
+_STATS = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_BYTES = 0
+_LOCK = threading.RLock()
+
+# littéraux SQL ('...', "...") conservés tels quels, espaces ailleurs réduits
+_SQL_TOKENS = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def configure_result_cache(
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+    version_check_interval: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Modifie les réglages du cache (les paramètres omis sont conservés) et
+    vide le cache.
+
+    Paramètres
+    ----------
+    max_entries : int, optionnel
+        Nombre maximal de résultats conservés
+    max_bytes : int, optionnel
+        Budget mémoire (estimé) de l'ensemble des résultats
+    ttl : float, optionnel
+        Durée de vie d'un résultat en secondes (0 : pas d'expiration)
+    version_check_interval : float, optionnel
+        Délai minimal en secondes entre deux lectures de la version des
+        données d'un moteur (0 : relue à chaque appel)
+
+    Retour
+    ------
+    dict
+        Réglages en vigueur
+    """
+    with _LOCK:
+        for name, value in (("max_entries", max_entries), ("max_bytes", max_bytes),
+                            ("ttl", ttl), ("version_check_interval", version_check_interval)):
+            if value is not None:
+                _SETTINGS[name] = value
+        clear_result_cache()
+        return dict(_SETTINGS)
+
+
+def clear_result_cache() -> None:
+    """
+    Vide le cache et remet les statistiques à zéro.
+    """
+    global _BYTES
+    with _LOCK:
+        _ENTRIES.clear()
+        _VERSIONS.clear()
+        _BYTES = 0
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def result_cache_stats() -> Dict[str, int]:
+    """
+    Statistiques du cache : ``hits``, ``misses``, ``evictions``,
+    ``invalidations``, ``entries`` et ``bytes``.
+    """
+    with _LOCK:
+        return {**_STATS, "entries": len(_ENTRIES), "bytes": _BYTES}
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalise une requête pour la clé du cache : espaces consécutifs réduits
+    à un seul (hors littéraux), espaces de bord et ``;`` final supprimés.
+    """
+    normalized = _SQL_TOKENS.sub(lambda m: m.group(1) or " ", query).strip()
+    return normalized.rstrip(";").rstrip()
+
+
+def _engine_key(engine: Engine) -> str:
+    """
+    Identifiant d'un moteur dans le cache : empreinte SHA-256 de son URL
+    complète. ``str(engine.url)`` masque le mot de passe : deux DSN qui ne
+    diffèrent que par les identifiants (rôles, politiques RLS distincts)
+    partageraient leurs entrées. L'empreinte les distingue sans conserver le
+    mot de passe en clair.
+    """
+    url = engine.url.render_as_string(hide_password=False)
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _cache_key(engine: Engine, kind: str, query: str, params: Optional[dict]) -> Tuple:
+    """
+    Clé d'un résultat : le type des paramètres en fait partie (``1`` et ``"1"``
+    ne sont pas confondus).
+    """
+    frozen = tuple(sorted(
+        (name, type(value).__name__, repr(value)) for name, value in (params or {}).items()
+    ))
+    return _engine_key(engine), kind, normalize_sql(query), frozen
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Taille mémoire approximative d'un résultat (octets).
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values()) for row in value
+    )
+
+
+def _current_version(engine: Engine) -> int:
+    """
+    Version des données du moteur, relue au plus une fois par
+    ``version_check_interval`` secondes.
+    """
+    url = _engine_key(engine)
+    now = time.monotonic()
+    with _LOCK:
+        known = _VERSIONS.get(url)
+        if known is not None and now - known[1] < _SETTINGS["version_check_interval"]:
+            return known[0]
+    version = get_load_version(engine)
+    with _LOCK:
+        _VERSIONS[url] = (version, now)
+    return version
+
+
+def _evict(key: Tuple, reason: str) -> None:
+    """
+    Retire une entrée (appelée sous verrou).
+    """
+    global _BYTES
+    _, size, _, _ = _ENTRIES.pop(key)
+    _BYTES -= size
+    _STATS[reason] += 1
+
+
+def _lookup(key: Tuple, version: int) -> Any:
+    """
+    Renvoie le résultat en cache pour ``key`` ou None (appelée sous verrou).
+    """
+    entry = _ENTRIES.get(key)
+    if entry is None:
+        return None
+    value, _, expires_at, entry_version = entry
+    if entry_version != version:
+        _evict(key, "invalidations")
+        return None
+    if expires_at is not None and time.monotonic() >= expires_at:
+        _evict(key, "evictions")
+        return None
+    _ENTRIES.move_to_end(key)
+    return value
+
+
+def _store(key: Tuple, value: Any, version: int) -> None:
+    """
+    Ajoute un résultat puis évince les moins récemment utilisés au-delà des
+    limites. Un résultat plus gros que le budget entier n'est pas conservé.
+    """
+    global _BYTES
+    size = _estimate_size(value)
+    with _LOCK:
+        if size > _SETTINGS["max_bytes"]:
+            return
+        if key in _ENTRIES:
+            _evict(key, "invalidations")
+        ttl = _SETTINGS["ttl"]
+        _ENTRIES[key] = (value, size, time.monotonic() + ttl if ttl else None, version)
+        _BYTES += size
+        while len(_ENTRIES) > _SETTINGS["max_entries"] or _BYTES > _SETTINGS["max_bytes"]:
+            _evict(next(iter(_ENTRIES)), "evictions")
+
+
+def _read_through(engine: Engine, kind: str, query: str, params: Optional[dict], fetch) -> Any:
+    """
+    Sert le résultat depuis le cache, ou l'obtient par ``fetch()`` et le conserve.
+    """
+    key = _cache_key(engine, kind, query, params)
+    version = _current_version(engine)
+    with _LOCK:
+        value = _lookup(key, version)
+        if value is not None:
+            _STATS["hits"] += 1
+            return value
+        _STATS["misses"] += 1
+    value = fetch()
+    _store(key, value, version)
+    return value
+
+
+def cached_execute_select(
+    engine: Engine,
+    query: str,
+    params: dict | None = None
+) -> List[Dict[str, Any]]:
+    """
+    ``execute_select`` avec cache de résultats.
+
+    Renvoie une copie des lignes : l'appelant peut les modifier sans altérer
+    le cache.
+    """
+    rows = _read_through(engine, "rows", query, params,
+                         lambda: execute_select(engine, query, params))
+    return [dict(row) for row in rows]
+
+
+def cached_select_to_dataframe(
+    engine: Engine,
+    query: str,
+    params: dict | None = None
+) -> pd.DataFrame:
+    """
+    ``select_to_dataframe`` avec cache de résultats.
+
+    Renvoie une copie du DataFrame : l'appelant peut le modifier sans altérer
+    le cache.
+    """
+    df = _read_through(engine, "dataframe", query, params,
+                       lambda: select_to_dataframe(engine, query, params))
+    return df.copy()
@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+"""
+Mode ELT : transformations des éditions exécutées en SQL, côté serveur.
+
+Les fichiers CSV bruts (2010, 2014, 2022) sont chargés tels quels dans des
+tables de staging en texte (``COPY ... FROM STDIN`` sur PostgreSQL), puis
+chaque édition est transformée par une requête ensembliste qui reproduit la
+transformation pandas correspondante : correspondance des phases
+(``config.yaml``), lecture des scores, normalisation des dates, correction
+des noms d'équipes, numérotation ``match_id`` (fenêtre ``ROW_NUMBER`` par
+édition), conversion en DATE et empreinte ``row_hash``. Les requêtes
+produites alimentent directement la table de staging de ``swap_load_table``
+ou de ``sqlite_load_table`` (paramètre ``selects``) : les lignes de ces
+éditions ne transitent jamais par pandas.
+
+L'édition 2018 (JSON imbriqué) reste transformée en pandas.
+
+Les fonctions SQL propres à chaque dialecte sont décrites dans
+``SQL_FUNCTIONS`` ; sur SQLite, celles qui manquent (expressions régulières,
+dates, MD5) sont des fonctions Python enregistrées sur la connexion
+(``register_sqlite_functions``).
+"""
+
+import csv
+import datetime
+import hashlib
+import re
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Callable, Union
+
+from sqlalchemy import event, text, MetaData, Table, Column, Integer, Text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateTable, DropTable
+
+from src.etl.load import qualified_name, row_hash_columns
+from src.etl.transform import SCORE_PATTERN_2010, TEAM_PATTERN_2010, YEAR_PATTERN_2022
+from src.etl.utils import MATCH_ID_EDITION_FACTOR
+
+
+# Préfixe des tables de staging brutes (une par fichier source)
+RAW_TABLE_PREFIX = "elt_raw_"
+
+# Colonne d'ordre des lignes du fichier source (départage les égalités de tri)
+ROW_COLUMN = "_row"
+
+# Motif d'une date "jour mois-abrégé année heure:minute" (ex : 12 Jun 2014 17:00)
+_DMY_PATTERN = r"^[0-9]{1,2} [A-Za-z]{3} [0-9]{4} [0-9]{1,2}:[0-9]{2}$"
+
+# Gabarits des fonctions logiques, par dialecte ({0}, {1} : arguments SQL)
+SQL_FUNCTIONS: Dict[str, Dict[str, str]] = {
+    "postgresql": {
+        "regex_group": "substring({0} from {1})",
+        "to_int": f"CASE WHEN trim({{0}}) ~ '^[+-]?[0-9]+$' THEN CAST(trim({{0}}) AS INTEGER) END",
+        "datetime_dmy": (
+            f"CASE WHEN {{0}} ~ '{_DMY_PATTERN.replace('{', '{{').replace('}', '}}')}' "
+            "THEN to_char(to_timestamp({0}, 'DD Mon YYYY HH24:MI'), 'YYYYMMDDHH24MISS') END"
+        ),
+        "title_case": "initcap(lower(trim({0})))",
+        "match_date": (
+            # to_date lève une erreur sur un jour inexistant (20220230) : le
+            # format, l'année non nulle puis le jour (comparé au dernier jour
+            # du mois) sont vérifiés par des CASE imbriqués, évalués dans
+            # l'ordre, pour rendre NULL comme fct_to_match_date
+            "CASE WHEN trim({0}) ~ '^[0-9]{{4}}(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])' "
+            "THEN CASE WHEN substr(trim({0}), 1, 4) <> '0000' "
+            "THEN CASE WHEN CAST(substr(trim({0}), 7, 2) AS INTEGER) <= extract(day from "
+            "make_date(CAST(substr(trim({0}), 1, 4) AS INTEGER), CAST(substr(trim({0}), 5, 2) AS INTEGER), 1) "
+            "+ interval '1 month - 1 day') "
+            "THEN to_date(substr(trim({0}), 1, 8), 'YYYYMMDD') END END END"
+        ),
+        "md5": "md5({0})",
+        "unit_separator": "chr(31)",
+        "text_order": '{0} COLLATE "C"',
+    },
+    "sqlite": {
+        "regex_group": "etl_regex_group({0}, {1})",
+        "to_int": "etl_to_int({0})",
+        "datetime_dmy": "etl_datetime_dmy({0})",
+        "title_case": "etl_title_case({0})",
+        "match_date": "etl_match_date({0})",
+        "md5": "etl_md5({0})",
+        "unit_separator": "char(31)",
+        "text_order": "{0}",
+    },
+}
+
+
+# ----------------------------
+# FONCTIONS SQLITE
+# ----------------------------
+
+def _sqlite_regex_group(value: Optional[str], pattern: str) -> Optional[str]:
+    """Premier groupe capturé de ``pattern`` (comme ``substring ... from`` de PostgreSQL)."""
+    if value is None:
+        return None
+    match = re.search(pattern, value)
+    return match.group(1) if match else None
+
+
+def _sqlite_to_int(value: Optional[str]) -> Optional[int]:
+    """Entier si la valeur est un entier écrit en base 10, sinon NULL."""
+    if value is None or not re.fullmatch(r"[+-]?[0-9]+", value.strip()):
+        return None
+    return int(value)
+
+
+def _sqlite_datetime_dmy(value: Optional[str]) -> Optional[str]:
+    """``12 Jun 2014 17:00`` -> ``20140612170000`` ; NULL si la date est invalide."""
+    if value is None or not re.fullmatch(_DMY_PATTERN, value):
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%d %b %Y %H:%M").strftime("%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+
+
+def _sqlite_title_case(value: Optional[str]) -> Optional[str]:
+    """Même normalisation que les transformations pandas (strip, lower, title)."""
+    return None if value is None else value.strip().lower().title()
+
+
+def _sqlite_match_date(value: Optional[str]) -> Optional[str]:
+    """Date ISO de la colonne DATE (règles de ``fct_to_match_date``)."""
+    if value is None:
+        return None
+    digits = value.strip()[:8]
+    if len(digits) != 8:
+        return None
+    try:
+        return datetime.datetime.strptime(digits, "%Y%m%d").date().isoformat()
+    except ValueError:
+        return None
+
+
+def _sqlite_md5(value: Optional[str]) -> Optional[str]:
+    """Empreinte MD5 hexadécimale (UTF-8)."""
+    return None if value is None else hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+_SQLITE_FUNCTIONS: Dict[str, Callable] = {
+    "etl_regex_group": _sqlite_regex_group,
+    "etl_to_int": _sqlite_to_int,
+    "etl_datetime_dmy": _sqlite_datetime_dmy,
+    "etl_title_case": _sqlite_title_case,
+    "etl_match_date": _sqlite_match_date,
+    "etl_md5": _sqlite_md5,
+}
+
+
+def _create_sqlite_functions(dbapi_connection, connection_record) -> None:
+    """
+    Enregistre les fonctions ``etl_*`` sur une connexion sqlite3.
+    """
+    for name, func in _SQLITE_FUNCTIONS.items():
+        dbapi_connection.create_function(
+            name, func.__code__.co_argcount, func, deterministic=True
+        )
+
+
+def register_sqlite_functions(engine: Engine) -> None:
+    """
+    Rend les fonctions ``etl_*`` disponibles sur toutes les connexions d'un
+    moteur SQLite (sans effet sur les autres dialectes).
+
+    Les connexions déjà ouvertes du pool sont fermées pour que chacune soit
+    rouverte avec les fonctions : sur une base en mémoire (``sqlite://``),
+    l'appeler avant tout accès à la base.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if not event.contains(engine, "connect", _create_sqlite_functions):
+        event.listen(engine, "connect", _create_sqlite_functions)
+        engine.dispose()
+
+
+# ----------------------------
+# CONSTRUCTION DES REQUÊTES
+# ----------------------------
+
+def sql_function(dialect: str, name: str, *args: str) -> str:
+    """
+    Rend l'appel de la fonction logique ``name`` pour le dialecte donné.
+
+    Lève
+    ----
+    ValueError
+        Si le dialecte n'est pas pris en charge par le mode ELT
+    """
+    try:
+        template = SQL_FUNCTIONS[dialect][name]
+    except KeyError:
+        raise ValueError(f"Mode ELT non pris en charge pour le dialecte '{dialect}'") from None
+    return template.format(*args)
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Littéral SQL d'une chaîne (apostrophes doublées) ; NULL pour None.
+    """
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def sql_mapping(expression: str, mapping: Optional[Dict[Any, Any]]) -> str:
+    """
+    ``CASE`` appliquant une table de correspondance (``config.yaml``) ; les
+    valeurs absentes de la table sont conservées, comme ``Series.replace``.
+    """
+    if not mapping:
+        return expression
+    branches = " ".join(
+        f"WHEN {sql_literal(key)} THEN {sql_literal(value)}" for key, value in mapping.items()
+    )
+    return f"CASE {expression} {branches} ELSE {expression} END"
+
+
+def sql_pattern(pattern: str, group: str) -> str:
+    """
+    Motif pandas à groupes nommés réduit à un seul groupe capturant ``group``
+    (les autres groupes deviennent non capturants), pour ``regex_group`` qui
+    renvoie le premier groupe : les motifs de ``transform`` restent la seule
+    définition des règles.
+    """
+    return re.sub(r"\(\?P<(\w+)>", lambda match: "(" if match.group(1) == group else "(?:", pattern)
+
+
+def raw_column_name(name: str) -> str:
+    """
+    Nom de colonne de staging d'un en-tête CSV : minuscules, caractères non
+    alphanumériques remplacés par ``_`` (``Home Team Name`` -> ``home_team_name``).
+    """
+    return re.sub(r"\W+", "_", str(name).strip().lower()).strip("_")
+
+
+def _raw(column: str) -> str:
+    """
+    Valeur brute d'une colonne de staging, espaces initiaux retirés comme
+    par ``fct_read_csv`` (``skipinitialspace``).
+    """
+    return f"ltrim({column})"
+
+
+def select_2010(config: Dict, dialect: str, raw_table: str, raw_columns: List[str]) -> str:
+    """
+    Transformation 2010 (``fct_transform_2010``) en SQL : doublons exacts
+    supprimés, scores et noms d'équipe lus par expression régulière,
+    phases harmonisées, points retirés des villes.
+    """
+    source = {logical: raw for raw, logical in config["dict_columns_2010"].items()}
+    f = lambda name, *args: sql_function(dialect, name, *args)
+
+    def team(column: str) -> str:
+        return f("regex_group", _raw(column), sql_literal(sql_pattern(TEAM_PATTERN_2010, "team")))
+
+    def score(group: str) -> str:
+        pattern = sql_literal(sql_pattern(SCORE_PATTERN_2010, group))
+        return f"COALESCE({f('to_int', f('regex_group', _raw('score'), pattern))}, -999)"
+
+    all_columns = ", ".join(raw_columns)
+    return (
+        f"SELECT {_raw(source['date'])} AS date, "
+        f"{team(source['home_team'])} AS home_team, "
+        f"{team(source['away_team'])} AS away_team, "
+        f"{score('home_result')} AS home_result, "
+        f"{score('away_result')} AS away_result, "
+        f"{sql_mapping(_raw(source['stage']), config['stage_mapping_2010'])} AS stage, "
+        f"{f('to_int', _raw(source['date']))} AS edition, "
+        f"replace({_raw(source['city'])}, '.', '') AS city, "
+        f"{ROW_COLUMN} "
+        f"FROM {raw_table} "
+        f"WHERE {ROW_COLUMN} IN (SELECT MIN({ROW_COLUMN}) FROM {raw_table} GROUP BY {all_columns})"
+    )
+
+
+def select_2014(config: Dict, dialect: str, raw_table: str, raw_columns: List[str]) -> str:
+    """
+    Transformation 2014 (``trf_file_wcup_2014``) en SQL : colonnes retenues
+    et renommées selon ``config.yaml``, date ``12 Jun 2014 - 17:00`` normalisée,
+    phases harmonisées, noms d'équipes corrigés.
+    """
+    settings = config["trf_file_wcup_2014"]
+    retained = [raw_column_name(column) for column in settings["colonnes_retenues"]]
+    source = {settings["news_columns"].get(raw, raw): raw for raw in retained}
+    f = lambda name, *args: sql_function(dialect, name, *args)
+    corrections = settings["correction_team_mapping"]
+    date = f("datetime_dmy", f"replace(trim({source['datetime']}), ' - ', ' ')")
+    return (
+        f"SELECT {date} AS date, "
+        f"{sql_mapping(_raw(source['home_team']), corrections)} AS home_team, "
+        f"{sql_mapping(_raw(source['away_team']), corrections)} AS away_team, "
+        f"{f('to_int', source['home_result'])} AS home_result, "
+        f"{f('to_int', source['away_result'])} AS away_result, "
+        f"{sql_mapping(_raw(source['stage']), settings['stage_mapping'])} AS stage, "
+        f"{f('to_int', source['edition'])} AS edition, "
+        f"{_raw(source['city'])} AS city, "
+        f"{ROW_COLUMN} "
+        f"FROM {raw_table}"
+    )
+
+
+def select_2022(config: Dict, dialect: str, raw_table: str, raw_columns: List[str]) -> str:
+    """
+    Transformation 2022 (``transform_2022_data``) en SQL : date et heure
+    ``17 : 00`` fusionnées, noms d'équipes en casse titre, phases harmonisées,
+    édition tirée de l'année écrite dans la date source (même si la date est
+    invalide).
+    """
+    f = lambda name, *args: sql_function(dialect, name, *args)
+    date = f(
+        "datetime_dmy",
+        f"trim(date) || ' ' || trim(replace(hour, ' ', ''))"
+    )
+    parsed = (
+        f"SELECT {date} AS date, "
+        f"{f('to_int', f('regex_group', 'date', sql_literal(sql_pattern(YEAR_PATTERN_2022, 'year'))))} AS edition, "
+        f"{f('title_case', 'team1')} AS home_team, "
+        f"{f('title_case', 'team2')} AS away_team, "
+        f"{f('to_int', 'number_of_goals_team1')} AS home_result, "
+        f"{f('to_int', 'number_of_goals_team2')} AS away_result, "
+        f"{sql_mapping(_raw('category'), config['stage_mapping_2022'])} AS stage, "
+        f"{ROW_COLUMN} "
+        f"FROM {raw_table}"
+    )
+    return (
+        "SELECT p.date, p.home_team, p.away_team, p.home_result, p.away_result, p.stage, "
+        "p.edition, NULL AS city, "
+        f"p.{ROW_COLUMN} FROM ({parsed}) p"
+    )
+
+
+def select_matches(edition_sql: str, table: Table, dialect: str) -> str:
+    """
+    Requête finale d'une édition au format de ``table`` : ``match_id``
+    (édition * 10000 + rang par date, équipes, ordre du fichier), date
+    convertie en DATE et empreinte ``row_hash`` (mêmes règles que
+    ``fct_assign_match_id``, ``fct_to_match_date`` et ``compute_row_hashes``).
+
+    Paramètres
+    ----------
+    edition_sql : str
+        Requête d'une édition (``select_2010`` …) : colonnes date (texte
+        ``YYYYMMDDhhmmss`` ou ``YYYY``), home_team, away_team, home_result,
+        away_result, stage, edition, city et ``_row``
+    table : sqlalchemy.Table
+        Table cible (voir ``build_matches_table``)
+    dialect : str
+        Nom du dialecte SQLAlchemy (``postgresql``, ``sqlite``)
+
+    Retour
+    ------
+    str
+        Requête SELECT sans paramètre, colonnes dans l'ordre de ``table``
+    """
+    f = lambda name, *args: sql_function(dialect, name, *args)
+    order = ", ".join(
+        [f"{f('text_order', 's.' + col)} NULLS LAST" for col in ("date", "home_team", "away_team")]
+        + [f"s.{ROW_COLUMN}"]
+    )
+    numbered = (
+        f"SELECT s.*, s.edition * {MATCH_ID_EDITION_FACTOR} "
+        f"+ ROW_NUMBER() OVER (PARTITION BY s.edition ORDER BY {order}) AS match_id "
+        f"FROM ({edition_sql}) s"
+    )
+    typed = (
+        f"SELECT n.match_id, {f('match_date', 'n.date')} AS date, n.home_team, n.away_team, "
+        f"n.home_result, n.away_result, n.stage, n.edition, n.city FROM ({numbered}) n"
+    )
+    canonical = f" || {f('unit_separator')} || ".join(
+        f"COALESCE(CAST(t.{col} AS TEXT), '\\N')" for col in row_hash_columns(table)
+    )
+    computed = {"row_hash": f("md5", canonical)}
+    columns = ", ".join(
+        f"{computed[col.name]} AS {col.name}" if col.name in computed else f"t.{col.name}"
+        for col in table.columns
+    )
+    return f"SELECT {columns} FROM ({typed}) t"
+
+
+# Éditions transformées en SQL : clé du chemin source dans config.yaml,
+# constructeur de la requête
+ELT_EDITIONS: Dict[str, tuple] = {
+    "2010": ("root_csv_2010", select_2010),
+    "2014": ("root_csv_2014", select_2014),
+    "2022": ("root_csv_2022", select_2022),
+}
+
+
+# ----------------------------
+# STAGING BRUT
+# ----------------------------
+
+def _detect_delimiter(header: str) -> str:
+    """
+    Séparateur du fichier, essayé dans le même ordre que ``fct_read_csv``.
+    """
+    for sep in (",", ";", "|", "\t"):
+        if len(next(csv.reader([header], delimiter=sep))) > 1:
+            return sep
+    raise ValueError("Aucun séparateur valide trouvé")
+
+
+def stage_csv_table(
+    path: Union[str, Path],
+    table_name: str,
+    engine: Engine,
+    chunksize: int = 50_000
+) -> List[str]:
+    """
+    Charge un fichier CSV brut dans une table de staging en texte.
+
+    La table est recréée avec une colonne TEXT par colonne du fichier (noms
+    normalisés par ``raw_column_name``) et une colonne ``_row`` numérotant
+    les lignes dans l'ordre du fichier. Sur PostgreSQL, la table est
+    UNLOGGED et le fichier est envoyé tel quel par ``COPY ... FROM STDIN`` ;
+    ailleurs, par executemany de ``chunksize`` lignes. Champ vide -> NULL.
+
+    Paramètres
+    ----------
+    path : str | Path
+        Fichier CSV (UTF-8, avec en-tête)
+    table_name : str
+        Nom de la table de staging
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    chunksize : int
+        Nombre de lignes par executemany (hors PostgreSQL)
+
+    Retour
+    ------
+    list
+        Colonnes de données de la table (sans ``_row``)
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+    quote = engine.dialect.identifier_preparer.quote
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        header = f.readline()
+    delimiter = _detect_delimiter(header)
+    columns = [raw_column_name(name) for name in next(csv.reader([header], delimiter=delimiter))]
+
+    table = Table(
+        table_name, MetaData(),
+        Column(ROW_COLUMN, Integer, primary_key=True, autoincrement=True),
+        *[Column(name, Text) for name in columns],
+        prefixes=["UNLOGGED"] if is_postgres else []
+    )
+    with engine.begin() as conn:
+        conn.execute(DropTable(table, if_exists=True))
+        conn.execute(CreateTable(table))
+
+    qualified = qualified_name(engine, table_name)
+    column_list = ", ".join(quote(name) for name in columns)
+    if is_postgres:
+        raw_connection = engine.raw_connection()
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                raw_connection.cursor().copy_expert(
+                    f"COPY {qualified} ({column_list}) FROM STDIN "
+                    f"WITH (FORMAT csv, HEADER true, DELIMITER {sql_literal(delimiter)})",
+                    f
+                )
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+        return columns
+
+    insert = (
+        f"INSERT INTO {qualified} ({column_list}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    with open(path, "r", encoding="utf-8", newline="") as f, engine.begin() as conn:
+        reader = csv.reader(f, delimiter=delimiter)
+        next(reader)
+        batch = []
+        for record in reader:
+            batch.append(tuple(value if value != "" else None for value in record))
+            if len(batch) >= chunksize:
+                conn.exec_driver_sql(insert, batch)
+                batch = []
+        if batch:
+            conn.exec_driver_sql(insert, batch)
+    return columns
+
+
+def stage_elt_sources(
+    config: Dict,
+    engine: Engine,
+    table: Table,
+    editions: Iterable[str] = ELT_EDITIONS,
+    chunksize: int = 50_000
+) -> Dict[str, str]:
+    """
+    Charge les fichiers bruts des éditions en staging et renvoie, pour
+    chacune, la requête qui la transforme au format de ``table``.
+
+    Paramètres
+    ----------
+    config : dict
+        Configuration (chemins sources, correspondances des phases et équipes)
+    engine : sqlalchemy.engine.Engine
+        Moteur PostgreSQL ou SQLite (fonctions ``etl_*`` enregistrées au besoin)
+    table : sqlalchemy.Table
+        Table cible (voir ``build_matches_table``)
+    editions : Iterable[str]
+        Éditions à traiter (clés de ``ELT_EDITIONS``)
+
+    Retour
+    ------
+    dict
+        édition -> requête SELECT (paramètre ``selects`` de ``swap_load_table``)
+    """
+    dialect = engine.dialect.name
+    if dialect not in SQL_FUNCTIONS:
+        raise ValueError(f"Mode ELT non pris en charge pour le dialecte '{dialect}'")
+    register_sqlite_functions(engine)
+    quote = engine.dialect.identifier_preparer.quote
+
+    selects = {}
+    for edition in editions:
+        source_key, build_select = ELT_EDITIONS[edition]
+        raw_table = RAW_TABLE_PREFIX + edition
+        columns = stage_csv_table(config[source_key], raw_table, engine, chunksize=chunksize)
+        edition_sql = build_select(config, dialect, quote(raw_table), [quote(col) for col in columns])
+        selects[edition] = select_matches(edition_sql, table, dialect)
+    return selects
+
+
+def select_editions(engine: Engine, selects: Iterable[str]) -> List[int]:
+    """
+    Éditions produites par les requêtes ELT (valeurs de partition à créer
+    avant le chargement).
+    """
+    editions = set()
+    with engine.connect() as conn:
+        for select_sql in selects:
+            query = f"SELECT DISTINCT edition FROM ({select_sql}) e WHERE edition IS NOT NULL"
+            editions.update(conn.execute(text(query.replace(":", "\\:"))).scalars())
+    return sorted(int(edition) for edition in editions)
+
+
+def drop_elt_staging(engine: Engine, editions: Iterable[str] = ELT_EDITIONS) -> None:
+    """
+    Supprime les tables de staging brutes.
+    """
+    with engine.begin() as conn:
+        for edition in editions:
+            conn.execute(text(f"DROP TABLE IF EXISTS {qualified_name(engine, RAW_TABLE_PREFIX + edition)}"))
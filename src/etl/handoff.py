@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Échange de DataFrames entre étapes du pipeline au format Arrow IPC.
+
+Aux frontières extraction -> transformation -> fusion -> chargement, les
+DataFrames ne sont pas sérialisés (pickle) d'un processus à l'autre : chaque
+étape écrit un fichier Arrow IPC non compressé et ne transmet que son chemin.
+L'étape suivante ouvre le fichier par memory-map : les buffers Arrow sont lus
+sans copie, directement depuis le cache de pages (ou la mémoire partagée
+``/dev/shm`` quand elle existe).
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+
+# Mémoire partagée POSIX : les fichiers y résident en RAM
+SHARED_MEMORY_DIR = Path("/dev/shm")
+
+
+def fct_default_handoff_dir() -> Path:
+    """
+    Répertoire d'échange par défaut : ``/dev/shm`` si disponible, sinon le
+    répertoire temporaire du système.
+    """
+    if SHARED_MEMORY_DIR.is_dir() and os.access(SHARED_MEMORY_DIR, os.W_OK):
+        return SHARED_MEMORY_DIR
+    return Path(tempfile.gettempdir())
+
+
+def fct_write_ipc(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    batch_size: Optional[int] = None
+) -> Path:
+    """
+    Écrit un DataFrame dans un fichier Arrow IPC (non compressé, lisible par memory-map).
+
+    Paramètres :
+        df (pd.DataFrame) : DataFrame à écrire
+        path (str | Path) : chemin du fichier IPC
+        batch_size (int, optionnel) : nombre maximal de lignes par record batch
+
+    Retour :
+        Path : chemin du fichier écrit
+    """
+    path = Path(path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=batch_size)
+    return path
+
+
+def fct_open_ipc(path: Union[str, Path]) -> pa.ipc.RecordBatchFileReader:
+    """
+    Ouvre un fichier Arrow IPC par memory-map.
+
+    Les record batches renvoyés par le lecteur (``get_batch``, ``read_all``)
+    référencent directement les pages du fichier : aucune copie, aucune
+    désérialisation.
+    """
+    return pa.ipc.open_file(pa.memory_map(str(path), "r"))
+
+
+def fct_read_ipc(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    arrow_backed: bool = False
+) -> pd.DataFrame:
+    """
+    Lit un fichier Arrow IPC écrit par ``fct_write_ipc``.
+
+    Par défaut, la conversion vers les dtypes pandas habituels se fait sans
+    regroupement en blocs 2D (``split_blocks``) et en libérant les buffers
+    Arrow au fil de l'eau (``self_destruct``) : les colonnes numériques sans
+    valeur manquante restent des vues en lecture seule sur le memory-map
+    (aucune copie), seules les colonnes de chaînes (objets Python, attendus
+    par les transformations) et les colonnes nullables sont matérialisées.
+
+    Paramètres :
+        path (str | Path) : chemin du fichier IPC
+        columns (list, optionnel) : colonnes à lire
+        arrow_backed (bool) : si True, toutes les colonnes restent des tableaux
+            Arrow (dtypes ``pd.ArrowDtype``) adossés au memory-map, sans copie
+
+    Retour :
+        pd.DataFrame : le DataFrame relu
+    """
+    table = fct_open_ipc(path).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    if arrow_backed:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def fct_write_ipc_dict(
+    dfs: Dict[str, pd.DataFrame],
+    handoff_dir: Union[str, Path],
+    prefix: str
+) -> Dict[str, Path]:
+    """
+    Écrit un dictionnaire de DataFrames (ex : tables du JSON 2018), un fichier IPC par table.
+
+    Retour :
+        dict : nom de table -> chemin du fichier IPC
+    """
+    return {
+        name: fct_write_ipc(df, Path(handoff_dir) / f"{prefix}_{name}.arrow")
+        for name, df in dfs.items()
+    }
+
+
+def fct_read_ipc_dict(paths: Dict[str, Union[str, Path]]) -> Dict[str, pd.DataFrame]:
+    """
+    Relit un dictionnaire de DataFrames écrit par ``fct_write_ipc_dict``.
+    """
+    return {name: fct_read_ipc(path) for name, path in paths.items()}
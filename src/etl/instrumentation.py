@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Mesure des étapes du pipeline et rapport d'exécution JSON.
+
+Chaque étape (extraction, transformation, fusion, chargement) est encadrée
+par ``fct_measure_stage`` (ou ``fct_measure_iterator`` pour un flux de
+morceaux) qui relève le temps écoulé, le temps CPU du processus, les lignes
+en entrée et en sortie, le débit et la mémoire résidente (RSS en fin
+d'étape et maximum atteint pendant l'étape). Le rapport est un simple
+dictionnaire, sérialisable tel quel en JSON et transportable depuis un
+processus de travail.
+
+Le maximum de RSS d'une étape est échantillonné par un fil d'exécution
+unique par processus, toutes les ``SAMPLE_INTERVAL_S`` secondes tant
+qu'une étape est en cours (il reste en attente sinon) ; un pic plus bref
+que l'intervalle peut échapper à la mesure. Le maximum sur toute la vie
+du processus (``getrusage``) n'est utilisé qu'au niveau du run.
+
+Coût : deux lectures d'horloge et deux lectures de RSS par étape (et par
+morceau pour un flux), plus une lecture de RSS par intervalle pendant les
+étapes, négligeable devant les étapes mesurées.
+"""
+
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union, Dict, List, Any, Iterable, Iterator, Callable
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# psutil.Process du processus courant (recréé après un fork)
+_PROCESS: Dict[int, psutil.Process] = {}
+
+MB = 1024 * 1024
+
+# Intervalle d'échantillonnage de la RSS pendant les étapes (secondes)
+SAMPLE_INTERVAL_S = 0.01
+
+# Enregistrements des étapes en cours (id -> enregistrement), échantillonnés
+# par le fil du processus courant (recréé après un fork)
+_ACTIVE: Dict[int, Dict[str, Any]] = {}
+_SAMPLER: Dict[int, threading.Event] = {}
+_LOCK = threading.Lock()
+
+
+def _process() -> psutil.Process:
+    pid = os.getpid()
+    if pid not in _PROCESS:
+        _PROCESS.clear()
+        _PROCESS[pid] = psutil.Process(pid)
+    return _PROCESS[pid]
+
+
+def fct_rss_bytes() -> int:
+    """
+    Mémoire résidente (RSS) courante du processus, en octets.
+    """
+    return _process().memory_info().rss
+
+
+def fct_peak_rss_bytes() -> int:
+    """
+    Maximum de mémoire résidente atteint par le processus depuis son
+    démarrage, en octets (``getrusage`` ; RSS courante à défaut).
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss : octets sous macOS, kilo-octets ailleurs
+        return peak if sys.platform == "darwin" else peak * 1024
+    return fct_rss_bytes()
+
+
+def _sample_rss(wake: threading.Event) -> None:
+    """
+    Boucle du fil d'échantillonnage : relève la RSS et met à jour le maximum
+    des étapes en cours ; attend ``wake`` quand aucune étape n'est en cours.
+    """
+    while True:
+        wake.wait()
+        rss = fct_rss_bytes()
+        with _LOCK:
+            if not _ACTIVE:
+                wake.clear()
+                continue
+            for record in _ACTIVE.values():
+                record["_peak_rss"] = max(record["_peak_rss"], rss)
+        time.sleep(SAMPLE_INTERVAL_S)
+
+
+def _start_sampling(record: Dict[str, Any]) -> None:
+    """
+    Ajoute l'enregistrement aux étapes échantillonnées (fil démarré au
+    premier appel du processus).
+    """
+    rss = fct_rss_bytes()
+    with _LOCK:
+        pid = os.getpid()
+        if pid not in _SAMPLER:
+            _SAMPLER.clear()
+            _ACTIVE.clear()
+            _SAMPLER[pid] = threading.Event()
+            threading.Thread(
+                target=_sample_rss, args=(_SAMPLER[pid],), name="etl-rss-sampler", daemon=True
+            ).start()
+        record["_peak_rss"] = max(record.get("_peak_rss", 0), rss)
+        _ACTIVE[id(record)] = record
+        _SAMPLER[pid].set()
+
+
+def _stop_sampling(record: Dict[str, Any]) -> None:
+    """
+    Retire l'enregistrement des étapes échantillonnées ; dernière lecture de RSS.
+    """
+    with _LOCK:
+        _ACTIVE.pop(id(record), None)
+    record["_peak_rss"] = max(record.get("_peak_rss", 0), fct_rss_bytes())
+
+
+def fct_new_run_report(
+    run_id: Optional[str] = None,
+    on_stage_close: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Crée un rapport d'exécution vide.
+
+    Paramètres :
+        run_id (str, optionnel) : identifiant du run (par défaut horodatage et PID)
+        on_stage_close (callable, optionnel) : appelé avec l'enregistrement de
+            chaque étape dès sa clôture (ex : mise à jour des métriques pendant le run)
+
+    Retour :
+        dict : rapport (``run_id``, ``started_at``, ``stages``)
+    """
+    now = datetime.datetime.now()
+    return {
+        "run_id": run_id or f"{now:%Y%m%dT%H%M%S}_{os.getpid()}",
+        "started_at": now.isoformat(timespec="seconds"),
+        "stages": [],
+        "_start": (time.perf_counter(), time.process_time()),
+        "_on_stage_close": on_stage_close,
+    }
+
+
+def _stage_closed(report: Dict[str, Any], record: Dict[str, Any]) -> None:
+    callback = report.get("_on_stage_close")
+    if callback is not None:
+        callback(record)
+
+
+def fct_add_stages(report: Optional[Dict[str, Any]], stages: Iterable[Dict[str, Any]]) -> None:
+    """
+    Ajoute au rapport des étapes déjà closes (mesurées dans un processus de
+    travail), comme si elles venaient d'être mesurées.
+    """
+    if report is None:
+        return
+    for record in stages:
+        report["stages"].append(record)
+        _stage_closed(report, record)
+
+
+def _new_record(stage: str, edition: Optional[str], rows_in: Optional[int]) -> Dict[str, Any]:
+    return {
+        "stage": stage,
+        "edition": edition,
+        "pid": os.getpid(),
+        "status": "ok",
+        "wall_s": 0.0,
+        "cpu_s": 0.0,
+        "rows_in": rows_in,
+        "rows_out": None,
+    }
+
+
+def _close_record(record: Dict[str, Any]) -> None:
+    """
+    Calcule le débit et relève la mémoire en fin d'étape (RSS courante et
+    maximum échantillonné pendant l'étape).
+    """
+    rows = record["rows_out"] if record["rows_out"] is not None else record["rows_in"]
+    record["rows_per_s"] = round(rows / record["wall_s"], 1) if rows and record["wall_s"] > 0 else None
+    rss = fct_rss_bytes()
+    record["rss_mb"] = round(rss / MB, 1)
+    record["peak_rss_mb"] = round(max(rss, record.pop("_peak_rss", 0)) / MB, 1)
+    record["wall_s"] = round(record["wall_s"], 4)
+    record["cpu_s"] = round(record["cpu_s"], 4)
+
+
+@contextmanager
+def fct_measure_stage(
+    report: Optional[Dict[str, Any]],
+    stage: str,
+    edition: Optional[str] = None,
+    rows_in: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Mesure une étape ; le bloc renseigne ``rows_in`` / ``rows_out`` sur
+    l'enregistrement fourni.
+
+    En cas d'exception, l'étape est enregistrée avec ``status: error`` et
+    l'exception propagée. Sans rapport (``report`` None), rien n'est mesuré.
+
+    Paramètres :
+        report (dict | None) : rapport (``fct_new_run_report``)
+        stage (str) : nom de l'étape (extract, transform, merge, load…)
+        edition (str, optionnel) : édition traitée
+        rows_in (int, optionnel) : lignes en entrée
+
+    Retour :
+        dict : enregistrement de l'étape, ajouté à ``report["stages"]``
+    """
+    record = _new_record(stage, edition, rows_in)
+    if report is None:
+        yield record
+        return
+    report["stages"].append(record)
+    _start_sampling(record)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["wall_s"] += time.perf_counter() - wall
+        record["cpu_s"] += time.process_time() - cpu
+        _stop_sampling(record)
+        _close_record(record)
+        _stage_closed(report, record)
+
+
+def fct_measure_iterator(
+    report: Optional[Dict[str, Any]],
+    stage: str,
+    chunks: Iterable[Any],
+    edition: Optional[str] = None
+) -> Iterator[Any]:
+    """
+    Mesure une étape productrice de morceaux (ex : fusion des runs).
+
+    Seul le temps passé à produire chaque morceau est compté, pas celui du
+    consommateur (le chargement), de même pour l'échantillonnage de la RSS ;
+    ``rows_out`` cumule ``len`` des morceaux.
+
+    Paramètres :
+        report (dict | None) : rapport ; None : flux renvoyé tel quel
+        stage (str) : nom de l'étape
+        chunks (Iterable) : flux de morceaux (DataFrames)
+        edition (str, optionnel) : édition traitée
+
+    Retour :
+        Iterator : mêmes morceaux, dans le même ordre
+    """
+    if report is None:
+        return iter(chunks)
+    record = _new_record(stage, edition, None)
+    record["rows_out"] = 0
+    report["stages"].append(record)
+    return _measured(report, record, iter(chunks))
+
+
+def _measured(report: Dict[str, Any], record: Dict[str, Any], iterator: Iterator[Any]) -> Iterator[Any]:
+    try:
+        while True:
+            _start_sampling(record)
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                chunk = next(iterator)
+            finally:
+                record["wall_s"] += time.perf_counter() - wall
+                record["cpu_s"] += time.process_time() - cpu
+                _stop_sampling(record)
+            record["rows_out"] += len(chunk)
+            yield chunk
+    except StopIteration:
+        pass
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        _close_record(record)
+        _stage_closed(report, record)
+
+
+def fct_count_rows(data: Union[Any, Dict[str, Any]]) -> int:
+    """
+    Nombre de lignes d'un DataFrame ou d'un dictionnaire de DataFrames.
+    """
+    if isinstance(data, dict):
+        return sum(len(df) for df in data.values())
+    return len(data)
+
+
+def fct_finish_run_report(report: Dict[str, Any], status: str = "ok") -> Dict[str, Any]:
+    """
+    Clôt le rapport : durée totale, temps CPU, maximum de RSS et statut.
+    """
+    wall, cpu = report.pop("_start", (time.perf_counter(), time.process_time()))
+    report["finished_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+    report["status"] = status
+    report["wall_s"] = round(time.perf_counter() - wall, 4)
+    report["cpu_s"] = round(time.process_time() - cpu, 4)
+    report["peak_rss_mb"] = round(max(
+        [fct_peak_rss_bytes() / MB]
+        + [stage.get("peak_rss_mb") or 0 for stage in report["stages"]]
+    ), 1)
+    return report
+
+
+def fct_write_run_report(report: Dict[str, Any], report_dir: Union[str, Path]) -> Path:
+    """
+    Écrit le rapport en JSON dans ``report_dir/run_<run_id>.json``.
+
+    Retour :
+        Path : chemin du fichier écrit
+    """
+    path = Path(report_dir) / f"run_{report['run_id']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    serializable = {key: value for key, value in report.items() if not key.startswith("_")}
+    path.write_text(json.dumps(serializable, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def fct_format_run_report(report: Dict[str, Any]) -> List[str]:
+    """
+    Résumé lisible du rapport : une ligne par étape.
+    """
+    lines = []
+    for stage in report["stages"]:
+        label = stage["stage"] + (f" {stage['edition']}" if stage["edition"] else "")
+        rows = stage["rows_out"] if stage["rows_out"] is not None else stage["rows_in"]
+        rows_text = f"{rows:>10} lignes" if rows is not None else " " * 17
+        throughput = f"{stage['rows_per_s']:>12,.0f} l/s" if stage.get("rows_per_s") else " " * 16
+        error = "" if stage["status"] == "ok" else f"  [{stage.get('error', 'error')}]"
+        lines.append(
+            f"{label:<16}{stage['wall_s']:>9.3f} s{stage['cpu_s']:>9.3f} s CPU"
+            f"{rows_text}{throughput}{stage.get('peak_rss_mb', 0):>9.1f} Mo{error}"
+        )
+    return lines
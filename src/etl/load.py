@@ -1,20 +1,155 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    create_engine, event, text, inspect, select, literal, tuple_, or_, and_,
+    case, union_all, func, exc, MetaData, Table, Column, Index, ForeignKey,
+    Integer, String, Date, DateTime
+    )
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.engine import Engine
-from typing import Optional, List, Dict, Any
+from sqlalchemy.schema import CreateTable, DropTable
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Union
+from sqlalchemy.engine import make_url
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import atexit
+import base64
+import datetime
+import hashlib
+import json
+import io
+import itertools
+import threading
 import os
 import yaml
 from pathlib import Path
 
-def create_postgres_engine(
+# Registre des moteurs : un Engine (et son pool de connexions) par DSN
+_ENGINES: Dict[str, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def build_postgres_dsn(
     host: str,
     database: str,
     user: str,
     password: str,
     port: int = 5432
+) -> str:
+    """
+    Construit le DSN SQLAlchemy (psycopg2) d'une base PostgreSQL.
+    """
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
+
+
+def get_engine(
+    dsn: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+    statement_timeout: Optional[int] = None,
+    executemany_page_size: int = 1_000
+) -> Engine:
+    """
+    Renvoie le moteur SQLAlchemy associé à ``dsn``, créé au premier appel puis réutilisé.
+
+    Les appels suivants avec le même DSN renvoient le même Engine, donc le
+    même pool de connexions déjà ouvertes (les paramètres de pool ne
+    s'appliquent qu'à la création). Les moteurs sont libérés par
+    ``dispose_engine`` / ``dispose_all_engines``, appelé automatiquement à
+    la sortie du processus.
+
+    Paramètres
+    ----------
+    dsn : str
+        URL SQLAlchemy de la base
+    pool_size : int
+        Nombre de connexions conservées ouvertes dans le pool
+    max_overflow : int
+        Connexions supplémentaires autorisées au-delà de ``pool_size``
+    pool_recycle : int
+        Durée de vie maximale d'une connexion (secondes), -1 pour désactiver
+    statement_timeout : int, optionnel
+        Durée maximale d'une requête en millisecondes (PostgreSQL)
+    executemany_page_size : int
+        Jeux de paramètres regroupés par aller-retour dans un executemany
+        (psycopg2) : avec ``executemany_mode="values_plus_batch"``, les
+        UPDATE / DELETE et requêtes textuelles passent par
+        ``psycopg2.extras.execute_batch`` au lieu d'un aller-retour par ligne
+
+    Retour
+    ------
+    sqlalchemy.engine.Engine
+        Moteur partagé pour ce DSN
+    """
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(dsn)
+        if engine is None:
+            options: Dict[str, Any] = {"pool_pre_ping": True}
+            url = make_url(dsn)
+            # SQLite : pool adapté au fichier / à la mémoire choisi par SQLAlchemy
+            if url.get_backend_name() != "sqlite":
+                options.update(
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_recycle=pool_recycle
+                )
+                if statement_timeout is not None:
+                    options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout)}"}
+            # psycopg2 : par défaut (values_only), seuls les INSERT construits
+            # sont regroupés ; les UPDATE / DELETE partiraient ligne par ligne
+            if url.get_driver_name() == "psycopg2":
+                options.update(
+                    executemany_mode="values_plus_batch",
+                    executemany_batch_page_size=executemany_page_size,
+                    insertmanyvalues_page_size=executemany_page_size
+                )
+            engine = create_engine(dsn, **options)
+            _ENGINES[dsn] = engine
+        return engine
+
+
+def dispose_engine(dsn: str) -> bool:
+    """
+    Ferme le pool du moteur associé à ``dsn`` et le retire du registre.
+
+    Retour
+    ------
+    bool
+        True si un moteur était enregistré pour ce DSN
+    """
+    with _ENGINES_LOCK:
+        engine = _ENGINES.pop(dsn, None)
+    if engine is None:
+        return False
+    engine.dispose()
+    return True
+
+
+def dispose_all_engines() -> None:
+    """
+    Ferme les pools de tous les moteurs enregistrés et vide le registre.
+    """
+    with _ENGINES_LOCK:
+        engines = list(_ENGINES.values())
+        _ENGINES.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+atexit.register(dispose_all_engines)
+
+
+def create_postgres_engine(
+    host: str,
+    database: str,
+    user: str,
+    password: str,
+    port: int = 5432,
+    **pool_options: Any
 ) -> Optional[Engine]:
     """
-    Crée un moteur SQLAlchemy pour PostgreSQL.
+    Renvoie le moteur SQLAlchemy (partagé, voir ``get_engine``) d'une base PostgreSQL.
 
     Paramètres
     ----------
@@ -28,6 +163,9 @@ def create_postgres_engine(
         Mot de passe
     port : int, optionnel
         Port PostgreSQL (par défaut 5432)
+    **pool_options
+        pool_size, max_overflow, pool_recycle, statement_timeout,
+        executemany_page_size (voir ``get_engine``)
 
     Retour
     ------
@@ -35,16 +173,208 @@ def create_postgres_engine(
         Moteur SQLAlchemy ou None en cas d'erreur
     """
     try:
-        engine = create_engine(
-            f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}",
-            pool_pre_ping=True
-        )
-        return engine
+        return get_engine(build_postgres_dsn(host, database, user, password, port), **pool_options)
     except Exception as e:
         print(f"Erreur de création du moteur SQLAlchemy : {e}")
         return None
 
 
+
+def create_sqlite_engine(path: Union[str, Path]) -> Engine:
+    """
+    Renvoie le moteur SQLAlchemy (partagé, voir ``get_engine``) d'une base SQLite locale.
+
+    Chaque connexion passe en journal WAL (les lecteurs ne sont pas bloqués
+    pendant un chargement) avec ``synchronous=NORMAL`` ; le chargement en
+    masse (``sqlite_load_table``) désactive la synchronisation le temps de
+    sa transaction.
+
+    Paramètres
+    ----------
+    path : str | Path
+        Fichier de la base (créé si besoin)
+
+    Retour
+    ------
+    sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    dsn = f"sqlite:///{Path(path).resolve()}"
+    with _ENGINES_LOCK:
+        is_new = dsn not in _ENGINES
+    engine = get_engine(dsn)
+    if is_new:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Pragmas appliqués à chaque nouvelle connexion SQLite.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+# Colonne portant l'empreinte (MD5 hexadécimal) du contenu de chaque ligne
+ROW_HASH_COLUMN = "row_hash"
+
+
+def build_matches_table(
+    metadata: MetaData,
+    table_name: str = "matches",
+    indexes: Optional[List[Any]] = None,
+    partition_by: Optional[str] = None
+) -> Table:
+    """
+    Déclare la table ``matches`` (schéma cible du pipeline) dans ``metadata``.
+
+    Paramètres
+    ----------
+    metadata : sqlalchemy.MetaData
+        Métadonnées auxquelles rattacher la table
+    table_name : str
+        Nom de la table
+    indexes : list, optionnel
+        Index btree à déclarer : une colonne ou une liste de colonnes par index
+        (ex : ``["home_team", ["date", "match_id"]]``), nommés ``ix_<table>_<colonnes>``
+    partition_by : str, optionnel
+        Colonne de partitionnement LIST (PostgreSQL). Elle est ajoutée à la
+        clé primaire, PostgreSQL exigeant que toute contrainte d'unicité d'une
+        table partitionnée contienne la clé de partition.
+
+    Retour
+    ------
+    sqlalchemy.Table
+        Définition de la table
+    """
+    def pk(name):
+        return name == "match_id" or name == partition_by
+
+    options = {"postgresql_partition_by": f"LIST ({partition_by})"} if partition_by else {}
+    table = Table(
+        table_name,
+        metadata,
+        Column("match_id", Integer, primary_key=True),
+        # NULL : date partielle (année seule, voir edition) ou invalide
+        Column("date", Date),
+        Column("home_team", String(100)),
+        Column("away_team", String(100)),
+        Column("home_result", Integer),
+        Column("away_result", Integer),
+        Column("stage", String(50)),
+        Column("edition", Integer, primary_key=pk("edition")),
+        Column("city", String(100)),
+        # empreinte du contenu de la ligne (chargement différentiel)
+        Column(ROW_HASH_COLUMN, String(32)),
+        **options
+        )
+    table.info["partition_by"] = partition_by
+    for columns in indexes or []:
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        Index(f"ix_{table_name}_{'_'.join(columns)}", *(table.c[col] for col in columns))
+    return table
+
+
+def _partition_name(table_name: str, value: Any = None) -> str:
+    """
+    Nom de la partition de ``table_name`` pour ``value`` (partition par défaut si None).
+    """
+    return f"{table_name}_default" if value is None else f"{table_name}_p{value}"
+
+
+def _create_partitions_sql(
+    engine: Engine,
+    table_name: str,
+    schema: Optional[str],
+    values: Iterable[Any],
+    unlogged: bool = False
+) -> List[str]:
+    """
+    Instructions CREATE TABLE ... PARTITION OF (LIST) pour chaque valeur, plus
+    une partition par défaut recueillant les valeurs imprévues.
+    """
+    parent = qualified_name(engine, table_name, schema)
+    persistence = "UNLOGGED " if unlogged else ""
+    statements = []
+    for value in list(values) + [None]:
+        bound = "DEFAULT" if value is None else (
+            "FOR VALUES IN ("
+            + str(literal(value).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            + ")"
+        )
+        statements.append(
+            f"CREATE {persistence}TABLE IF NOT EXISTS "
+            f"{qualified_name(engine, _partition_name(table_name, value), schema)} "
+            f"PARTITION OF {parent} {bound}"
+        )
+    return statements
+
+
+# ----------------------------
+# VERSION DES DONNÉES CHARGÉES
+# ----------------------------
+
+LOAD_VERSION_TABLE = "etl_load_version"
+
+# Table à une ligne : numéro de version incrémenté par chaque chargement réussi
+_LOAD_VERSION = Table(
+    LOAD_VERSION_TABLE, MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("version", Integer, nullable=False),
+    Column("loaded_at", DateTime),
+)
+
+
+def _bump_load_version(conn) -> None:
+    """
+    Incrémente la version des données dans la transaction ``conn``.
+
+    Appelée dans la transaction qui publie les données : la nouvelle version
+    n'est visible qu'avec elles, et pas du tout en cas d'échec.
+    """
+    _LOAD_VERSION.create(conn, checkfirst=True)
+    updated = conn.execute(
+        _LOAD_VERSION.update()
+        .where(_LOAD_VERSION.c.id == 1)
+        .values(version=_LOAD_VERSION.c.version + 1, loaded_at=func.current_timestamp())
+    )
+    if updated.rowcount == 0:
+        conn.execute(_LOAD_VERSION.insert().values(id=1, version=1, loaded_at=func.current_timestamp()))
+
+
+def bump_load_version(engine: Engine) -> None:
+    """
+    Incrémente la version des données chargées.
+
+    Les fonctions de chargement (``swap_load_table``, ``sqlite_load_table``,
+    ``delta_load_table``, ``load_star_schema``) le font d'elles-mêmes ; à
+    appeler après une écriture ponctuelle (``execute_query``,
+    ``execute_many``) pour invalider les résultats mis en cache.
+    """
+    with engine.begin() as conn:
+        _bump_load_version(conn)
+
+
+def get_load_version(engine: Engine) -> int:
+    """
+    Renvoie la version des données chargées (0 si aucun chargement n'a eu lieu).
+    """
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(
+                select(_LOAD_VERSION.c.version).where(_LOAD_VERSION.c.id == 1)
+            ).scalar()
+    except exc.DBAPIError:
+        # table absente : base jamais chargée
+        return 0
+    return int(version or 0)
+
+
 def execute_select(
     engine: Engine,
     query: str,
@@ -68,6 +398,203 @@ def select_to_dataframe(
     return pd.read_sql(text(query), engine, params=params)
 
 
+def iter_select(
+    engine: Engine,
+    query: str,
+    params: dict | None = None,
+    fetch_size: int = 10_000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Exécute une requête SELECT et restitue les résultats par lots de dictionnaires.
+
+    Le résultat est lu par un curseur côté serveur (``stream_results`` /
+    ``yield_per``) : seules ``fetch_size`` lignes sont présentes à la fois
+    côté client, quelle que soit la taille du résultat. La connexion reste
+    ouverte jusqu'à épuisement (ou fermeture) du générateur.
+
+    Paramètres
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    query : str
+        Requête SELECT
+    params : dict, optionnel
+        Paramètres de la requête
+    fetch_size : int
+        Nombre de lignes lues par aller-retour et par lot restitué
+
+    Retour
+    ------
+    Iterator[list]
+        Lots successifs de lignes (dictionnaires colonne -> valeur)
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=fetch_size).execute(text(query), params or {})
+        for partition in result.mappings().partitions(fetch_size):
+            yield [dict(row) for row in partition]
+
+
+def iter_select_dataframes(
+    engine: Engine,
+    query: str,
+    params: dict | None = None,
+    chunksize: int = 10_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Exécute une requête SELECT et restitue le résultat par DataFrames d'au plus ``chunksize`` lignes.
+
+    Même lecture par curseur côté serveur que ``iter_select`` : la mémoire
+    client est bornée par un lot, quelle que soit la taille du résultat.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunksize).execute(text(query), params or {})
+        columns = list(result.keys())
+        for partition in result.partitions(chunksize):
+            yield pd.DataFrame.from_records(partition, columns=columns)
+
+
+def encode_page_cursor(date: Optional[datetime.date], match_id: int) -> str:
+    """
+    Encode la position (date, match_id) d'une ligne en curseur de pagination
+    opaque ; la date peut être None (matchs sans date complète).
+    """
+    payload = json.dumps(
+        {"date": date.isoformat() if date is not None else None, "match_id": int(match_id)},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[Optional[datetime.date], int]:
+    """
+    Décode un curseur produit par ``encode_page_cursor``.
+
+    Lève
+    ----
+    ValueError
+        Si le curseur est mal formé
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        date = payload["date"]
+        return (datetime.date.fromisoformat(date) if date is not None else None), int(payload["match_id"])
+    except Exception as e:
+        raise ValueError(f"Curseur de pagination invalide : {cursor!r}") from e
+
+
+def _typed_page(rows: List[Any], table: Table) -> pd.DataFrame:
+    """
+    DataFrame typé d'une page : entiers nullables (Int64), dates datetime64, textes string.
+    """
+    df = pd.DataFrame.from_records(rows, columns=[col.name for col in table.columns])
+    dtypes = {}
+    for col in table.columns:
+        if isinstance(col.type, Integer):
+            dtypes[col.name] = "Int64"
+        elif isinstance(col.type, String):
+            dtypes[col.name] = "string"
+    df = df.astype(dtypes)
+    for col in table.columns:
+        if isinstance(col.type, Date):
+            df[col.name] = pd.to_datetime(df[col.name])
+    return df
+
+
+def select_matches_page(
+    engine: Engine,
+    cursor: Optional[str] = None,
+    page_size: int = 100,
+    edition: Optional[int] = None,
+    team: Optional[str] = None,
+    stage: Optional[str] = None,
+    table_name: str = "matches"
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Lit une page de la table ``matches`` par pagination par clé (keyset) sur ``(date, match_id)``.
+
+    Contrairement à ``LIMIT/OFFSET``, qui lit puis jette toutes les lignes des
+    pages précédentes, chaque page reprend après la dernière clé lue
+    (``(date, match_id) > (:date, :match_id)``) : avec l'index
+    ``(date, match_id)``, le coût d'une page ne dépend pas de sa profondeur.
+    Les matchs sans date complète (années seules 1930-2010) viennent en
+    dernier, par match_id : ils forment un second segment, lu par une
+    requête distincte quand le premier ne remplit pas la page.
+
+    Paramètres
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    cursor : str, optionnel
+        Curseur renvoyé par la page précédente (None : première page)
+    page_size : int
+        Nombre maximal de lignes par page
+    edition : int, optionnel
+        Filtre sur l'édition
+    team : str, optionnel
+        Filtre sur une équipe (à domicile ou à l'extérieur)
+    stage : str, optionnel
+        Filtre sur la phase
+    table_name : str
+        Nom de la table
+
+    Retour
+    ------
+    tuple
+        (page typée, curseur de la page suivante ou None s'il n'y en a plus)
+    """
+    table = build_matches_table(MetaData(), table_name)
+    query = select(table)
+    if edition is not None:
+        query = query.where(table.c.edition == edition)
+    if team is not None:
+        query = query.where(or_(table.c.home_team == team, table.c.away_team == team))
+    if stage is not None:
+        query = query.where(table.c.stage == stage)
+    last_date, last_match_id = decode_page_cursor(cursor) if cursor is not None else (None, None)
+
+    # Deux segments lus chacun dans l'ordre d'un index, sans OR qui
+    # empêcherait un parcours d'intervalle : les matchs datés d'abord,
+    # ((date, match_id) > curseur), puis, si la page n'est pas pleine, les
+    # matchs sans date (match_id > curseur). Une ligne de plus que la page
+    # indique s'il reste des données.
+    rows = []
+    with engine.connect() as conn:
+        if cursor is None or last_date is not None:
+            dated = query.where(table.c.date.is_not(None))
+            if cursor is not None:
+                dated = dated.where(tuple_(table.c.date, table.c.match_id) > tuple_(last_date, last_match_id))
+            rows = conn.execute(dated.order_by(table.c.date, table.c.match_id).limit(page_size + 1)).all()
+        if len(rows) <= page_size:
+            undated = query.where(table.c.date.is_(None))
+            if last_date is None and last_match_id is not None:
+                undated = undated.where(table.c.match_id > last_match_id)
+            rows += conn.execute(undated.order_by(table.c.match_id).limit(page_size + 1 - len(rows))).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_page_cursor(rows[-1].date, rows[-1].match_id)
+    return _typed_page(rows, table), next_cursor
+
+
+def iter_matches_pages(
+    engine: Engine,
+    page_size: int = 100,
+    **filters: Any
+) -> Iterator[pd.DataFrame]:
+    """
+    Parcourt toutes les pages de ``select_matches_page`` pour les filtres donnés.
+    """
+    cursor = None
+    while True:
+        page, cursor = select_matches_page(engine, cursor=cursor, page_size=page_size, **filters)
+        if not page.empty:
+            yield page
+        if cursor is None:
+            return
+
+
 def execute_query(
     engine: Engine,
     query: str,
@@ -83,6 +610,87 @@ def execute_query(
         print(f"Erreur SQL : {e}")
 
 
+class BatchExecutionError(Exception):
+    """
+    Échec d'une page de ``execute_many`` : la transaction entière est annulée.
+
+    Attributs
+    ---------
+    batch_index : int
+        Numéro (à partir de 0) de la page en échec
+    first_row : int
+        Position, dans l'itérable de paramètres, du premier jeu de la page
+    rows : int
+        Nombre de jeux de paramètres de la page
+    """
+
+    def __init__(self, batch_index: int, first_row: int, rows: int, error: Exception):
+        super().__init__(
+            f"Échec de la page {batch_index} (jeux de paramètres {first_row} "
+            f"à {first_row + rows - 1}) : {error}"
+        )
+        self.batch_index = batch_index
+        self.first_row = first_row
+        self.rows = rows
+
+
+def execute_many(
+    engine: Engine,
+    query: str,
+    params: Iterable[Dict[str, Any]],
+    page_size: int = 1_000
+) -> int:
+    """
+    Exécute une requête INSERT, UPDATE ou DELETE pour une série de jeux de paramètres.
+
+    Les jeux de paramètres sont envoyés par pages de ``page_size`` en
+    executemany, le tout dans une seule transaction et un seul commit. Sur
+    PostgreSQL, le moteur de ``get_engine`` regroupe chaque page avec
+    ``psycopg2.extras.execute_batch`` (``executemany_mode="values_plus_batch"``) :
+    un aller-retour par tranche de ``executemany_page_size`` jeux (1000 par
+    défaut), donc un par page tant que ``page_size`` ne dépasse pas cette
+    valeur. Un moteur créé autrement (``values_only``, défaut de
+    SQLAlchemy) enverrait les UPDATE / DELETE ligne par ligne. Contrairement à
+    ``execute_query``, l'erreur n'est pas avalée : la transaction est annulée
+    et une ``BatchExecutionError`` indique la page en cause.
+
+    Paramètres
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    query : str
+        Requête paramétrée (ex : ``UPDATE matches SET home_result = :r WHERE match_id = :id``)
+    params : Iterable[dict]
+        Jeux de paramètres, consommés page par page
+    page_size : int
+        Nombre de jeux de paramètres par executemany
+
+    Retour
+    ------
+    int
+        Nombre de jeux de paramètres exécutés
+
+    Lève
+    ----
+    BatchExecutionError
+        Si une page échoue (aucune modification n'est conservée)
+    """
+    statement = text(query)
+    iterator = iter(params)
+    n_params = 0
+    with engine.begin() as conn:
+        for batch_index in itertools.count():
+            page = list(itertools.islice(iterator, page_size))
+            if not page:
+                break
+            try:
+                conn.execute(statement, page)
+            except Exception as e:
+                raise BatchExecutionError(batch_index, n_params, len(page), e) from e
+            n_params += len(page)
+    return n_params
+
+
 def dataframe_to_table(
     df: pd.DataFrame,
     table_name: str,
@@ -102,3 +710,1046 @@ def dataframe_to_table(
         method="multi"
     )
 
+
+
+def dataframe_chunks_to_parquet(
+    chunks: Iterable[pd.DataFrame],
+    root_path: str,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: int = 100_000,
+    compression: str = "zstd"
+) -> int:
+    """
+    Écrit un flux de DataFrames en jeu de données Parquet partitionné (alternative à la base).
+
+    Le jeu est écrit par ``pyarrow.dataset`` en partitionnement Hive
+    (``edition=2018/part-0.parquet`` par défaut), un morceau à la fois. Les
+    colonnes texte sont encodées en dictionnaire et chaque row group porte ses
+    statistiques min/max : un lecteur ne lit que les partitions, colonnes et
+    row groups utiles (voir ``read_parquet_dataset``). Les partitions
+    présentes dans le flux remplacent les partitions existantes de même valeur.
+    La colonne interne ``row_hash`` (chargement différentiel en base) n'est
+    pas écrite.
+
+    Paramètres
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Morceaux à écrire (mêmes colonnes)
+    root_path : str
+        Répertoire racine du jeu de données
+    partition_cols : list, optionnel
+        Colonnes de partitionnement (par défaut ``["edition"]``)
+    row_group_size : int
+        Nombre maximal de lignes par row group
+    compression : str
+        Codec Parquet (zstd, snappy, gzip, none)
+
+    Retour
+    ------
+    int
+        Nombre de lignes écrites
+    """
+    partition_cols = partition_cols or ["edition"]
+    chunks = (chunk.drop(columns=ROW_HASH_COLUMN, errors="ignore") for chunk in chunks)
+    first = next(chunks, None)
+    if first is None:
+        return 0
+    # schéma du premier morceau imposé aux suivants (ex : colonne vide typée null)
+    schema = pa.Schema.from_pandas(first, preserve_index=False)
+    n_rows = 0
+
+    def batches():
+        nonlocal n_rows
+        for chunk in itertools.chain([first], chunks):
+            n_rows += len(chunk)
+            yield from pa.Table.from_pandas(chunk, schema=schema, preserve_index=False).to_batches()
+
+    text_columns = [
+        field.name for field in schema
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+    ]
+    file_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        batches(),
+        root_path,
+        schema=schema,
+        format=file_format,
+        file_options=file_format.make_write_options(
+            use_dictionary=text_columns,
+            write_statistics=True,
+            compression=compression
+        ),
+        partitioning=ds.partitioning(
+            pa.schema([schema.field(col) for col in partition_cols]), flavor="hive"
+        ),
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, 10_000),
+        existing_data_behavior="delete_matching"
+    )
+    return n_rows
+
+
+def read_parquet_dataset(
+    root_path: str,
+    columns: Optional[List[str]] = None,
+    filters=None
+) -> pd.DataFrame:
+    """
+    Lit un jeu Parquet écrit par ``dataframe_chunks_to_parquet``.
+
+    Les filtres portant sur les colonnes de partitionnement éliminent des
+    répertoires entiers ; les autres s'appuient sur les statistiques des row
+    groups. Seules les ``columns`` demandées sont décodées.
+
+    Paramètres
+    ----------
+    root_path : str
+        Répertoire racine du jeu de données
+    columns : list, optionnel
+        Colonnes à lire
+    filters : pyarrow.compute.Expression | list, optionnel
+        Filtre (ex : ``ds.field("edition") == 2018`` ou ``[("edition", "=", 2018)]``)
+
+    Retour
+    ------
+    pd.DataFrame
+        Données lues
+    """
+    if filters is not None and not isinstance(filters, ds.Expression):
+        filters = pq.filters_to_expression(filters)
+    dataset = ds.dataset(root_path, format="parquet", partitioning="hive")
+    return dataset.to_table(columns=columns, filter=filters).to_pandas()
+
+
+def dataframe_chunks_to_table(
+    chunks: Iterable[pd.DataFrame],
+    table_name: str,
+    engine: Engine,
+    schema: str = "public",
+    if_exists: str = "append"
+) -> int:
+    """
+    Insère un flux de DataFrames pandas dans une table PostgreSQL, morceau par morceau.
+
+    ``if_exists`` s'applique au premier morceau ; les suivants sont ajoutés.
+    Un seul morceau est en mémoire à la fois.
+
+    Retour
+    ------
+    int
+        Nombre total de lignes insérées
+    """
+    n_rows = 0
+    for chunk in chunks:
+        dataframe_to_table(chunk, table_name, engine, schema=schema, if_exists=if_exists)
+        if_exists = "append"
+        n_rows += len(chunk)
+    return n_rows
+
+
+def qualified_name(engine: Engine, table_name: str, schema: Optional[str] = None) -> str:
+    """
+    Nom de table (éventuellement préfixé du schéma) correctement échappé pour le dialecte.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    return f"{quote(schema)}.{quote(table_name)}" if schema else quote(table_name)
+
+
+def _insert_select(engine: Engine, table: Table, table_name: str, select_sql: str):
+    """
+    ``INSERT INTO <table_name> (colonnes de table) <select_sql>``.
+
+    ``select_sql`` est une requête sans paramètre lié, dont les colonnes
+    suivent l'ordre de ``table`` ; ses ``:`` (formats de date, motifs) sont
+    échappés pour ``text``.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(col.name) for col in table.columns)
+    statement = f"INSERT INTO {qualified_name(engine, table_name, table.schema)} ({columns}) {select_sql}"
+    return text(statement.replace(":", "\\:"))
+
+
+def _iter_slices(chunks: Iterable[pd.DataFrame], chunksize: int) -> Iterable[pd.DataFrame]:
+    """
+    Redécoupe un flux de DataFrames en tranches d'au plus ``chunksize`` lignes.
+    """
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunksize):
+            yield chunk.iloc[start:start + chunksize]
+
+
+def _dataframe_to_csv_buffer(df: pd.DataFrame) -> io.StringIO:
+    """
+    Sérialise un DataFrame au format CSV attendu par COPY (valeurs manquantes = \\N).
+
+    Les entiers nullables (Int64) sont écrits sans décimale, les dates et
+    datetimes au format ISO.
+    """
+    # flottants à valeurs entières (entiers avec NaN) -> Int64, sinon "3.0" serait refusé
+    float_columns = [
+        col for col in df.columns
+        if pd.api.types.is_float_dtype(df[col]) and (df[col].dropna() % 1 == 0).all()
+    ]
+    if float_columns:
+        df = df.astype({col: "Int64" for col in float_columns})
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep="\\N", date_format="%Y-%m-%d %H:%M:%S")
+    buffer.seek(0)
+    return buffer
+
+
+def _dataframe_to_records(df: pd.DataFrame, params: List[str]) -> List[Dict[str, Any]]:
+    """
+    Convertit un DataFrame en paramètres pour executemany (NA -> None, types Python natifs).
+    """
+    values = df.astype(object).where(df.notna(), None)
+    return [dict(zip(params, row)) for row in values.itertuples(index=False, name=None)]
+
+
+def copy_chunks_to_table(
+    chunks: Iterable[pd.DataFrame],
+    table_name: str,
+    engine: Engine,
+    schema: Optional[str] = None,
+    chunksize: int = 50_000,
+    truncate: bool = False
+) -> int:
+    """
+    Charge en masse un flux de DataFrames dans une table existante.
+
+    Sur PostgreSQL, chaque tranche de ``chunksize`` lignes est envoyée en CSV
+    via ``COPY ... FROM STDIN`` (``copy_expert`` de psycopg2), bien plus
+    économe côté client qu'un ``INSERT`` multi-lignes. Sur les autres moteurs,
+    repli sur un ``executemany`` par tranche. Dans les deux cas, tout le
+    chargement se fait dans une seule transaction.
+
+    Paramètres
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Morceaux à charger (mêmes colonnes que la table cible)
+    table_name : str
+        Nom de la table cible (doit exister)
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    schema : str, optionnel
+        Schéma de la table
+    chunksize : int
+        Nombre de lignes par COPY / executemany
+    truncate : bool
+        Vider la table dans la même transaction avant le chargement
+
+    Retour
+    ------
+    int
+        Nombre total de lignes chargées
+    """
+    qualified = qualified_name(engine, table_name, schema)
+    quote = engine.dialect.identifier_preparer.quote
+    n_rows = 0
+
+    if engine.dialect.name == "postgresql":
+        raw_connection = engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            if truncate:
+                cursor.execute(f"TRUNCATE TABLE {qualified}")
+            for chunk in _iter_slices(chunks, chunksize):
+                columns = ", ".join(quote(str(col)) for col in chunk.columns)
+                cursor.copy_expert(
+                    f"COPY {qualified} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                    _dataframe_to_csv_buffer(chunk)
+                )
+                n_rows += len(chunk)
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+        return n_rows
+
+    # Repli générique : executemany par tranche, une seule transaction
+    with engine.begin() as conn:
+        if truncate:
+            conn.execute(text(f"DELETE FROM {qualified}"))
+        for chunk in _iter_slices(chunks, chunksize):
+            params = [f"p{i}" for i in range(len(chunk.columns))]
+            insert = text(
+                f"INSERT INTO {qualified} "
+                f"({', '.join(quote(str(col)) for col in chunk.columns)}) "
+                f"VALUES ({', '.join(':' + p for p in params)})"
+            )
+            conn.execute(insert, _dataframe_to_records(chunk, params))
+            n_rows += len(chunk)
+    return n_rows
+
+
+def copy_dataframe_to_table(
+    df: pd.DataFrame,
+    table_name: str,
+    engine: Engine,
+    schema: Optional[str] = None,
+    chunksize: int = 50_000,
+    truncate: bool = False
+) -> int:
+    """
+    Charge en masse un DataFrame dans une table existante (COPY sur PostgreSQL).
+
+    Voir ``copy_chunks_to_table``.
+    """
+    return copy_chunks_to_table([df], table_name, engine, schema=schema,
+                                chunksize=chunksize, truncate=truncate)
+
+
+def _build_staging_table(table: Table, staging_name: str, is_postgres: bool, unlogged: bool) -> Table:
+    """
+    Table de staging aux colonnes de ``table``.
+
+    Sur PostgreSQL elle est créée sans contrainte ni index (et UNLOGGED si
+    demandé) : clé primaire, NOT NULL et index sont construits après le
+    chargement. Une table partitionnée ne pouvant être UNLOGGED, ce sont
+    alors ses partitions qui le sont. SQLite ne permettant pas d'ajouter une
+    clé primaire après coup, elle y est déclarée dès la création.
+    """
+    columns = [
+        Column(
+            col.name,
+            col.type,
+            primary_key=col.primary_key and not is_postgres,
+            nullable=col.nullable or is_postgres
+        )
+        for col in table.columns
+    ]
+    partition_by = table.info.get("partition_by")
+    options = {"postgresql_partition_by": f"LIST ({partition_by})"} if partition_by else {}
+    prefixes = ["UNLOGGED"] if is_postgres and unlogged and not partition_by else []
+    return Table(staging_name, MetaData(), *columns, schema=table.schema, prefixes=prefixes, **options)
+
+
+def swap_load_table(
+    chunks: Iterable[pd.DataFrame],
+    table: Table,
+    engine: Engine,
+    chunksize: int = 50_000,
+    unlogged: bool = True,
+    partition_values: Optional[Iterable[Any]] = None,
+    stats_table: Optional[Table] = None,
+    selects: Iterable[str] = ()
+) -> int:
+    """
+    Recharge entièrement une table par chargement en staging puis échange atomique.
+
+    1. Chargement en masse (COPY) dans ``<table>_staging``, créée sans index
+       ni contrainte (UNLOGGED sur PostgreSQL).
+    2. Construction de la clé primaire, des NOT NULL et des index de ``table``
+       sur la table de staging, puis retour en mode journalisé.
+    3. Dans une seule transaction : renommage de l'ancienne table, renommage
+       de la staging en ``table``, suppression de l'ancienne.
+
+    Les lecteurs voient l'ancienne table complète jusqu'au commit de l'échange,
+    puis la nouvelle : jamais une table vide ou partiellement chargée. En cas
+    d'erreur avant l'échange, la table en place n'est pas modifiée.
+
+    Paramètres
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Morceaux à charger (colonnes de ``table``)
+    table : sqlalchemy.Table
+        Définition de la table cible (types, clé primaire, index)
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    chunksize : int
+        Nombre de lignes par COPY / executemany
+    unlogged : bool
+        Charger dans une table UNLOGGED (PostgreSQL)
+    partition_values : Iterable, optionnel
+        Valeurs de la clé de partition présentes dans le flux, si ``table`` est
+        partitionnée (PostgreSQL) : une partition est créée par valeur, plus
+        une partition par défaut
+    stats_table : sqlalchemy.Table, optionnel
+        Table d'agrégats (``build_team_edition_stats_table``) recalculée dans
+        la transaction d'échange
+    selects : Iterable[str]
+        Requêtes SELECT (sans paramètre, colonnes dans l'ordre de ``table``)
+        dont les lignes sont insérées côté serveur dans la table de staging,
+        après le COPY (mode ELT, voir ``elt``)
+
+    Retour
+    ------
+    int
+        Nombre de lignes chargées
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+    partitioned = is_postgres and bool(table.info.get("partition_by"))
+    partition_names = (
+        [_partition_name(table.name, value) for value in partition_values or []]
+        + [_partition_name(table.name)]
+        if partitioned else []
+    )
+    quote = engine.dialect.identifier_preparer.quote
+    staging_name = f"{table.name}_staging"
+    old_name = f"{table.name}_old"
+    staging = _build_staging_table(table, staging_name, is_postgres, unlogged)
+    qualified_staging = qualified_name(engine, staging_name, table.schema)
+
+    # 1. Staging vide, puis chargement en masse
+    with engine.begin() as conn:
+        conn.execute(DropTable(staging, if_exists=True))
+        conn.execute(CreateTable(staging))
+        if partitioned:
+            for statement in _create_partitions_sql(engine, staging_name, table.schema,
+                                                    partition_values or [], unlogged=unlogged):
+                conn.execute(text(statement))
+    n_rows = copy_chunks_to_table(chunks, staging_name, engine, schema=table.schema,
+                                  chunksize=chunksize)
+    selects = list(selects)
+    if selects:
+        with engine.begin() as conn:
+            for select_sql in selects:
+                n_rows += conn.execute(_insert_select(engine, table, staging_name, select_sql)).rowcount
+
+    # 2. Contraintes et index construits après le chargement (PostgreSQL)
+    pk_columns = ", ".join(quote(col.name) for col in table.primary_key.columns)
+    if is_postgres:
+        with engine.begin() as conn:
+            for col in table.columns:
+                if not col.nullable and not col.primary_key:
+                    conn.execute(text(
+                        f"ALTER TABLE {qualified_staging} ALTER COLUMN {quote(col.name)} SET NOT NULL"
+                    ))
+            if pk_columns:
+                conn.execute(text(
+                    f"ALTER TABLE {qualified_staging} "
+                    f"ADD CONSTRAINT {quote(staging_name + '_pkey')} PRIMARY KEY ({pk_columns})"
+                ))
+            for index in table.indexes:
+                conn.execute(text(_create_index_sql(engine, index, staging_name, index.name + "_staging")))
+            if unlogged:
+                for name in ([staging_name + name[len(table.name):] for name in partition_names]
+                             if partitioned else [staging_name]):
+                    conn.execute(text(f"ALTER TABLE {qualified_name(engine, name, table.schema)} SET LOGGED"))
+
+    # 3. Échange atomique
+    with engine.begin() as conn:
+        if inspect(conn).has_table(table.name, schema=table.schema):
+            conn.execute(text(
+                f"ALTER TABLE {qualified_name(engine, table.name, table.schema)} "
+                f"RENAME TO {quote(old_name)}"
+            ))
+        conn.execute(text(f"ALTER TABLE {qualified_staging} RENAME TO {quote(table.name)}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {qualified_name(engine, old_name, table.schema)}"))
+
+        qualified_table = qualified_name(engine, table.name, table.schema)
+        if is_postgres:
+            if pk_columns:
+                conn.execute(text(
+                    f"ALTER TABLE {qualified_table} RENAME CONSTRAINT "
+                    f"{quote(staging_name + '_pkey')} TO {quote(table.name + '_pkey')}"
+                ))
+            for index in table.indexes:
+                conn.execute(text(
+                    f"ALTER INDEX {qualified_name(engine, index.name + '_staging', table.schema)} "
+                    f"RENAME TO {quote(index.name)}"
+                ))
+            for name in partition_names:
+                conn.execute(text(
+                    f"ALTER TABLE {qualified_name(engine, staging_name + name[len(table.name):], table.schema)} "
+                    f"RENAME TO {quote(name)}"
+                ))
+        else:
+            # SQLite : pas de renommage d'index, création après suppression de l'ancienne table
+            for index in table.indexes:
+                conn.execute(text(_create_index_sql(engine, index, table.name, index.name)))
+        if stats_table is not None:
+            _refresh_team_edition_stats(conn, table, stats_table)
+        _bump_load_version(conn)
+
+    return n_rows
+
+
+def _create_index_sql(engine: Engine, index, table_name: str, index_name: str) -> str:
+    """
+    Instruction CREATE INDEX pour ``index`` sur ``table_name`` sous le nom ``index_name``.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(col.name) for col in index.columns)
+    unique = "UNIQUE " if index.unique else ""
+    return (
+        f"CREATE {unique}INDEX {quote(index_name)} "
+        f"ON {qualified_name(engine, table_name, index.table.schema)} ({columns})"
+    )
+
+
+def _dataframe_to_tuples(df: pd.DataFrame, table: Table, engine: Engine) -> List[tuple]:
+    """
+    Convertit un DataFrame en tuples de paramètres DB-API (NA -> None), les
+    valeurs étant préparées par les types des colonnes de ``table`` (ex : Date
+    -> texte ISO sur SQLite).
+    """
+    values = df.astype(object).where(df.notna(), None)
+    for col in values.columns:
+        if col in table.c:
+            processor = table.c[col].type.bind_processor(engine.dialect)
+            if processor is not None:
+                values[col] = values[col].map(processor)
+    return list(values.itertuples(index=False, name=None))
+
+
+def sqlite_load_table(
+    chunks: Iterable[pd.DataFrame],
+    table: Table,
+    engine: Engine,
+    chunksize: int = 50_000,
+    stats_table: Optional[Table] = None,
+    selects: Iterable[str] = ()
+) -> int:
+    """
+    Recharge entièrement une table SQLite en une seule transaction.
+
+    Même schéma et mêmes index que sur PostgreSQL (``table``) : les lignes
+    sont insérées par executemany de ``chunksize`` lignes dans une table de
+    staging, puis, dans la même transaction, l'ancienne table est supprimée,
+    la staging renommée et les index construits. Pendant le chargement,
+    ``synchronous=OFF`` (pas de fsync) ; en journal WAL, les lecteurs voient
+    l'ancienne table jusqu'au commit.
+
+    Paramètres
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Morceaux à charger (colonnes de ``table``)
+    table : sqlalchemy.Table
+        Définition de la table cible (types, clé primaire, index)
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLite (voir ``create_sqlite_engine``)
+    chunksize : int
+        Nombre de lignes par executemany
+    stats_table : sqlalchemy.Table, optionnel
+        Table d'agrégats (``build_team_edition_stats_table``) recalculée dans
+        la même transaction
+    selects : Iterable[str]
+        Requêtes SELECT (sans paramètre, colonnes dans l'ordre de ``table``)
+        dont les lignes sont insérées dans la table de staging (mode ELT,
+        voir ``elt``)
+
+    Retour
+    ------
+    int
+        Nombre de lignes chargées
+    """
+    staging_name = f"{table.name}_staging"
+    staging = _build_staging_table(table, staging_name, is_postgres=False, unlogged=False)
+    quote = engine.dialect.identifier_preparer.quote
+    n_rows = 0
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                conn.execute(DropTable(staging, if_exists=True))
+                conn.execute(CreateTable(staging))
+                for chunk in _iter_slices(chunks, chunksize):
+                    # executemany DB-API direct (paramètres positionnels) : pas de
+                    # construction de paramètres SQLAlchemy ligne par ligne
+                    insert = (
+                        f"INSERT INTO {quote(staging_name)} "
+                        f"({', '.join(quote(str(col)) for col in chunk.columns)}) "
+                        f"VALUES ({', '.join('?' for _ in chunk.columns)})"
+                    )
+                    conn.exec_driver_sql(insert, _dataframe_to_tuples(chunk, table, engine))
+                    n_rows += len(chunk)
+                for select_sql in selects:
+                    n_rows += conn.execute(_insert_select(engine, table, staging_name, select_sql)).rowcount
+                conn.execute(DropTable(table, if_exists=True))
+                conn.execute(text(f"ALTER TABLE {quote(staging_name)} RENAME TO {quote(table.name)}"))
+                for index in table.indexes:
+                    conn.execute(text(_create_index_sql(engine, index, table.name, index.name)))
+                if stats_table is not None:
+                    _refresh_team_edition_stats(conn, table, stats_table)
+                _bump_load_version(conn)
+        finally:
+            conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+            conn.commit()
+    return n_rows
+
+
+# ----------------------------
+# CHARGEMENT DIFFÉRENTIEL
+# ----------------------------
+
+def _canonical_strings(series: pd.Series) -> pd.Series:
+    """
+    Représentation texte canonique d'une colonne pour le calcul d'empreinte.
+
+    Les flottants à valeurs entières sont écrits comme des entiers (3.0 et 3
+    donnent la même empreinte), les datetimes au format ISO, les valeurs
+    manquantes \\N.
+    """
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype("Int64")
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+    return series.astype(str).where(series.notna(), "\\N")
+
+
+def compute_row_hashes(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """
+    Calcule l'empreinte du contenu de chaque ligne sur les colonnes canoniques.
+
+    Paramètres
+    ----------
+    df : pd.DataFrame
+        Lignes à hacher
+    columns : list
+        Colonnes prises en compte, dans un ordre fixe
+
+    Retour
+    ------
+    pd.Series
+        Empreinte MD5 (hexadécimal, 32 caractères) par ligne, même index que ``df``
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    canonical = [_canonical_strings(df[col]) for col in columns]
+    # séparateur d'unité ASCII : absent des données, évite les collisions "ab"+"c" / "a"+"bc"
+    joined = canonical[0].str.cat(canonical[1:], sep="\x1f")
+    return pd.Series(
+        [hashlib.md5(value.encode("utf-8")).hexdigest() for value in joined],
+        index=df.index,
+        dtype=object
+    )
+
+
+def row_hash_columns(table: Table) -> List[str]:
+    """
+    Colonnes canoniques hachées : toutes les colonnes de ``table`` hors
+    identifiant (première colonne de la clé primaire) et empreinte.
+    """
+    key = table.primary_key.columns.values()[0].name
+    return [col.name for col in table.columns if col.name not in (key, ROW_HASH_COLUMN)]
+
+
+def add_row_hash(df: pd.DataFrame, table: Table) -> pd.DataFrame:
+    """
+    Ajoute (ou recalcule) la colonne d'empreinte de ``table`` sur ``df``.
+    """
+    return df.assign(**{ROW_HASH_COLUMN: compute_row_hashes(df, row_hash_columns(table))})
+
+
+def fetch_stored_hashes(
+    conn,
+    table: Table,
+    partitions: List[Any],
+    partition_col: str = "edition"
+) -> Dict[Any, Optional[str]]:
+    """
+    Récupère en une seule requête les empreintes stockées pour les partitions données.
+
+    Retour
+    ------
+    dict
+        clé primaire -> empreinte stockée
+    """
+    key = table.primary_key.columns.values()[0]
+    query = (
+        select(key, table.c[ROW_HASH_COLUMN])
+        .where(table.c[partition_col].in_(partitions))
+    )
+    return dict(conn.execute(query).all())
+
+
+def _upsert_statement(engine: Engine, table: Table):
+    """
+    ``INSERT ... ON CONFLICT (clé) DO UPDATE`` pour le dialecte du moteur.
+    """
+    dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(table)
+    key_names = [col.name for col in table.primary_key.columns]
+    return stmt.on_conflict_do_update(
+        index_elements=key_names,
+        set_={col.name: stmt.excluded[col.name] for col in table.columns if col.name not in key_names}
+    )
+
+
+def _stored_partitions(
+    conn,
+    table: Table,
+    keys: List[Any],
+    partition_col: str = "edition",
+    chunksize: int = 50_000
+) -> set:
+    """
+    Partitions stockées des lignes de clés ``keys`` (avant leur modification
+    ou leur suppression), par lots de ``chunksize`` clés.
+    """
+    key = table.primary_key.columns.values()[0]
+    found = set()
+    for start in range(0, len(keys), chunksize):
+        query = (
+            select(table.c[partition_col]).distinct()
+            .where(key.in_(keys[start:start + chunksize]))
+        )
+        found.update(value for value in conn.execute(query).scalars() if value is not None)
+    return found
+
+
+def delta_load_partition(
+    df: pd.DataFrame,
+    table: Table,
+    engine: Engine,
+    partition_col: str = "edition",
+    chunksize: int = 50_000,
+    stats_table: Optional[Table] = None
+) -> Dict[str, int]:
+    """
+    Charge une partition en n'envoyant que les lignes insérées, modifiées ou supprimées.
+
+    Les empreintes des lignes de ``df`` sont calculées côté client et
+    comparées à celles stockées pour les mêmes partitions (une seule requête) :
+    seules les lignes nouvelles ou dont l'empreinte diffère sont envoyées par
+    ``INSERT ... ON CONFLICT DO UPDATE``, et les clés disparues des partitions
+    sont supprimées par lots. Le tout dans une seule transaction, qui
+    incrémente aussi la version des données (``get_load_version``) si au
+    moins une ligne a changé.
+
+    Paramètres
+    ----------
+    df : pd.DataFrame
+        Contenu complet des partitions à synchroniser (colonnes de ``table``)
+    table : sqlalchemy.Table
+        Table cible (doit exister, avec la colonne ``row_hash``)
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy (PostgreSQL ou SQLite)
+    partition_col : str
+        Colonne de partition (l'édition par défaut)
+    chunksize : int
+        Nombre de lignes par executemany / par DELETE
+    stats_table : sqlalchemy.Table, optionnel
+        Table d'agrégats (``build_team_edition_stats_table``) : seules les
+        éditions des lignes insérées, modifiées ou supprimées y sont
+        recalculées, dans la même transaction
+
+    Retour
+    ------
+    dict
+        Nombre de lignes ``inserted``, ``updated``, ``deleted`` et ``unchanged``
+    """
+    key = table.primary_key.columns.values()[0].name
+    df = add_row_hash(df, table)[[col.name for col in table.columns]]
+    partitions = df[partition_col].dropna().unique().tolist()
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql" and table.info.get("partition_by"):
+            for statement in _create_partitions_sql(engine, table.name, table.schema, partitions):
+                conn.execute(text(statement))
+        stored = fetch_stored_hashes(conn, table, partitions, partition_col)
+
+        stored_hashes = df[key].map(stored)
+        is_new = ~df[key].isin(stored.keys())
+        is_changed = ~is_new & (stored_hashes != df[ROW_HASH_COLUMN])
+        changed = df[is_new | is_changed]
+        deleted = sorted(set(stored) - set(df[key].tolist()))
+
+        touched = set()
+        if stats_table is not None and (not changed.empty or deleted):
+            # éditions à recalculer : celles des lignes envoyées, et celles
+            # stockées des lignes modifiées ou supprimées (lues avant
+            # l'écriture : l'édition d'une ligne modifiée peut avoir changé)
+            touched = set(changed[partition_col].dropna().tolist())
+            touched.update(_stored_partitions(
+                conn, table, df.loc[is_changed, key].tolist() + deleted, partition_col, chunksize
+            ))
+
+        if not changed.empty:
+            upsert = _upsert_statement(engine, table)
+            for batch in _iter_slices([changed], chunksize):
+                conn.execute(upsert, _dataframe_to_records(batch, list(batch.columns)))
+        for start in range(0, len(deleted), chunksize):
+            conn.execute(table.delete().where(table.c[key].in_(deleted[start:start + chunksize])))
+        if touched:
+            _refresh_team_edition_stats(conn, table, stats_table, sorted(touched))
+        # version incrémentée avec les lignes qu'elle publie : aucun lecteur
+        # ne voit les nouvelles données sous l'ancienne version
+        if not changed.empty or deleted:
+            _bump_load_version(conn)
+
+    return {
+        "inserted": int(is_new.sum()),
+        "updated": int(is_changed.sum()),
+        "deleted": len(deleted),
+        "unchanged": int(len(df) - is_new.sum() - is_changed.sum()),
+    }
+
+
+def delta_load_table(
+    partitions: Iterable[pd.DataFrame],
+    table: Table,
+    engine: Engine,
+    partition_col: str = "edition",
+    chunksize: int = 50_000,
+    stats_table: Optional[Table] = None
+) -> Dict[str, int]:
+    """
+    Synchronise ``table`` partition par partition (voir ``delta_load_partition``).
+
+    La table (et ses index) est créée si elle n'existe pas ; si elle est
+    partitionnée, les partitions manquantes sont créées au fil des éditions
+    rencontrées. Chaque élément de ``partitions``
+    doit contenir l'intégralité des lignes des éditions qu'il couvre : les
+    lignes stockées de ces éditions absentes du DataFrame sont supprimées.
+    Chaque partition est validée dans sa propre transaction, qui incrémente
+    la version des données (``get_load_version``) si au moins une de ses
+    lignes a changé : un cache ne peut pas servir d'anciens résultats pour
+    des données déjà publiées, même si le run s'interrompt. De même, seules
+    les éditions modifiées sont recalculées dans ``stats_table``.
+
+    Retour
+    ------
+    dict
+        Totaux ``inserted``, ``updated``, ``deleted`` et ``unchanged``
+    """
+    table.create(engine, checkfirst=True)
+    totals = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    for df in partitions:
+        counts = delta_load_partition(df, table, engine, partition_col=partition_col,
+                                      chunksize=chunksize, stats_table=stats_table)
+        totals = {name: totals[name] + counts[name] for name in totals}
+    return totals
+
+
+# ----------------------------
+# AGRÉGATS MATÉRIALISÉS
+# ----------------------------
+
+def build_team_edition_stats_table(metadata: MetaData, table_name: str = "team_edition_stats") -> Table:
+    """
+    Déclare la table d'agrégats par équipe et par édition (bilan de chaque
+    équipe dans chaque édition), maintenue par les fonctions de chargement.
+
+    Seuls les matchs dont les deux scores sont connus sont comptés (ni
+    NULL, ni la sentinelle -999 des scores 2010 illisibles).
+    """
+    return Table(
+        table_name, metadata,
+        Column("edition", Integer, primary_key=True, autoincrement=False),
+        Column("team", String(100), primary_key=True),
+        Column("played", Integer, nullable=False),
+        Column("won", Integer, nullable=False),
+        Column("drawn", Integer, nullable=False),
+        Column("lost", Integer, nullable=False),
+        Column("goals_for", Integer, nullable=False),
+        Column("goals_against", Integer, nullable=False),
+    )
+
+
+def _team_edition_stats_select(matches: Table, editions: Optional[List[Any]] = None):
+    """
+    Requête d'agrégation de ``matches`` au format de ``team_edition_stats`` :
+    chaque match est vu une fois du côté de chaque équipe (UNION ALL), puis
+    agrégé par édition et équipe.
+    """
+    m = matches.c
+    # scores négatifs : valeur sentinelle des scores illisibles (transformation 2010)
+    scored = and_(m.home_result >= 0, m.away_result >= 0)
+    if editions is not None:
+        scored = and_(scored, m.edition.in_(editions))
+    sides = union_all(
+        select(m.edition, m.home_team.label("team"),
+               m.home_result.label("gf"), m.away_result.label("ga"))
+        .where(scored, m.home_team.isnot(None)),
+        select(m.edition, m.away_team.label("team"),
+               m.away_result.label("gf"), m.home_result.label("ga"))
+        .where(scored, m.away_team.isnot(None)),
+    ).subquery("sides")
+    return (
+        select(
+            sides.c.edition,
+            sides.c.team,
+            func.count().label("played"),
+            func.sum(case((sides.c.gf > sides.c.ga, 1), else_=0)).label("won"),
+            func.sum(case((sides.c.gf == sides.c.ga, 1), else_=0)).label("drawn"),
+            func.sum(case((sides.c.gf < sides.c.ga, 1), else_=0)).label("lost"),
+            func.sum(sides.c.gf).label("goals_for"),
+            func.sum(sides.c.ga).label("goals_against"),
+        )
+        .group_by(sides.c.edition, sides.c.team)
+    )
+
+
+def _refresh_team_edition_stats(
+    conn,
+    matches: Table,
+    stats: Table,
+    editions: Optional[List[Any]] = None
+) -> None:
+    """
+    Recalcule les agrégats des éditions données (toutes si None) dans la
+    transaction ``conn`` : suppression puis ``INSERT ... SELECT`` côté serveur.
+    """
+    stats.create(conn, checkfirst=True)
+    if editions is None:
+        conn.execute(stats.delete())
+    elif editions:
+        conn.execute(stats.delete().where(stats.c.edition.in_(editions)))
+    else:
+        return
+    names = [col.name for col in stats.columns]
+    conn.execute(stats.insert().from_select(names, _team_edition_stats_select(matches, editions)))
+
+
+def refresh_team_edition_stats(
+    engine: Engine,
+    matches: Table,
+    stats: Table,
+    editions: Optional[List[Any]] = None
+) -> None:
+    """
+    Recalcule la table d'agrégats ``stats`` à partir de ``matches``.
+
+    Les fonctions de chargement le font d'elles-mêmes (paramètre
+    ``stats_table``), dans la transaction qui publie les matchs ; à appeler
+    après une correction ponctuelle des scores.
+
+    Paramètres
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+    matches : sqlalchemy.Table
+        Table des matchs (voir ``build_matches_table``)
+    stats : sqlalchemy.Table
+        Table d'agrégats (voir ``build_team_edition_stats_table``), créée si besoin
+    editions : list, optionnel
+        Éditions à recalculer ; toutes si None
+    """
+    with engine.begin() as conn:
+        _refresh_team_edition_stats(conn, matches, stats, editions)
+
+
+# ----------------------------
+# SCHÉMA EN ÉTOILE 2018
+# ----------------------------
+
+def build_star_2018_tables(metadata: MetaData, prefix: str = "") -> Dict[str, Table]:
+    """
+    Déclare les tables du schéma en étoile 2018 : dimensions à clé de
+    substitution entière, table de faits des matchs et liaison match-chaîne TV.
+
+    Paramètres
+    ----------
+    metadata : sqlalchemy.MetaData
+        Métadonnées auxquelles rattacher les tables
+    prefix : str
+        Préfixe des noms de tables
+
+    Retour
+    ------
+    dict
+        nom logique (clés de ``fct_transform_star_2018``) -> Table, dans
+        l'ordre des dépendances (dimensions, faits, liaison)
+    """
+    def name(table_name):
+        return f"{prefix}{table_name}_2018"
+
+    tables = {
+        "dim_team": Table(
+            name("dim_team"), metadata,
+            Column("team_key", Integer, primary_key=True),
+            Column("team_id", Integer, nullable=False, unique=True),
+            Column("name", String(100)),
+        ),
+        "dim_stadium": Table(
+            name("dim_stadium"), metadata,
+            Column("stadium_key", Integer, primary_key=True),
+            Column("stadium_id", Integer, nullable=False, unique=True),
+            Column("name", String(100)),
+            Column("city", String(100)),
+        ),
+        "dim_group": Table(
+            name("dim_group"), metadata,
+            Column("group_key", Integer, primary_key=True),
+            Column("group_id", String(20), nullable=False, unique=True),
+            Column("group_name", String(50)),
+        ),
+        "dim_round": Table(
+            name("dim_round"), metadata,
+            Column("round_key", Integer, primary_key=True),
+            Column("round_id", String(20), nullable=False, unique=True),
+            Column("round_name", String(50)),
+        ),
+        "dim_tvchannel": Table(
+            name("dim_tvchannel"), metadata,
+            Column("channel_key", Integer, primary_key=True),
+            Column("channel_id", Integer, nullable=False, unique=True),
+            Column("name", String(100)),
+            Column("country", String(100)),
+            Column("iso2", String(10)),
+        ),
+    }
+    tables["fact_match"] = Table(
+        name("fact_match"), metadata,
+        Column("match_id", Integer, primary_key=True),
+        Column("match_number", Integer),
+        Column("date", Date),
+        Column("home_team_key", Integer, ForeignKey(tables["dim_team"].c.team_key)),
+        Column("away_team_key", Integer, ForeignKey(tables["dim_team"].c.team_key)),
+        Column("stadium_key", Integer, ForeignKey(tables["dim_stadium"].c.stadium_key)),
+        Column("group_key", Integer, ForeignKey(tables["dim_group"].c.group_key)),
+        Column("round_key", Integer, ForeignKey(tables["dim_round"].c.round_key)),
+        Column("home_result", Integer),
+        Column("away_result", Integer),
+        Column("stage", String(50)),
+        Column("edition", Integer),
+    )
+    tables["bridge_match_channel"] = Table(
+        name("bridge_match_channel"), metadata,
+        Column("match_id", Integer, ForeignKey(tables["fact_match"].c.match_id), primary_key=True),
+        Column("channel_key", Integer, ForeignKey(tables["dim_tvchannel"].c.channel_key), primary_key=True),
+    )
+    return tables
+
+
+def load_star_schema(
+    frames: Dict[str, pd.DataFrame],
+    tables: Dict[str, Table],
+    engine: Engine,
+    chunksize: int = 50_000
+) -> Dict[str, int]:
+    """
+    Recharge les tables d'un schéma en étoile dans une seule transaction.
+
+    Les tables sont créées si besoin, vidées dans l'ordre inverse des
+    dépendances (liaison, faits, dimensions) puis remplies dans l'ordre des
+    dépendances, par executemany de ``chunksize`` lignes : les clés
+    étrangères sont satisfaites à chaque étape et les lecteurs ne voient
+    jamais un état intermédiaire.
+
+    Paramètres
+    ----------
+    frames : dict
+        nom logique -> DataFrame (ex : sortie de ``fct_transform_star_2018``)
+    tables : dict
+        nom logique -> Table, dans l'ordre des dépendances
+        (ex : ``build_star_2018_tables``)
+    engine : sqlalchemy.engine.Engine
+        Moteur SQLAlchemy
+
+    Retour
+    ------
+    dict
+        nom logique -> nombre de lignes chargées
+    """
+    for table in tables.values():
+        table.create(engine, checkfirst=True)
+
+    counts = {}
+    with engine.begin() as conn:
+        for table in reversed(list(tables.values())):
+            conn.execute(table.delete())
+        for name, table in tables.items():
+            df = frames[name][[col.name for col in table.columns]]
+            for batch in _iter_slices([df], chunksize):
+                conn.execute(table.insert(), _dataframe_to_records(batch, list(batch.columns)))
+            counts[name] = len(df)
+        _bump_load_version(conn)
+    return counts
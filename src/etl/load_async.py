@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Chargement asynchrone (asyncio) en base de données.
+
+Équivalents ``async`` des fonctions de ``load`` (création du moteur, SELECT,
+requêtes d'écriture, chargement en masse), construits sur l'extension
+asyncio de SQLAlchemy : asyncpg pour PostgreSQL, aiosqlite pour SQLite.
+Les fonctions synchrones de ``load`` restent inchangées.
+
+Pendant l'écriture d'un morceau en base, la préparation du morceau suivant
+(lecture du flux amont, conversion en paramètres) s'exécute dans un thread
+(``asyncio.to_thread``) : le travail CPU et les allers-retours réseau se
+recouvrent au lieu de s'enchaîner.
+"""
+
+import asyncio
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.etl.load import qualified_name, _iter_slices, _dataframe_to_records
+
+
+# Registre des moteurs asynchrones : un AsyncEngine par DSN
+_ASYNC_ENGINES: Dict[str, AsyncEngine] = {}
+
+
+def build_async_postgres_dsn(
+    host: str,
+    database: str,
+    user: str,
+    password: str,
+    port: int = 5432
+) -> str:
+    """
+    Construit le DSN SQLAlchemy (asyncpg) d'une base PostgreSQL.
+    """
+    return f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
+
+
+def get_async_engine(
+    dsn: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+    statement_timeout: Optional[int] = None
+) -> AsyncEngine:
+    """
+    Renvoie le moteur asynchrone associé à ``dsn``, créé au premier appel puis réutilisé.
+
+    Mêmes options que ``load.get_engine`` ; le registre est propre à la boucle
+    asyncio qui utilise les moteurs : les libérer avec
+    ``await dispose_all_async_engines()`` avant de fermer la boucle.
+
+    Paramètres
+    ----------
+    dsn : str
+        URL SQLAlchemy asynchrone (``postgresql+asyncpg://``, ``sqlite+aiosqlite://``)
+    pool_size, max_overflow, pool_recycle : int
+        Paramètres du pool de connexions (ignorés pour SQLite)
+    statement_timeout : int, optionnel
+        Durée maximale d'une requête en millisecondes (PostgreSQL)
+
+    Retour
+    ------
+    sqlalchemy.ext.asyncio.AsyncEngine
+        Moteur partagé pour ce DSN
+    """
+    engine = _ASYNC_ENGINES.get(dsn)
+    if engine is None:
+        options: Dict[str, Any] = {"pool_pre_ping": True}
+        if make_url(dsn).get_backend_name() != "sqlite":
+            options.update(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle
+            )
+            if statement_timeout is not None:
+                options["connect_args"] = {
+                    "server_settings": {"statement_timeout": str(int(statement_timeout))}
+                }
+        engine = create_async_engine(dsn, **options)
+        _ASYNC_ENGINES[dsn] = engine
+    return engine
+
+
+async def dispose_async_engine(dsn: str) -> bool:
+    """
+    Ferme le pool du moteur asynchrone associé à ``dsn`` et le retire du registre.
+
+    Retour
+    ------
+    bool
+        True si un moteur était enregistré pour ce DSN
+    """
+    engine = _ASYNC_ENGINES.pop(dsn, None)
+    if engine is None:
+        return False
+    await engine.dispose()
+    return True
+
+
+async def dispose_all_async_engines() -> None:
+    """
+    Ferme les pools de tous les moteurs asynchrones enregistrés.
+    """
+    engines = list(_ASYNC_ENGINES.values())
+    _ASYNC_ENGINES.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+def create_async_postgres_engine(
+    host: str,
+    database: str,
+    user: str,
+    password: str,
+    port: int = 5432,
+    **pool_options: Any
+) -> Optional[AsyncEngine]:
+    """
+    Renvoie le moteur asynchrone (asyncpg, partagé) d'une base PostgreSQL.
+
+    Retour
+    ------
+    sqlalchemy.ext.asyncio.AsyncEngine | None
+        Moteur asynchrone ou None en cas d'erreur
+    """
+    try:
+        return get_async_engine(
+            build_async_postgres_dsn(host, database, user, password, port),
+            **pool_options
+        )
+    except Exception as e:
+        print(f"Erreur de création du moteur SQLAlchemy asynchrone : {e}")
+        return None
+
+
+async def execute_select(
+    engine: AsyncEngine,
+    query: str,
+    params: dict | None = None
+) -> List[Dict[str, Any]]:
+    """
+    Exécute une requête SELECT et retourne les résultats sous forme de dictionnaires.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(text(query), params or {})
+        return [dict(row._mapping) for row in result]
+
+
+async def select_to_dataframe(
+    engine: AsyncEngine,
+    query: str,
+    params: dict | None = None
+) -> pd.DataFrame:
+    """
+    Exécute une requête SELECT et retourne un DataFrame pandas.
+    """
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: pd.read_sql(text(query), sync_conn, params=params)
+        )
+
+
+async def execute_query(
+    engine: AsyncEngine,
+    query: str,
+    params: dict | None = None
+) -> None:
+    """
+    Exécute une requête INSERT, UPDATE ou DELETE.
+    """
+    try:
+        async with engine.begin() as conn:  # commit automatique
+            await conn.execute(text(query), params or {})
+    except Exception as e:
+        print(f"Erreur SQL : {e}")
+
+
+def _prepare_next(
+    slices: Iterator[pd.DataFrame],
+    is_postgres: bool
+) -> Optional[Tuple[List[str], List[Any]]]:
+    """
+    Tire la tranche suivante du flux et la convertit en paramètres d'écriture.
+
+    Exécutée dans un thread : c'est ici qu'a lieu le travail CPU (production
+    du morceau amont, conversion NA -> None et types Python natifs).
+
+    Retour
+    ------
+    tuple | None
+        (colonnes, lignes) — tuples pour COPY, dictionnaires p0, p1, … pour
+        executemany — ou None en fin de flux
+    """
+    chunk = next(slices, None)
+    if chunk is None:
+        return None
+    columns = [str(col) for col in chunk.columns]
+    params = [f"p{i}" for i in range(len(columns))]
+    records = _dataframe_to_records(chunk, params)
+    if is_postgres:
+        records = [tuple(record[p] for p in params) for record in records]
+    return columns, records
+
+
+async def copy_chunks_to_table(
+    chunks: Iterable[pd.DataFrame],
+    table_name: str,
+    engine: AsyncEngine,
+    schema: Optional[str] = None,
+    chunksize: int = 50_000,
+    truncate: bool = False
+) -> int:
+    """
+    Charge en masse un flux de DataFrames dans une table existante (version asynchrone).
+
+    Sur PostgreSQL (asyncpg), chaque tranche est envoyée par le protocole COPY
+    (``copy_records_to_table``) ; ailleurs, par un ``executemany``. Tout le
+    chargement se fait dans une seule transaction. Pendant l'écriture d'une
+    tranche, la suivante est préparée dans un thread.
+
+    Paramètres
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Morceaux à charger (mêmes colonnes que la table cible)
+    table_name : str
+        Nom de la table cible (doit exister)
+    engine : sqlalchemy.ext.asyncio.AsyncEngine
+        Moteur asynchrone
+    schema : str, optionnel
+        Schéma de la table
+    chunksize : int
+        Nombre de lignes par COPY / executemany
+    truncate : bool
+        Vider la table dans la même transaction avant le chargement
+
+    Retour
+    ------
+    int
+        Nombre total de lignes chargées
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+    qualified = qualified_name(engine.sync_engine, table_name, schema)
+    quote = engine.dialect.identifier_preparer.quote
+    slices = _iter_slices(chunks, chunksize)
+    n_rows = 0
+
+    async with engine.begin() as conn:
+        if truncate:
+            await conn.execute(text(
+                f"TRUNCATE TABLE {qualified}" if is_postgres else f"DELETE FROM {qualified}"
+            ))
+        if is_postgres:
+            raw_connection = await conn.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+
+        pending = asyncio.create_task(asyncio.to_thread(_prepare_next, slices, is_postgres))
+        try:
+            while True:
+                prepared = await pending
+                if prepared is None:
+                    break
+                # préparation de la tranche suivante pendant l'écriture de celle-ci
+                pending = asyncio.create_task(asyncio.to_thread(_prepare_next, slices, is_postgres))
+                columns, records = prepared
+                if is_postgres:
+                    await driver_connection.copy_records_to_table(
+                        table_name, records=records, columns=columns, schema_name=schema
+                    )
+                else:
+                    insert = text(
+                        f"INSERT INTO {qualified} "
+                        f"({', '.join(quote(col) for col in columns)}) "
+                        f"VALUES ({', '.join(':p' + str(i) for i in range(len(columns)))})"
+                    )
+                    await conn.execute(insert, records)
+                n_rows += len(records)
+        finally:
+            # le thread de préparation ne peut être interrompu : on attend sa fin
+            if not pending.done():
+                await asyncio.gather(pending, return_exceptions=True)
+    return n_rows
+
+
+async def copy_dataframe_to_table(
+    df: pd.DataFrame,
+    table_name: str,
+    engine: AsyncEngine,
+    schema: Optional[str] = None,
+    chunksize: int = 50_000,
+    truncate: bool = False
+) -> int:
+    """
+    Charge en masse un DataFrame dans une table existante (version asynchrone).
+
+    Voir ``copy_chunks_to_table``.
+    """
+    return await copy_chunks_to_table([df], table_name, engine, schema=schema,
+                                      chunksize=chunksize, truncate=truncate)
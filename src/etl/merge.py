@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Fusion hors mémoire (external merge sort) des partitions transformées.
+
+Chaque partition (une édition ou un fichier source) est triée par la clé de
+fusion puis écrite sur disque sous forme de « run » Arrow IPC. Les runs sont
+relus par memory-map (sans copie, voir ``handoff``) et fusionnés par un
+k-way merge sur la clé (``date`` par défaut), tranche par tranche ; le résultat est restitué sous
+forme d'un flux de DataFrames de taille bornée, directement consommable par
+le chargement : le jeu de données complet n'est jamais matérialisé en mémoire.
+"""
+
+from pathlib import Path
+from typing import Any, Iterator, List, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.etl.handoff import fct_write_ipc, fct_open_ipc
+
+
+def fct_write_sorted_run(
+    df: pd.DataFrame,
+    run_dir: Union[str, Path],
+    name: str,
+    key: str = "date"
+) -> Path:
+    """
+    Trie une partition par la clé de fusion et l'écrit sur disque (run Arrow IPC).
+
+    Paramètres :
+        df (pd.DataFrame) : partition transformée
+        run_dir (str | Path) : répertoire des runs
+        name (str) : nom du run (ex : l'édition)
+        key (str) : colonne de tri
+
+    Retour :
+        Path : chemin du fichier IPC écrit
+    """
+    run_path = Path(run_dir) / f"run_{name}.arrow"
+    # tri stable : conserve l'ordre intra-clé produit par la transformation
+    df_sorted = df.sort_values(key, kind="stable", na_position="last")
+    return fct_write_ipc(df_sorted, run_path)
+
+
+def _iter_run_slices(run_path: Path, schema: pa.Schema, batch_size: int) -> Iterator[pa.Table]:
+    """
+    Parcourt un run par tranches d'au plus ``batch_size`` lignes.
+
+    Les record batches sont des vues sur le fichier mappé en mémoire ; seule
+    la conversion au schéma unifié (ex : colonne de type null) copie la tranche.
+    """
+    reader = fct_open_ipc(run_path)
+    for i in range(reader.num_record_batches):
+        record_batch = reader.get_batch(i).select(schema.names)
+        for offset in range(0, record_batch.num_rows, batch_size):
+            yield pa.Table.from_batches([record_batch.slice(offset, batch_size)]).cast(schema)
+
+
+def _count_before(keys: pa.ChunkedArray, bound: Any) -> int:
+    """
+    Nombre de clés (triées, manquantes en dernier) strictement inférieures
+    à ``bound`` ; une borne manquante est supérieure à toute clé présente.
+    """
+    if bound is None:
+        return len(keys) - keys.null_count
+    return pc.sum(pc.less(keys, bound)).as_py() or 0
+
+
+def _merge_runs(
+    run_paths: List[Union[str, Path]],
+    schema: pa.Schema,
+    key: str,
+    batch_size: int
+) -> Iterator[pa.Table]:
+    """
+    k-way merge par tranches : restitue des tables triées successives.
+
+    Chaque run garde en tampon une tranche triée. La borne est la plus petite
+    des dernières clés des tampons des runs non épuisés : toute ligne de clé
+    strictement inférieure, dans n'importe quel tampon, précède les lignes
+    restant à lire. Ces préfixes sont concaténés dans l'ordre des runs puis
+    triés de façon stable, ce qui reproduit l'ordre d'un merge ligne à ligne
+    (clé, puis run, puis position dans le run). Sans ligne à restituer, le
+    run qui fixe la borne lit une tranche de plus.
+    """
+    slices = [_iter_run_slices(Path(path), schema, batch_size) for path in run_paths]
+    buffers = [schema.empty_table() for _ in run_paths]
+    done = [False] * len(run_paths)
+
+    def pull(i: int) -> None:
+        part = next(slices[i], None)
+        if part is None:
+            done[i] = True
+        else:
+            buffers[i] = pa.concat_tables([buffers[i], part])
+
+    while True:
+        for i in range(len(run_paths)):
+            while buffers[i].num_rows == 0 and not done[i]:
+                pull(i)
+        open_runs = [i for i in range(len(run_paths)) if not done[i]]
+        if not open_runs:
+            tail = pa.concat_tables(buffers)
+            if tail.num_rows:
+                yield _sort_table(tail, key)
+            return
+
+        last_keys = {i: buffers[i][key][-1].as_py() for i in open_runs}
+        # valeurs manquantes en dernier, sans comparer None à une valeur
+        limiting = min(open_runs, key=lambda i: (last_keys[i] is None, last_keys[i]))
+        counts = [_count_before(buffer[key], last_keys[limiting]) for buffer in buffers]
+        if not any(counts):
+            pull(limiting)
+            continue
+        yield _sort_table(pa.concat_tables([buffer.slice(0, n) for buffer, n in zip(buffers, counts)]), key)
+        buffers = [buffer.slice(n) for buffer, n in zip(buffers, counts)]
+
+
+def _sort_table(table: pa.Table, key: str) -> pa.Table:
+    """
+    Tri stable d'une table par ``key``, valeurs manquantes en dernier
+    (placement par défaut de ``sort_indices``).
+    """
+    return table.take(pc.sort_indices(table, sort_keys=[(key, "ascending")]))
+
+
+def fct_merge_sorted_runs(
+    run_paths: List[Union[str, Path]],
+    key: str = "date",
+    chunksize: int = 10_000,
+    batch_size: int = 8_192
+) -> Iterator[pd.DataFrame]:
+    """
+    Fusionne des runs triés (k-way merge) et restitue le résultat par morceaux.
+
+    La fusion opère sur des tranches Arrow (concaténation et tri stable des
+    préfixes sûrs de chaque run), sans conversion ligne à ligne en objets
+    Python. La mémoire utilisée est bornée par ``k * batch_size + chunksize``
+    lignes (plus les lignes d'une même clé à cheval sur plusieurs tranches),
+    quel que soit le volume total des runs.
+
+    Paramètres :
+        run_paths (list) : chemins des runs écrits par ``fct_write_sorted_run``
+        key (str) : colonne de fusion (les runs doivent être triés sur cette clé)
+        chunksize (int) : nombre de lignes par DataFrame restitué
+        batch_size (int) : nombre de lignes lues à la fois dans chaque run
+
+    Retour :
+        Iterator[pd.DataFrame] : morceaux successifs du jeu fusionné, triés par ``key``
+    """
+    if not run_paths:
+        return
+
+    schemas = [fct_open_ipc(path).schema for path in run_paths]
+    columns = schemas[0].names
+    for path, schema in zip(run_paths, schemas):
+        if sorted(schema.names) != sorted(columns):
+            raise ValueError(f"Colonnes incompatibles entre les runs : {path}")
+    # ex : colonne entièrement vide (type null) dans un run, texte dans un autre
+    schema = pa.unify_schemas(
+        [pa.schema([s.field(c) for c in columns]) for s in schemas],
+        promote_options="permissive"
+    )
+
+    pending, n_pending = [], 0
+    for table in _merge_runs(run_paths, schema, key, batch_size):
+        pending.append(table)
+        n_pending += table.num_rows
+        if n_pending < chunksize:
+            continue
+        merged = pa.concat_tables(pending)
+        n_full = n_pending - n_pending % chunksize
+        for offset in range(0, n_full, chunksize):
+            yield _table_to_dataframe(merged.slice(offset, chunksize))
+        pending, n_pending = [merged.slice(n_full)], n_pending - n_full
+    if n_pending:
+        yield _table_to_dataframe(pa.concat_tables(pending))
+
+
+def _table_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """
+    Convertit un morceau fusionné en DataFrame typé (entiers nullables Int64).
+    """
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
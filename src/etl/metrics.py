@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Métriques Prometheus du pipeline.
+
+Les métriques sont tenues dans un registre dédié (``CollectorRegistry``)
+plutôt que dans le registre global de ``prometheus_client`` : un run ne
+publie que ses propres séries, sans les métriques du processus Python, et
+plusieurs runs dans un même processus (tests) ne se mélangent pas.
+
+- ``etl_rows_total{stage, edition}`` : lignes produites par étape et par édition ;
+- ``etl_stage_duration_seconds{stage}`` : durée des étapes (histogramme) ;
+- ``etl_stage_rows_per_second{stage, edition}`` : débit du dernier run ;
+- ``etl_load_batch_duration_seconds{sink}`` : latence d'écriture d'un morceau ;
+- ``etl_failures_total{stage}`` : étapes en échec ;
+- ``etl_last_run_timestamp_seconds``, ``etl_last_success_timestamp_seconds``,
+  ``etl_run_duration_seconds`` : fraîcheur et durée du run.
+
+Les valeurs des étapes sont reportées à la clôture de chacune
+(``fct_record_stage_metrics``, branché sur le rapport d'exécution de
+``instrumentation``), celles du run en fin de run (``fct_record_run_metrics``)
+et, pour les morceaux chargés, par ``fct_observe_batches``. Elles sont exposées par un
+serveur HTTP pendant le run ou écrites en fin de run dans un fichier ``.prom``
+lu par le textfile collector de node_exporter.
+
+``prometheus_client`` n'est importé qu'à la création des métriques : un run
+sans métriques (``metrics.enabled: false``) ne le charge pas.
+"""
+
+import time
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from prometheus_client import CollectorRegistry
+
+
+# bornes des histogrammes (secondes) : une étape va de quelques ms à
+# plusieurs minutes, un morceau chargé de la ms à quelques dizaines de s
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+BATCH_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# libellé d'une étape sans édition (fusion, chargement)
+ALL_EDITIONS = "all"
+
+
+def fct_build_metrics(registry: Optional["CollectorRegistry"] = None) -> Dict[str, Any]:
+    """
+    Crée les métriques du pipeline dans un registre dédié.
+
+    Paramètres :
+        registry (CollectorRegistry, optionnel) : registre à utiliser (par défaut un nouveau)
+
+    Retour :
+        dict : métriques par nom court, et le registre sous la clé ``registry``
+    """
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+    registry = registry or CollectorRegistry()
+    return {
+        "registry": registry,
+        "rows": Counter(
+            "etl_rows", "Lignes produites par étape et par édition",
+            ["stage", "edition"], registry=registry
+        ),
+        "stage_duration": Histogram(
+            "etl_stage_duration_seconds", "Durée des étapes du pipeline",
+            ["stage"], buckets=STAGE_BUCKETS, registry=registry
+        ),
+        "rows_per_second": Gauge(
+            "etl_stage_rows_per_second", "Débit de la dernière exécution de l'étape",
+            ["stage", "edition"], registry=registry
+        ),
+        "batch_duration": Histogram(
+            "etl_load_batch_duration_seconds", "Latence d'écriture d'un morceau chargé",
+            ["sink"], buckets=BATCH_BUCKETS, registry=registry
+        ),
+        "failures": Counter(
+            "etl_failures", "Étapes du pipeline en échec",
+            ["stage"], registry=registry
+        ),
+        "last_run": Gauge(
+            "etl_last_run_timestamp_seconds", "Fin du dernier run (timestamp Unix)",
+            registry=registry
+        ),
+        "last_success": Gauge(
+            "etl_last_success_timestamp_seconds", "Fin du dernier run réussi (timestamp Unix)",
+            registry=registry
+        ),
+        "run_duration": Gauge(
+            "etl_run_duration_seconds", "Durée du dernier run",
+            registry=registry
+        ),
+    }
+
+
+def fct_record_stage_metrics(metrics: Dict[str, Any], stage: Dict[str, Any]) -> None:
+    """
+    Reporte dans les métriques une étape close, dès sa clôture : un scrape
+    pendant le run voit les étapes déjà terminées.
+
+    Paramètres :
+        metrics (dict) : métriques (``fct_build_metrics``)
+        stage (dict) : enregistrement de l'étape (``instrumentation``)
+    """
+    edition = stage["edition"] or ALL_EDITIONS
+    metrics["stage_duration"].labels(stage["stage"]).observe(stage["wall_s"])
+    if stage["status"] != "ok":
+        metrics["failures"].labels(stage["stage"]).inc()
+        return
+    if stage["rows_out"]:
+        metrics["rows"].labels(stage["stage"], edition).inc(stage["rows_out"])
+    if stage.get("rows_per_s"):
+        metrics["rows_per_second"].labels(stage["stage"], edition).set(stage["rows_per_s"])
+
+
+def fct_record_run_metrics(metrics: Dict[str, Any], report: Dict[str, Any]) -> None:
+    """
+    Reporte dans les métriques la fin d'un run (fraîcheur, durée, échec hors
+    étape) à partir du rapport clos (``instrumentation.fct_finish_run_report``) ;
+    les étapes sont reportées à leur clôture par ``fct_record_stage_metrics``.
+
+    Paramètres :
+        metrics (dict) : métriques (``fct_build_metrics``)
+        report (dict) : rapport d'exécution
+    """
+    failed = report.get("status", "ok") != "ok"
+
+    # échec hors étape mesurée (ex : processus de travail interrompu)
+    if failed and all(stage["status"] == "ok" for stage in report["stages"]):
+        metrics["failures"].labels("run").inc()
+
+    now = time.time()
+    metrics["last_run"].set(now)
+    metrics["run_duration"].set(report.get("wall_s", 0))
+    if not failed:
+        metrics["last_success"].set(now)
+
+
+def fct_observe_batches(
+    metrics: Optional[Dict[str, Any]],
+    chunks: Iterable[Any],
+    sink: str
+) -> Iterator[Any]:
+    """
+    Mesure la latence d'écriture de chaque morceau d'un flux.
+
+    Le temps compté est celui passé par le consommateur (le chargement)
+    entre la remise d'un morceau et la demande du suivant, hors production
+    des morceaux (fusion). La mesure du dernier morceau s'arrête quand le
+    consommateur constate la fin du flux, avant la fin du chargement
+    (index, échange de tables, commit) : ce travail n'est compté que dans la
+    durée de l'étape ``load`` (``etl_stage_duration_seconds``).
+
+    Paramètres :
+        metrics (dict | None) : métriques ; None : flux renvoyé tel quel
+        chunks (Iterable) : flux de morceaux
+        sink (str) : destination du chargement (postgres, sqlite, parquet)
+
+    Retour :
+        Iterator : mêmes morceaux, dans le même ordre
+    """
+    if metrics is None:
+        return iter(chunks)
+    return _observed(metrics["batch_duration"].labels(sink), iter(chunks))
+
+
+def _observed(histogram, iterator: Iterator[Any]) -> Iterator[Any]:
+    for chunk in iterator:
+        start = time.perf_counter()
+        yield chunk
+        histogram.observe(time.perf_counter() - start)
+
+
+def fct_start_metrics_server(metrics: Dict[str, Any], port: int, addr: str = "0.0.0.0"):
+    """
+    Expose les métriques sur ``http://<addr>:<port>/metrics`` (thread démon,
+    arrêté avec le processus).
+
+    Retour :
+        tuple : serveur WSGI et thread (``prometheus_client.start_http_server``)
+    """
+    from prometheus_client import start_http_server
+
+    return start_http_server(port, addr=addr, registry=metrics["registry"])
+
+
+def fct_write_metrics_textfile(metrics: Dict[str, Any], path: str) -> None:
+    """
+    Écrit les métriques au format texte Prometheus dans ``path`` (fichier
+    ``.prom`` du répertoire du textfile collector). L'écriture passe par un
+    fichier temporaire renommé : le collecteur ne lit jamais un fichier partiel.
+    """
+    from prometheus_client import write_to_textfile
+
+    write_to_textfile(path, metrics["registry"])
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+Profilage à la demande des étapes du pipeline et des fonctions de ``utils``.
+
+Activé par la section ``profiling`` de ``config.yaml`` ; trois modes :
+
+- ``cprofile`` : profil déterministe (``cProfile``), un fichier ``.prof``
+  lisible par ``pstats`` / snakeviz et un résumé texte des N fonctions les
+  plus coûteuses (temps cumulé) ;
+- ``tracemalloc`` : instantanés d'allocations avant / après, résumé des N
+  sites d'allocation (fichier:ligne) retenant le plus de mémoire à la fin de
+  la cible, et pic de mémoire tracée pendant la cible ;
+- ``sampling`` : échantillonnage de la pile toutes les ``sampling_interval``
+  secondes par un thread minuteur (faible surcoût, pas d'instrumentation des
+  appels) ; piles repliées (``.folded``, format flamegraph) et résumé des N
+  fonctions les plus échantillonnées.
+
+Une cible est une étape (``extract_2014``, ``transform_2018``, ``load``…)
+encadrée par ``fct_profile_stage`` ou une fonction de ``utils`` enveloppée par
+``fct_install_helper_profiling`` ; les appels successifs d'une même cible
+sont cumulés. Les fichiers sont écrits dans ``output_dir/<run_id>/``.
+
+Profilage désactivé (``fct_profiling_settings`` renvoie None) : aucune
+fonction n'est enveloppée et ``fct_profile_stage`` renvoie un contexte vide.
+"""
+
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Callable, Iterator
+
+
+PROFILING_MODES = ("cprofile", "tracemalloc", "sampling")
+
+# profileurs par cible (nom d'étape ou helper_<fonction>), cumulés sur le run
+_PROFILERS: Dict[str, "_TargetProfiler"] = {}
+# un seul cProfile peut être actif à la fois : une cible imbriquée dans une
+# cible déjà profilée est comptée (appels, durée) sans nouveau profil
+_ACTIVE_CPROFILE: List[str] = []
+# cibles tracemalloc en cours, et tracemalloc démarré par ce module (arrêté
+# à la fin de la cible la plus externe) ou déjà actif avant
+_TRACEMALLOC_DEPTH = [0]
+_TRACEMALLOC_OWNED = [False]
+
+
+def fct_profiling_settings(config: dict) -> Optional[Dict[str, Any]]:
+    """
+    Réglages de profilage de la section ``profiling`` de la configuration.
+
+    Paramètres :
+        config (dict) : configuration (config.yaml)
+
+    Retour :
+        dict | None : réglages, ou None si le profilage est désactivé
+    """
+    profiling_config = config.get("profiling") or {}
+    if not profiling_config.get("enabled", False):
+        return None
+    mode = profiling_config.get("mode", "cprofile")
+    if mode not in PROFILING_MODES:
+        raise ValueError(f"Mode de profilage inconnu : {mode} (attendu : {', '.join(PROFILING_MODES)})")
+    run_id = f"{datetime.datetime.now():%Y%m%dT%H%M%S}_{os.getpid()}"
+    return {
+        "mode": mode,
+        "stages": list(profiling_config.get("stages") or []),
+        "helpers": list(profiling_config.get("helpers") or []),
+        "output_dir": str(Path(profiling_config.get("output_dir", "profiles")) / run_id),
+        "top_n": profiling_config.get("top_n", 25),
+        "sampling_interval": profiling_config.get("sampling_interval", 0.005),
+        "tracemalloc_frames": profiling_config.get("tracemalloc_frames", 1),
+        "pid": os.getpid(),
+    }
+
+
+def _selected(settings: Dict[str, Any], stage: str) -> bool:
+    """
+    Étape retenue : liste vide (toutes), nom exact ou préfixe avant ``_``
+    (``transform`` retient ``transform_2010``…).
+    """
+    stages = settings["stages"]
+    return not stages or stage in stages or stage.split("_")[0] in stages
+
+
+def fct_profile_stage(settings: Optional[Dict[str, Any]], stage: str):
+    """
+    Contexte de profilage d'une étape.
+
+    Paramètres :
+        settings (dict | None) : réglages (``fct_profiling_settings``)
+        stage (str) : nom de l'étape (``extract_2014``, ``load``…)
+
+    Retour :
+        contextmanager : contexte vide si le profilage est désactivé ou si
+        l'étape n'est pas retenue
+    """
+    if settings is None or not _selected(settings, stage):
+        return nullcontext()
+    return _profiling(settings, stage)
+
+
+@contextmanager
+def _profiling(settings: Dict[str, Any], target: str) -> Iterator[None]:
+    profiler = _PROFILERS.get(target)
+    if profiler is None:
+        profiler = _PROFILERS[target] = _TargetProfiler(settings, target)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+
+
+def fct_install_helper_profiling(
+    settings: Optional[Dict[str, Any]],
+    module_prefixes: tuple = ("src.etl.", "etl.")
+) -> List[str]:
+    """
+    Enveloppe les fonctions de ``utils`` listées dans ``settings["helpers"]``.
+
+    Les modules importent les fonctions par nom (``from src.etl.utils import
+    ...``) : la fonction est remplacée dans ``utils`` et dans chaque module
+    chargé (``module_prefixes``, ``main``) qui la référence. Sans effet si
+    les fonctions sont déjà enveloppées.
+
+    Paramètres :
+        settings (dict | None) : réglages ; None : rien n'est enveloppé
+        module_prefixes (tuple) : préfixes des modules où remplacer les références
+
+    Retour :
+        list : noms des fonctions enveloppées
+    """
+    if settings is None or not settings["helpers"]:
+        return []
+    modules = [
+        module for name, module in list(sys.modules.items())
+        if module is not None and (name in ("__main__", "main") or name.startswith(module_prefixes))
+    ]
+    utils_modules = [module for module in modules if module.__name__.endswith("etl.utils")]
+    installed = []
+    for name in settings["helpers"]:
+        originals = {
+            getattr(module, name) for module in utils_modules
+            if callable(getattr(module, name, None))
+        }
+        if not originals:
+            print(f"Fonction inconnue dans utils, non profilée : {name}")
+            continue
+        for original in originals:
+            if getattr(original, "__profiled__", False):
+                continue
+            wrapper = _profiled_helper(settings, name, original)
+            for module in modules:
+                for attr, value in list(vars(module).items()):
+                    if value is original:
+                        setattr(module, attr, wrapper)
+        installed.append(name)
+    return installed
+
+
+def fct_uninstall_helper_profiling(module_prefixes: tuple = ("src.etl.", "etl.")) -> None:
+    """
+    Remet en place les fonctions enveloppées par ``fct_install_helper_profiling``.
+    """
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name in ("__main__", "main") or name.startswith(module_prefixes)):
+            continue
+        for attr, value in list(vars(module).items()):
+            if getattr(value, "__profiled__", False):
+                setattr(module, attr, value.__wrapped__)
+
+
+def _profiled_helper(settings: Dict[str, Any], name: str, func: Callable) -> Callable:
+    target = f"helper_{name}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _profiling(settings, target):
+            return func(*args, **kwargs)
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def fct_write_profiles(settings: Optional[Dict[str, Any]]) -> List[Path]:
+    """
+    Écrit les profils cumulés de toutes les cibles puis les oublie.
+
+    Dans un processus de travail, le PID est ajouté aux noms de fichiers
+    (les cibles ``helper_*`` existent dans plusieurs processus).
+
+    Retour :
+        list : fichiers écrits
+    """
+    if settings is None:
+        return []
+    suffix = "" if os.getpid() == settings["pid"] else f"_{os.getpid()}"
+    paths = []
+    for target, profiler in list(_PROFILERS.items()):
+        paths.extend(profiler.write(target + suffix))
+        del _PROFILERS[target]
+    return paths
+
+
+class _TargetProfiler:
+    """
+    Profil cumulé d'une cible, selon le mode des réglages.
+    """
+
+    def __init__(self, settings: Dict[str, Any], target: str):
+        self.settings = settings
+        self.target = target
+        self.calls = 0
+        self.wall_s = 0.0
+        self.depth = 0
+        self.profile = cProfile.Profile() if settings["mode"] == "cprofile" else None
+        self.profiling = False
+        self.allocations: Counter = Counter()
+        self.allocation_counts: Counter = Counter()
+        self.peak_bytes = 0
+        self.samples: Counter = Counter()
+
+    def start(self) -> None:
+        self.calls += 1
+        self.depth += 1
+        if self.depth > 1:  # appel récursif : déjà profilé
+            return
+        self.started = time.perf_counter()
+        mode = self.settings["mode"]
+        if mode == "cprofile" and not _ACTIVE_CPROFILE:
+            _ACTIVE_CPROFILE.append(self.target)
+            self.profiling = True
+            self.profile.enable()
+        elif mode == "tracemalloc":
+            if _TRACEMALLOC_DEPTH[0] == 0:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(self.settings["tracemalloc_frames"])
+                    _TRACEMALLOC_OWNED[0] = True
+                # pic relatif à la cible la plus externe
+                tracemalloc.reset_peak()
+            _TRACEMALLOC_DEPTH[0] += 1
+            self.before = tracemalloc.take_snapshot()
+            self.traced_before = tracemalloc.get_traced_memory()[0]
+        elif mode == "sampling":
+            _SAMPLER.add(self, threading.get_ident(), self.settings["sampling_interval"])
+
+    def stop(self) -> None:
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        mode = self.settings["mode"]
+        if mode == "cprofile" and self.profiling:
+            self.profile.disable()
+            _ACTIVE_CPROFILE.remove(self.target)
+            self.profiling = False
+        elif mode == "tracemalloc":
+            after = tracemalloc.take_snapshot()
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1] - self.traced_before)
+            for stat in after.compare_to(self.before, "lineno"):
+                if stat.size_diff > 0:
+                    self.allocations[stat.traceback[0]] += stat.size_diff
+                    self.allocation_counts[stat.traceback[0]] += stat.count_diff
+            self.before = None
+            _TRACEMALLOC_DEPTH[0] -= 1
+            if _TRACEMALLOC_DEPTH[0] == 0 and _TRACEMALLOC_OWNED[0]:
+                tracemalloc.stop()
+                _TRACEMALLOC_OWNED[0] = False
+        elif mode == "sampling":
+            _SAMPLER.remove(self)
+        self.wall_s += time.perf_counter() - self.started
+
+    def write(self, name: str) -> List[Path]:
+        output_dir = Path(self.settings["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        top_n = self.settings["top_n"]
+        header = f"{self.target} : {self.calls} appel(s), {self.wall_s:.3f} s\n"
+        mode = self.settings["mode"]
+        paths = []
+
+        if mode == "cprofile":
+            if not self.profile.getstats():  # cible imbriquée dans une cible profilée
+                summary = header + "(comprise dans le profil de la cible englobante)\n"
+            else:
+                paths.append(output_dir / f"{name}.prof")
+                self.profile.dump_stats(paths[-1])
+                stream = io.StringIO()
+                pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(top_n)
+                summary = header + stream.getvalue()
+        elif mode == "tracemalloc":
+            lines = [
+                f"{size / 1024:>12.1f} Kio {self.allocation_counts[frame]:>9} blocs  {frame.filename}:{frame.lineno}"
+                for frame, size in self.allocations.most_common(top_n)
+            ]
+            summary = header + f"pic : {self.peak_bytes / 1024 / 1024:.1f} Mio\n" + "\n".join(lines) + "\n"
+        else:
+            paths.append(output_dir / f"{name}.folded")
+            paths[-1].write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common()),
+                encoding="utf-8"
+            )
+            # fonction en haut de pile (self) et fonctions présentes dans la pile (cumulé)
+            own, total = Counter(), Counter()
+            for stack, count in self.samples.items():
+                frames = stack.split(";")
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    total[frame] += count
+            n_samples = sum(self.samples.values()) or 1
+            lines = [
+                f"{count:>8} {100 * count / n_samples:>6.1f} % {100 * total[frame] / n_samples:>6.1f} %  {frame}"
+                for frame, count in own.most_common(top_n)
+            ]
+            summary = (
+                header + f"{sum(self.samples.values())} échantillons\n"
+                + f"{'échant.':>8} {'self':>8} {'cumulé':>8}\n" + "\n".join(lines) + "\n"
+            )
+
+        paths.append(output_dir / f"{name}.txt")
+        paths[-1].write_text(summary, encoding="utf-8")
+        return paths
+
+
+class _Sampler:
+    """
+    Thread minuteur unique : à chaque intervalle, relève la pile des threads
+    des cibles actives et l'ajoute à leurs échantillons (piles repliées).
+    Il s'endort dès qu'aucune cible n'est active.
+    """
+
+    def __init__(self):
+        self.active: Dict[_TargetProfiler, int] = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.interval = 0.005
+        self.thread = None
+
+    def add(self, profiler: _TargetProfiler, thread_id: int, interval: float) -> None:
+        with self.lock:
+            self.active[profiler] = thread_id
+            self.interval = interval
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="etl-profiling-sampler", daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+
+    def remove(self, profiler: _TargetProfiler) -> None:
+        with self.lock:
+            self.active.pop(profiler, None)
+
+    def _run(self) -> None:
+        while True:
+            self.wakeup.wait()
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.active:
+                    self.wakeup.clear()
+                    continue
+                frames = sys._current_frames()
+                for profiler, thread_id in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profiler.samples[_fold(frame)] += 1
+
+
+def _fold(frame) -> str:
+    """
+    Pile repliée (de la racine vers la fonction courante) : ``module:fonction;...``.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_SAMPLER = _Sampler()
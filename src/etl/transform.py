@@ -14,14 +14,32 @@ from src.etl.utils import (
     fct_upper_string_columns,
     fct_capitalize_string_columns,
     fct_fillna_and_convert_types,
-    clean_string_column
+    clean_string_column,
+    fct_assign_match_id,
+    fct_regex_extract,
+    fct_copy_on_write,
+    fct_surrogate_keys,
+    fct_lookup_keys
     )
-from pyparsing import col
 
 
 
 ##########   2010   ##################################################################
 
+# Motifs RE2 (pyarrow) appliqués en une passe par fct_regex_extract
+# Score 2010 : "4-1", "2-1 (1-0)", "1-1 (1-1) a.e.t. 4-3 PSO", "2-1 a.p.", ...
+# -> buts domicile/extérieur : seul le score en tête est lu. Les marqueurs
+# de prolongation (a.e.t., a.p.) et les tirs au but (PSO, t.a.b.) ne sont
+# volontairement pas capturés : la table matches n'a pas de colonne pour
+# eux et aucune étape ne les lit (les ajouter toucherait le schéma, chaque
+# transformation, les requêtes ELT et les empreintes row_hash).
+SCORE_PATTERN_2010 = r"^\s*(?P<home_result>\d+)\s*-\s*(?P<away_result>\d+)"
+
+# Équipe 2010 : "France (Frankreich)" -> "France"
+TEAM_PATTERN_2010 = r"^\s*(?P<team>[^(]*[^(\s])"
+
+
+@fct_copy_on_write
 def fct_transform_2010(df : pd.DataFrame , config : Dict) -> pd.DataFrame:
     """
     Goal:
@@ -36,31 +54,18 @@ def fct_transform_2010(df : pd.DataFrame , config : Dict) -> pd.DataFrame:
     # supprimer les doublons
     df = df.drop_duplicates()
     
-    #creer colonnes 'home_result' et 'away_result'
-    df['score'] = df['score'].str.slice(0, 3)
-    df[['home_result','away_result']] = df['score'].str.split('-', expand=True)
-
-    #convertir les colonnes 'home_result' et 'away_result' en type Int64
-    df['home_result'] = (
-        df['home_result']
-        .astype("string")
-        .str.extract(r"(\d+)", expand=False)
-        .astype("Int64").fillna(-999)
-    )
-    df['away_result'] = (
-        df['away_result']
-        .astype("string")
-        .str.extract(r"(\d+)", expand=False)
-        .astype("Int64").fillna(-999)
-    )
+    #creer colonnes 'home_result' et 'away_result' en une seule extraction vectorisée
+    df_score = fct_regex_extract(df['score'], SCORE_PATTERN_2010)
+    for column in ['home_result', 'away_result']:
+        df[column] = df_score[column].astype("Int64").fillna(-999)
 
     #rename columns pour etre homogène avec les autres datasets
     dict_columns_2010 = config['dict_columns_2010']
     df = df.rename(columns=dict_columns_2010)
 
     #home_team et away_team, garder que le nom de pays en Anglais
-    df[['home_team','home_team_lanorig']] = df['home_team'].str.split('(', expand=True)
-    df[['away_team','away_team_lanorig']] = df['away_team'].str.split('(', expand=True)
+    df['home_team'] = fct_regex_extract(df['home_team'], TEAM_PATTERN_2010)['team']
+    df['away_team'] = fct_regex_extract(df['away_team'], TEAM_PATTERN_2010)['team']
 
     # Convertir la colonne 'date' en format YYYY en string 
     df["date"] = df["date"].astype("string")
@@ -79,10 +84,8 @@ def fct_transform_2010(df : pd.DataFrame , config : Dict) -> pd.DataFrame:
     columns_to_keep = config['columns_to_keep_2010']
     df = df[columns_to_keep]
     
-     # Trier par date (ascendant : plus ancien en premier)
-    df.sort_values("date", inplace=True)
-    # Réinitialiser l'index incrémental pour match_id
-    df["match_id"] = range(1, len(df) + 1)
+    # Trier par date et attribuer un match_id stable, dérivé de (édition, rang)
+    df = fct_assign_match_id(df)
     
     #Réorganiser les colonnes du dataframe
     df = df[
@@ -100,6 +103,7 @@ def fct_transform_2010(df : pd.DataFrame , config : Dict) -> pd.DataFrame:
     return df
 
 ##########   2014   ##################################################################
+@fct_copy_on_write
 def trf_file_wcup_2014(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
     """
     Transforme et normalise les données des matchs de la Coupe du Monde 2014.
@@ -161,9 +165,6 @@ def trf_file_wcup_2014(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame
     # Création d’une colonne date normalisée
     df_2014_news["date"] = df_2014_news["datetime"].apply(normalize_datetime)
 
-    # Récupérer le valeurs distinctes de la colonne stage
-    df_2014_news["stage"].unique()
-
     # normalisation des noms de la colonne stage
     # à partir d'un dictionnaire ``stage_mapping`` dans la config
     df_2014_news["stage"] = df_2014_news["stage"].map(config['trf_file_wcup_2014']['stage_mapping']).fillna(df_2014_news["stage"])
@@ -179,12 +180,9 @@ def trf_file_wcup_2014(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame
 
     # normalisation des noms de la colonne away_team
     df_2014_news["away_team"] = df_2014_news["away_team"].map(config['trf_file_wcup_2014']['correction_team_mapping']).fillna(df_2014_news["away_team"])
-    df_2014_news["away_team"].unique()
 
-    # Trier par date (ascendant : plus ancien en premier)
-    df_2014_news.sort_values("date", inplace=True)
-    # Réinitialiser l'index incrémental pour match_id
-    df_2014_news["match_id"] = range(1, len(df_2014_news) + 1)
+    # Trier par date et attribuer un match_id stable, dérivé de (édition, rang)
+    df_2014_news = fct_assign_match_id(df_2014_news)
 
     # Réorganisation des colonnes du DataFrame
     df_2014_news = df_2014_news[["match_id", "date", "home_team", "away_team", "home_result", "away_result", "stage", "edition", "city"]]
@@ -193,30 +191,35 @@ def trf_file_wcup_2014(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame
 
 ##########   2018   ##################################################################
 
-def fct_transform_data_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -> pd.DataFrame:
+@fct_copy_on_write
+def fct_transform_entities_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -> Dict[str, pd.DataFrame]:
     """
-    Transformer le DataFrame final des matches 2018 en gardant uniquement les colonnes spécifiées dans la configuration.
-    
+    Nettoyer séparément les entités du JSON 2018 (stades, équipes, groupes, tours, matchs).
+
     Paramètres :
-        dfs_2018 (List) : Liste des DataFrames transformés pour l'année 2018.
+        dfs_2018 (Dict) : DataFrames extraits du JSON 2018 (voir fct_read_json_nested).
         config (Dict) : Dictionnaire de configuration contenant les paramètres nécessaires.
-    
+
     Retour :
-        pd.DataFrame : DataFrame final transformé pour l'année 2018.
+        Dict[str, pd.DataFrame] : entités nettoyées, non préfixées :
+            'stadiums', 'teams', 'groups', 'rounds', 'matches'
     """
-    
-    df_stadiums = dfs_2018['stadiums'].copy()
-    df_teams = dfs_2018['teams'].copy()
-    df_groups = dfs_2018['groups'].copy()
-    df_rounds = dfs_2018['rounds'].copy()
-    df_matches = dfs_2018['matches'].copy()
+
+    # Copies superficielles : la fonction possède ses propres objets DataFrame
+    # (les fonctions utilitaires modifient leurs colonnes) sans dupliquer les
+    # données ; le copy-on-write ne copie une colonne qu'à sa première écriture.
+    df_stadiums = dfs_2018['stadiums'].copy(deep=False)
+    df_teams = dfs_2018['teams'].copy(deep=False)
+    df_groups = dfs_2018['groups'].copy(deep=False)
+    df_rounds = dfs_2018['rounds'].copy(deep=False)
+    df_matches = dfs_2018['matches'].copy(deep=False)
     #-------------------------------------------------------------------------
     #------------------------stadiums transformations #------------------------
     #-------------------------------------------------------------------------
 
     # Filtrer les colonnes nécessaires
     columns_to_keep = ['id', 'name', 'city']
-    df_stadiums_transformed = df_stadiums[columns_to_keep].copy()
+    df_stadiums_transformed = df_stadiums[columns_to_keep]
     
     #traitement des valeurs nulles
     df_stadiums_transformed= fct_fillna_and_convert_types(df_stadiums_transformed)
@@ -236,7 +239,7 @@ def fct_transform_data_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -
     #-------------------------------------------------------------------------
     # Filtrer les colonnes nécessaires
     columns_to_keep = ['id', 'name']
-    df_teams_transformed = df_teams[columns_to_keep].copy()
+    df_teams_transformed = df_teams[columns_to_keep]
     
     #traitement des valeurs nulles
     df_teams_transformed = fct_fillna_and_convert_types(df_teams_transformed)
@@ -295,12 +298,39 @@ def fct_transform_data_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -
     # Eclater les listes dans la colonne 'channels' en plusieurs lignes
     # df_matches_transformed = df_matches_transformed.explode('channels').reset_index(drop=True)
 
-    #Génerer une colonne unique 'stage' en combinant les colonnes 'round_id' et 'group_id'.
-    df_matches_transformed = fct_generate_unique_stage(df_matches_transformed, 'stage', 'round_id', 'group_id')
-    
     # Harmoniser la colonne stage_name en fonction des valeurs de stage
     stage_mapping = config['stage_mapping_2018']
     df_matches_transformed = fct_harmonize_column_values(df_matches_transformed, 'stage_name', stage_mapping)
+
+    return {
+        'stadiums': df_stadiums_transformed,
+        'teams': df_teams_transformed,
+        'groups': df_groups_transformed,
+        'rounds': df_rounds_transformed,
+        'matches': df_matches_transformed,
+    }
+
+
+@fct_copy_on_write
+def fct_transform_data_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -> pd.DataFrame:
+    """
+    Transformer le DataFrame final des matches 2018 en gardant uniquement les colonnes spécifiées dans la configuration.
+    
+    Paramètres :
+        dfs_2018 (List) : Liste des DataFrames transformés pour l'année 2018.
+        config (Dict) : Dictionnaire de configuration contenant les paramètres nécessaires.
+    
+    Retour :
+        pd.DataFrame : DataFrame final transformé pour l'année 2018.
+    """
+    
+    entities = fct_transform_entities_2018(dfs_2018, config)
+    df_stadiums_transformed = entities['stadiums']
+    df_teams_transformed = entities['teams']
+    df_groups_transformed = entities['groups']
+    df_rounds_transformed = entities['rounds']
+    df_matches_transformed = entities['matches']
+
     #-------------------------------------------------------------------------
     #-----------------------Merger en dataframe finale------------------------
     #-------------------------------------------------------------------------
@@ -330,13 +360,105 @@ def fct_transform_data_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -
     #-------------------------------------------------------------------------
     list_columns_original = config['list_columns_original_2018']
     list_columns_final = config['list_wanted_columns']
-    df_2018_final = fct_final_columns_to_keep(df_2018_final, list_columns_original, list_columns_final).sort_values(by='match_id').reset_index(drop=True)
+    df_2018_final = fct_final_columns_to_keep(df_2018_final, list_columns_original, list_columns_final)
+
+    # match_id stable : rang du numéro officiel du match dans l'édition
+    df_2018_final = fct_assign_match_id(df_2018_final, order_by=['match_id']).reset_index(drop=True)
     
     return df_2018_final
         
 
+# Colonnes retenues pour la dimension des chaînes TV 2018
+TVCHANNEL_COLUMNS_2018 = ['id', 'name', 'country', 'iso2']
+
+
+@fct_copy_on_write
+def fct_transform_star_2018(dfs_2018 : Dict[str, pd.DataFrame] , config: Dict) -> Dict[str, pd.DataFrame]:
+    """
+    Transformer les données 2018 en schéma en étoile : dimensions, table de faits
+    des matchs et table de liaison match-chaîne TV.
+
+    Chaque dimension reçoit une clé de substitution entière ; les clés
+    naturelles des matchs sont remplacées par ces clés via des dictionnaires
+    de correspondance en mémoire, sans jointure. La table de faits ne porte
+    donc que des entiers à la place des noms d'équipes, de stades, etc.
+    Le match_id est le même que celui de la table ``matches``.
+
+    Paramètres :
+        dfs_2018 (Dict) : DataFrames extraits du JSON 2018 (voir fct_read_json_nested).
+        config (Dict) : Dictionnaire de configuration contenant les paramètres nécessaires.
+
+    Retour :
+        Dict[str, pd.DataFrame] : 'dim_team', 'dim_stadium', 'dim_group',
+            'dim_round', 'dim_tvchannel', 'fact_match', 'bridge_match_channel'
+    """
+    entities = fct_transform_entities_2018(dfs_2018, config)
+
+    #------------------------dimensions et caches de correspondance-----------
+    dim_team, team_keys = fct_surrogate_keys(
+        entities['teams'].rename(columns={'id': 'team_id'}), 'team_id', 'team_key')
+    dim_stadium, stadium_keys = fct_surrogate_keys(
+        entities['stadiums'].rename(columns={'id': 'stadium_id'}), 'stadium_id', 'stadium_key')
+    dim_group, group_keys = fct_surrogate_keys(
+        entities['groups'][['group_id', 'group_name']], 'group_id', 'group_key')
+    dim_round, round_keys = fct_surrogate_keys(
+        entities['rounds'][['round_id', 'round_name']], 'round_id', 'round_key')
+
+    df_tvchannels = dfs_2018.get('tvchannels', pd.DataFrame()).reindex(columns=TVCHANNEL_COLUMNS_2018)
+    df_tvchannels = fct_fillna_and_convert_types(df_tvchannels.astype({'name': 'object', 'country': 'object', 'iso2': 'object'}))
+    dim_tvchannel, channel_keys = fct_surrogate_keys(
+        df_tvchannels.rename(columns={'id': 'channel_id'}), 'channel_id', 'channel_key')
+
+    #------------------------table de faits-----------------------------------
+    df_matches = entities['matches']
+    fact_match = pd.DataFrame({
+        'match_number': df_matches['match_id'],
+        'date': df_matches['formatted_date'],
+        'home_team_key': fct_lookup_keys(df_matches['home_team_id'], team_keys),
+        'away_team_key': fct_lookup_keys(df_matches['away_team_id'], team_keys),
+        'stadium_key': fct_lookup_keys(df_matches['stadium_id'], stadium_keys),
+        'group_key': fct_lookup_keys(df_matches['group_id'], group_keys),
+        'round_key': fct_lookup_keys(df_matches['round_id'], round_keys),
+        'home_result': df_matches['home_result'],
+        'away_result': df_matches['away_result'],
+        'stage': df_matches['stage_name'],
+        'edition': df_matches['edition'],
+    })
+    # même match_id que la table matches : rang du numéro officiel dans l'édition
+    fact_match = fct_assign_match_id(fact_match, order_by=['match_number']).reset_index(drop=True)
+    fact_match = fact_match[['match_id', *fact_match.columns.drop('match_id')]]
+
+    #------------------------liaison match - chaîne TV------------------------
+    match_keys = dict(zip(fact_match['match_number'].tolist(), fact_match['match_id'].tolist()))
+    bridge = dfs_2018.get('bridge_match_channels', pd.DataFrame()).reindex(columns=['match_id', 'channel_id'])
+    bridge_match_channel = (
+        pd.DataFrame({
+            'match_id': fct_lookup_keys(bridge['match_id'], match_keys),
+            'channel_key': fct_lookup_keys(bridge['channel_id'], channel_keys),
+        })
+        .dropna()
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+
+    return {
+        'dim_team': dim_team,
+        'dim_stadium': dim_stadium,
+        'dim_group': dim_group,
+        'dim_round': dim_round,
+        'dim_tvchannel': dim_tvchannel,
+        'fact_match': fact_match,
+        'bridge_match_channel': bridge_match_channel,
+    }
+
+
 ######################## 2022  #################################################
 
+# Année de la date 2022 ("20 Nov 2022") -> édition
+YEAR_PATTERN_2022 = r"(?P<year>\d{4})"
+
+
+@fct_copy_on_write
 def transform_2022_data(df: pd.DataFrame , config: dict) -> pd.DataFrame:
     """
     Transforme les données brutes des matchs 2022 en un format nettoyé et standardisé.
@@ -389,7 +511,7 @@ def transform_2022_data(df: pd.DataFrame , config: dict) -> pd.DataFrame:
     ]
 
     # Filtrage des colonnes
-    df_filtered = df[list_wanted_columns].copy()
+    df_filtered = df[list_wanted_columns]
 
     df_filtered = df_filtered.rename(columns={
     "team1": "home_team",
@@ -407,6 +529,10 @@ def transform_2022_data(df: pd.DataFrame , config: dict) -> pd.DataFrame:
     # df_filtered["date"].astype("string").str.strip() + " " + df_filtered["hour"].astype("string"),
     # errors="coerce"
     # )
+    # édition : année écrite dans la date source, connue même si la date
+    # complète est invalide (match_id exige une édition renseignée)
+    df_filtered["edition"] = fct_regex_extract(df_filtered["date"], YEAR_PATTERN_2022)["year"].astype("Int64")
+
     dt = pd.to_datetime(
         df_filtered["date"].astype("string").str.strip() + " " + df_filtered["hour"].astype("string").str.strip(),
         format="%d %b %Y %H:%M",  # exemple : '01 Jan 2022 15:30'
@@ -429,12 +555,10 @@ def transform_2022_data(df: pd.DataFrame , config: dict) -> pd.DataFrame:
     mapping_dict = config['stage_mapping_2022']
     df_filtered["stage"] = df_filtered["stage"].replace(mapping_dict)
     
-    # Trier par date (ascendant : plus ancien en premier)
-    df_filtered.sort_values("date", inplace=True)
-    # Réinitialiser l'index incrémental pour match_id
-    df_filtered["match_id"] = range(1, len(df_filtered) + 1)
-    df_filtered['edition'] = df_filtered['date'].str[:4].astype("Int64")
     df_filtered["city"] = None
+
+    # Trier par date et attribuer un match_id stable, dérivé de (édition, rang)
+    df_filtered = fct_assign_match_id(df_filtered)
     
     # Réorganisation des colonnes du DataFrame
     df_filtered = df_filtered[["match_id", "date", "home_team", "away_team", "home_result", "away_result", "stage", "edition", "city"]]
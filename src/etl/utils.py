@@ -8,10 +8,13 @@ import yaml
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Optional, Union, Dict, List
+from typing import Optional, Union, Dict, List, Callable, Any, Tuple
+from functools import wraps
 import pandas as pd
 import unidecode
 import re         
+import pyarrow as pa
+import pyarrow.compute as pc
 
 
 def fct_load_config(config_filename: str = "config.yaml") -> dict:
@@ -300,11 +303,11 @@ def fct_final_columns_to_keep (
     # Créer un dictionnaire de mappage des anciennes aux nouvelles colonnes
     column_mapping = dict(zip(columns_to_keep_original_list, columns_to_keep_final_list))
 
-    # Filtrer les colonnes à garder
-    df_filtered = df[columns_to_keep_original_list].copy()
+    # Filtrer les colonnes à garder (la sélection produit déjà un nouvel objet)
+    df_filtered = df[columns_to_keep_original_list]
 
     # Renommer les colonnes selon le mapping
-    df_filtered.rename(columns=column_mapping, inplace=True)
+    df_filtered = df_filtered.rename(columns=column_mapping)
 
     return df_filtered
 
@@ -350,8 +353,9 @@ def clean_string_column(df: pd.DataFrame, col: str, rename_dict: dict = None) ->
     Retour :
         pd.DataFrame : DataFrame avec la colonne nettoyée
     """
-    # Copier le DataFrame pour ne pas modifier l'original
-    df_clean = df.copy()
+    # Copie superficielle : seules des colonnes entières sont réaffectées,
+    # l'original n'est donc jamais modifié et les autres colonnes ne sont pas dupliquées
+    df_clean = df.copy(deep=False)
     
     # Vérifier que la colonne existe
     if col not in df_clean.columns:
@@ -396,4 +400,192 @@ def fct_fillna_and_convert_types(
             # Pour tous les autres types (bool, category, etc.)
             if df[col].isna().any():
                 df[col] = df[col].fillna('notdefined')
-    return df
\ No newline at end of file
+    return df
+
+# Facteur de décalage par édition : match_id = edition * facteur + rang dans l'édition
+MATCH_ID_EDITION_FACTOR = 10_000
+
+
+def fct_assign_match_id(
+    df: pd.DataFrame,
+    order_by: Optional[List[str]] = None,
+    edition_col: str = "edition"
+) -> pd.DataFrame:
+    """
+    Attribue un match_id déterministe et stable, calculé par édition.
+
+    L'identifiant est dérivé de la clé ``(edition, rang)`` :
+    ``match_id = edition * MATCH_ID_EDITION_FACTOR + rang``, où le rang est
+    la position du match dans son édition selon les colonnes ``order_by``.
+    Chaque partition (fichier source) peut donc être numérotée
+    indépendamment des autres, sans tri global du jeu de données final,
+    et un même match garde le même identifiant d'une exécution à l'autre.
+    Le rang doit rester inférieur à ``MATCH_ID_EDITION_FACTOR`` (sinon
+    l'identifiant empiéterait sur ceux d'une autre édition) et l'édition
+    doit être renseignée (sinon l'identifiant serait nul) : une
+    ``ValueError`` est levée dans les deux cas.
+
+    Paramètres :
+        df (pd.DataFrame) : DataFrame d'entrée
+        order_by (list, optionnel) : colonnes définissant l'ordre des matchs
+            dans une édition (par défaut date, home_team, away_team)
+        edition_col (str) : nom de la colonne édition
+
+    Retour :
+        pd.DataFrame : DataFrame trié par (édition, order_by) avec la colonne match_id
+
+    Lève :
+        ValueError : édition manquante ou non numérique, ou plus de
+            ``MATCH_ID_EDITION_FACTOR - 1`` matchs dans une édition
+    """
+    if order_by is None:
+        order_by = ["date", "home_team", "away_team"]
+
+    edition = pd.to_numeric(df[edition_col], errors="coerce").astype("Int64")
+    if edition.isna().any():
+        raise ValueError(
+            f"{int(edition.isna().sum())} ligne(s) sans édition valide dans '{edition_col}' : "
+            "match_id ne peut pas être attribué"
+        )
+
+    # Un seul tri stable par partition : l'ordre obtenu sert aussi au rang
+    df = df.sort_values([edition_col, *order_by], kind="stable", na_position="last")
+    rank = df.groupby(edition_col).cumcount() + 1
+    if len(rank) and rank.max() >= MATCH_ID_EDITION_FACTOR:
+        sizes = df.groupby(edition_col).size()
+        raise ValueError(
+            f"Trop de matchs pour l'édition {sizes.idxmax()} ({sizes.max()}) : "
+            f"match_id = édition * {MATCH_ID_EDITION_FACTOR} + rang impose moins de "
+            f"{MATCH_ID_EDITION_FACTOR} matchs par édition"
+        )
+
+    df["match_id"] = edition.loc[df.index] * MATCH_ID_EDITION_FACTOR + rank.astype("Int64")
+    return df
+
+
+def fct_regex_extract(series: pd.Series, pattern: str) -> pd.DataFrame:
+    """
+    Extrait les groupes nommés d'une expression régulière en une seule passe vectorisée.
+
+    L'extraction est faite par le moteur RE2 de pyarrow (``extract_regex``),
+    sans boucle Python par valeur. Les valeurs qui ne correspondent pas au motif
+    et les groupes optionnels non capturés donnent des valeurs manquantes.
+
+    Paramètres :
+        series (pd.Series) : colonne de chaînes à analyser
+        pattern (str) : motif RE2 avec groupes nommés ``(?P<nom>...)``
+
+    Retour :
+        pd.DataFrame : une colonne ``string`` par groupe nommé, même index que ``series``
+    """
+    values = pa.array(series, type=pa.string(), from_pandas=True)
+    matches = pc.extract_regex(values, pattern)
+
+    columns = {}
+    for i in range(matches.type.num_fields):
+        field = matches.field(i)
+        # groupe optionnel non capturé -> "" côté pyarrow : on le ramène à NA
+        field = pc.if_else(pc.equal(field, ""), pa.scalar(None, pa.string()), field)
+        # colonne string[pyarrow] sans copie ni conversion en objets Python
+        columns[matches.type.field(i).name] = pd.arrays.ArrowStringArray(field)
+    return pd.DataFrame(columns, index=series.index)
+
+
+def fct_copy_on_write(func: Callable) -> Callable:
+    """
+    Décorateur : exécute une fonction de transformation sous la sémantique
+    copy-on-write de pandas.
+
+    Avec le copy-on-write, une sélection (``df[cols]``), un ``rename`` ou un
+    ``sort_values`` ne copient plus les données : la copie d'une colonne n'a
+    lieu qu'au moment où elle est modifiée, et jamais sur le DataFrame d'origine.
+    Les transformations peuvent ainsi enchaîner les étapes sans ``.copy()``
+    défensifs ni chemins ``SettingWithCopy``.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with pd.option_context("mode.copy_on_write", True):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def fct_to_match_date(series: pd.Series) -> pd.Series:
+    """
+    Convertit les dates du pipeline (``YYYYMMDDhhmmss``) en objets
+    ``datetime.date``, pour la colonne DATE (nullable) de la table ``matches``.
+
+    Une année seule (jeu 1930-2010) est une date partielle : aucun jour n'est
+    inventé, elle devient None (l'année reste dans la colonne ``edition``).
+    Les valeurs manquantes ou invalides (ex : ``99999999999999``) deviennent
+    aussi None ; ``fct_invalid_match_dates`` permet de les signaler.
+
+    Paramètres :
+        series (pd.Series) : colonne de dates au format du pipeline
+
+    Retour :
+        pd.Series : colonne d'objets ``datetime.date`` (ou None)
+    """
+    digits = series.astype("string").str.strip().str.slice(0, 8)
+    dates = pd.to_datetime(digits.where(digits.str.len() == 8), format="%Y%m%d", errors="coerce")
+    return dates.dt.date.astype(object).where(dates.notna(), None)
+
+
+def fct_invalid_match_dates(series: pd.Series) -> pd.Series:
+    """
+    Repère les dates renseignées que ``fct_to_match_date`` ne peut pas
+    convertir, hors années seules (dates partielles attendues).
+
+    Paramètres :
+        series (pd.Series) : colonne de dates au format du pipeline
+
+    Retour :
+        pd.Series : booléens, True pour une date invalide
+    """
+    text = series.astype("string").str.strip()
+    partial = text.str.fullmatch(r"\d{4}").fillna(False).astype(bool)
+    present = text.notna() & (text != "")
+    return present & ~partial & fct_to_match_date(series).isna()
+
+
+def fct_surrogate_keys(
+    df: pd.DataFrame,
+    natural_key: str,
+    key_name: str
+) -> Tuple[pd.DataFrame, Dict[Any, int]]:
+    """
+    Attribue une clé de substitution entière à chaque ligne d'une dimension.
+
+    Les clés valent 1..n dans l'ordre de la clé naturelle : elles sont
+    stables d'une exécution à l'autre tant que les entités ne changent pas.
+    Le dictionnaire renvoyé sert de cache de correspondance en mémoire
+    (clé naturelle -> clé de substitution) pour ``fct_lookup_keys``.
+
+    Paramètres :
+        df (pd.DataFrame) : lignes de la dimension
+        natural_key (str) : colonne identifiant l'entité dans la source
+        key_name (str) : nom de la colonne de clé de substitution à créer
+
+    Retour :
+        tuple : (dimension dédoublonnée avec la clé en première colonne,
+                 dictionnaire clé naturelle -> clé de substitution)
+    """
+    dim = (
+        df.drop_duplicates(natural_key)
+        .sort_values(natural_key, kind="stable")
+        .reset_index(drop=True)
+    )
+    dim.insert(0, key_name, pd.array(range(1, len(dim) + 1), dtype="Int64"))
+    lookup = dict(zip(dim[natural_key].tolist(), dim[key_name].tolist()))
+    return dim, lookup
+
+
+def fct_lookup_keys(series: pd.Series, lookup: Dict[Any, int]) -> pd.Series:
+    """
+    Remplace des clés naturelles par leurs clés de substitution (cache en mémoire).
+
+    Les valeurs absentes du dictionnaire (ex : 'notdefined', -999) donnent NA.
+
+    Retour :
+        pd.Series : clés de substitution (Int64)
+    """
+    return series.map(lookup).astype("Int64")
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du cache de résultats (cache.py).
+"""
+
+import datetime
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, create_engine, event
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from etl.cache import (
+    cached_execute_select, cached_select_to_dataframe, clear_result_cache,
+    configure_result_cache, normalize_sql, result_cache_stats
+)
+from etl.load import build_matches_table, delta_load_table, get_load_version
+
+
+@pytest.fixture(autouse=True)
+def default_cache_settings():
+    configure_result_cache(max_entries=256, max_bytes=64 * 1024 * 1024, ttl=300.0,
+                           version_check_interval=0)
+    yield
+    clear_result_cache()
+
+
+def _matches(edition, home_results=(1, 2)):
+    return pd.DataFrame({
+        "match_id": pd.array([edition * 10000 + i for i in (1, 2)], dtype="Int64"),
+        "date": [datetime.date(edition, 6, day) for day in (1, 2)],
+        "home_team": ["France", "Brazil"],
+        "away_team": ["Mexico", "Spain"],
+        "home_result": pd.array(list(home_results), dtype="Int64"),
+        "away_result": pd.array([0, 2], dtype="Int64"),
+        "stage": ["group_a", "final"],
+        "edition": [edition] * 2,
+        "city": ["Paris", None],
+    })
+
+
+def _selects(engine):
+    """Requêtes de lecture sur matches envoyées à la base (hors lecture des empreintes)."""
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt)
+                 if "FROM matches" in stmt and "row_hash" not in stmt else None)
+    return statements
+
+
+def test_cache_serves_repeated_queries_until_next_load(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    table = build_matches_table(MetaData())
+    assert get_load_version(engine) == 0
+    delta_load_table([_matches(2018)], table, engine)
+    assert get_load_version(engine) == 1
+    selects = _selects(engine)
+    query = "SELECT home_team, home_result FROM matches WHERE edition = :edition ORDER BY match_id"
+
+    first = cached_execute_select(engine, query, {"edition": 2018})
+    first[0]["home_team"] = "modifié"  # copie : le cache n'est pas altéré
+    again = cached_execute_select(engine, "  " + query.replace(" ", "\n  ") + " ;", {"edition": 2018})
+    assert again == [{"home_team": "France", "home_result": 1}, {"home_team": "Brazil", "home_result": 2}]
+    assert len(selects) == 1
+
+    # rechargement sans changement : version inchangée, le cache reste valide
+    delta_load_table([_matches(2018)], table, engine)
+    assert get_load_version(engine) == 1
+    cached_execute_select(engine, query, {"edition": 2018})
+    assert len(selects) == 1
+
+    # chargement effectif : nouvelle version, le résultat est relu
+    delta_load_table([_matches(2018, home_results=(3, 2))], table, engine)
+    assert get_load_version(engine) == 2
+    rows = cached_execute_select(engine, query, {"edition": 2018})
+    assert rows[0]["home_result"] == 3
+    assert len(selects) == 2
+    assert result_cache_stats()["invalidations"] == 1
+
+    # paramètres différents : entrée distincte
+    assert cached_execute_select(engine, query, {"edition": 2022}) == []
+    assert len(selects) == 3
+
+
+def test_delta_load_bumps_version_with_each_committed_partition(tmp_path, monkeypatch):
+    """Run interrompu : la partition validée a déjà incrémenté la version ;
+    un échec de l'incrément annule les lignes de la partition."""
+    import etl.load as load
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    table = build_matches_table(MetaData())
+    delta_load_table([_matches(2018)], table, engine)
+    query = "SELECT home_result FROM matches WHERE edition = 2018 ORDER BY match_id"
+    assert cached_execute_select(engine, query) == [{"home_result": 1}, {"home_result": 2}]
+
+    def partitions():
+        yield _matches(2018, home_results=(3, 2))
+        raise RuntimeError("run interrompu")
+
+    with pytest.raises(RuntimeError):
+        delta_load_table(partitions(), table, engine)
+    assert get_load_version(engine) == 2
+    assert cached_execute_select(engine, query)[0]["home_result"] == 3
+
+    def failing_bump(conn):
+        raise RuntimeError("échec de l'incrément")
+
+    monkeypatch.setattr(load, "_bump_load_version", failing_bump)
+    with pytest.raises(RuntimeError):
+        delta_load_table([_matches(2018, home_results=(5, 2))], table, engine)
+    assert get_load_version(engine) == 2
+    assert cached_execute_select(engine, query)[0]["home_result"] == 3
+
+
+def test_cache_key_distinguishes_credentials():
+    """Deux DSN ne différant que par les identifiants n'ont pas la même clé ;
+    le mot de passe n'apparaît pas en clair dans la clé."""
+    from sqlalchemy.engine import make_url
+    from etl.cache import _cache_key
+
+    def key(dsn):
+        return _cache_key(SimpleNamespace(url=make_url(dsn)), "rows", "SELECT 1", None)
+
+    reader = key("postgresql://reader:s3cret@db/wc")
+    assert reader == key("postgresql://reader:s3cret@db/wc")
+    assert reader != key("postgresql://reader:other@db/wc")
+    assert reader != key("postgresql://analyst:s3cret@db/wc")
+    assert "s3cret" not in repr(reader)
+
+
+def test_cached_select_to_dataframe_returns_copies(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    delta_load_table([_matches(2018)], build_matches_table(MetaData()), engine)
+    selects = _selects(engine)
+
+    df = cached_select_to_dataframe(engine, "SELECT match_id, city FROM matches")
+    df.loc[0, "city"] = "modifié"
+    again = cached_select_to_dataframe(engine, "SELECT match_id, city FROM matches")
+    assert again["city"].tolist() == ["Paris", None]
+    assert len(selects) == 1
+
+
+def test_normalize_sql_keeps_literals():
+    assert normalize_sql("SELECT  *\n FROM matches ;") == "SELECT * FROM matches"
+    assert normalize_sql("SELECT 'a  b' FROM t") == "SELECT 'a  b' FROM t"
+    assert normalize_sql("SELECT 'a  b' FROM t") != normalize_sql("SELECT 'a b' FROM t")
+
+
+def test_cache_eviction_lru_budget_and_ttl(tmp_path, monkeypatch):
+    import etl.cache as cache
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    delta_load_table([_matches(2018)], build_matches_table(MetaData()), engine)
+    selects = _selects(engine)
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    configure_result_cache(max_entries=2, ttl=10, version_check_interval=0)
+
+    query = "SELECT match_id FROM matches WHERE match_id = :id"
+    for match_id in (20180001, 20180002):
+        cached_execute_select(engine, query, {"id": match_id})
+    cached_execute_select(engine, query, {"id": 20180001})        # 20180001 récemment utilisé
+    cached_execute_select(engine, query, {"id": 20180003})        # évince 20180002
+    assert len(selects) == 3
+    cached_execute_select(engine, query, {"id": 20180001})
+    assert len(selects) == 3
+    cached_execute_select(engine, query, {"id": 20180002})
+    assert len(selects) == 4
+
+    # expiration
+    clock.now = 11.0
+    cached_execute_select(engine, query, {"id": 20180002})
+    assert len(selects) == 5
+
+    # budget mémoire : un résultat plus gros que le budget n'est pas conservé
+    configure_result_cache(max_bytes=10)
+    cached_execute_select(engine, query, {"id": 20180001})
+    cached_execute_select(engine, query, {"id": 20180001})
+    assert len(selects) == 7
+    assert result_cache_stats()["entries"] == 0
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du mode ELT (elt.py) : parité avec les transformations pandas.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, create_engine, text
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from etl.elt import (
+    drop_elt_staging, register_sqlite_functions, select_editions, sql_function, sql_mapping, sql_pattern, stage_csv_table,
+    stage_elt_sources
+)
+from etl.extract import fct_read_csv
+from etl.load import add_row_hash, build_matches_table, get_engine, sqlite_load_table
+from etl.transform import (
+    SCORE_PATTERN_2010, fct_transform_2010, trf_file_wcup_2014, transform_2022_data
+)
+from etl.utils import fct_load_config, fct_to_match_date
+
+CSV_2010 = """edition,round,score,team1,team2,url,venue,year
+1930-URUGUAY,GROUP_STAGE,4-1 (3-0),France (Frankreich),Mexico (Mexiko),a,Montevideo.,1930
+1930-URUGUAY,GROUP_STAGE,4-1 (3-0),France (Frankreich),Mexico (Mexiko),a,Montevideo.,1930
+1930-URUGUAY,GROUP_STAGE,2-0,France (Frankreich),Mexico (Mexiko),b,Montevideo.,1930
+1930-URUGUAY,GROUP_STAGE,1-1 (1-1) a.e.t. 4-3 PSO,Argentina (Argentinien),Chile,c,Santa Fe.,1930
+1930-URUGUAY,UNKNOWN_ROUND,annulé,Brazil,Bolivia (Bolivien),d,,1930
+1934-ITALY,_FINAL, 3-0,Austria (Österreich),Italy (Italien),e,Rome.,1934
+1934-ITALY,_FINAL,2-1 (0-0) a.e.t.,Italy (Italien),Czechoslovakia (Tschechoslowakei),f,Rome.,1934
+"""
+
+CSV_2014 = """Year,Datetime,Stage,Stadium,City,Home Team Name,Home Team Goals,Away Team Goals,Away Team Name
+2014,13 Jul 2014 - 16:00 ,Final,Maracana,Rio De Janeiro ,Germany,1,0,Argentina
+2014,12 Jun 2014 - 17:00 ,Group A,Arena,Sao Paulo ,Brazil,3,1,Croatia
+2014,14 Jun 2014 - 22:00 ,Group C,Arena,Recife ,C�te d'Ivoire,2,1,Japan
+2014,15 Jun 2014 - 13:00 ,Group X,Arena,Natal ,"rn"">Bosnia and Herzegovina",,,Argentina
+"""
+
+CSV_2022 = """team1,team2,number of goals team1,number of goals team2,date,hour,category
+QATAR,ECUADOR,0,2,20 NOV 2022,17 : 00,Group A
+ARGENTINA,FRANCE,3,3,18 DEC 2022,18 : 00,Final
+KOREA REPUBLIC,PORTUGAL,2,1,02 DEC 2022,16 : 00,Group H
+ cote d'ivoire,GHANA,1,x,02 DEC 2022,16 : 00,Friendly
+"""
+
+
+@pytest.fixture
+def elt_config(tmp_path):
+    config = fct_load_config(str(Path(__file__).resolve().parent.parent / "config.yaml"))
+    for edition, content in (("2010", CSV_2010), ("2014", CSV_2014), ("2022", CSV_2022)):
+        path = tmp_path / f"raw_{edition}.csv"
+        path.write_text(content, encoding="utf-8")
+        config[f"root_csv_{edition}"] = str(path)
+    return config
+
+
+def _pandas_matches(edition, config, table):
+    transform = {"2010": fct_transform_2010, "2014": trf_file_wcup_2014, "2022": transform_2022_data}[edition]
+    df = transform(fct_read_csv(config[f"root_csv_{edition}"]), config)
+    return add_row_hash(df.assign(date=fct_to_match_date(df["date"])), table).reset_index(drop=True)
+
+
+def _assert_select_parity(engine, config, edition):
+    """Mêmes match_id, dates et empreintes (donc mêmes valeurs canoniques) qu'en pandas."""
+    table = build_matches_table(MetaData())
+    selects = stage_elt_sources(config, engine, table, editions=[edition])
+    try:
+        with engine.connect() as conn:
+            elt = pd.read_sql(text(selects[edition].replace(":", "\\:")), conn)
+    finally:
+        drop_elt_staging(engine, editions=[edition])
+    expected = _pandas_matches(edition, config, table)
+
+    assert list(elt.columns) == [col.name for col in table.columns]
+    assert elt["match_id"].astype("Int64").tolist() == expected["match_id"].astype("Int64").tolist()
+    assert [None if pd.isna(d) else str(d) for d in elt["date"]] == \
+        [None if d is None else d.isoformat() for d in expected["date"]]
+    assert elt["row_hash"].tolist() == expected["row_hash"].tolist()
+
+
+@pytest.mark.parametrize("edition", ["2010", "2014", "2022"])
+def test_elt_select_matches_pandas_transform(elt_config, edition):
+    _assert_select_parity(create_engine("sqlite://"), elt_config, edition)
+
+
+@pytest.mark.skipif(not os.getenv("ETL_TEST_POSTGRES_DSN"),
+                    reason="ETL_TEST_POSTGRES_DSN non défini (serveur PostgreSQL de test)")
+@pytest.mark.parametrize("edition", ["2010", "2014", "2022"])
+def test_elt_select_matches_pandas_transform_postgres(elt_config, edition):
+    """Même parité sur PostgreSQL (``substring ... from``, ``to_date``, ``md5``)."""
+    _assert_select_parity(get_engine(os.environ["ETL_TEST_POSTGRES_DSN"]), elt_config, edition)
+
+
+def test_elt_load_into_sqlite_with_pandas_rows(elt_config):
+    """Éditions SQL insérées côté serveur dans la staging, à côté des lignes pandas."""
+    engine = create_engine("sqlite://")
+    table = build_matches_table(MetaData())
+    selects = stage_elt_sources(elt_config, engine, table, editions=["2010", "2014"])
+    assert select_editions(engine, selects.values()) == [1930, 1934, 2014]
+
+    chunk_2022 = _pandas_matches("2022", elt_config, table).iloc[:3]
+    n_rows = sqlite_load_table([chunk_2022], table, engine, selects=selects.values())
+    drop_elt_staging(engine)
+
+    with engine.connect() as conn:
+        counts = dict(conn.execute(text("SELECT edition, COUNT(*) FROM matches GROUP BY edition")).all())
+        tables = conn.execute(text("SELECT name FROM sqlite_master WHERE name LIKE 'elt_raw_%'")).all()
+    assert n_rows == 13
+    assert counts == {1930: 4, 1934: 2, 2014: 4, 2022: 3}
+    assert tables == []
+
+
+def test_stage_csv_table_keeps_raw_text_and_file_order(tmp_path):
+    path = tmp_path / "raw.csv"
+    path.write_text("Home Team;Goals\nQatar;0\n;\n", encoding="utf-8")
+    engine = create_engine("sqlite://")
+
+    assert stage_csv_table(path, "raw", engine) == ["home_team", "goals"]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT _row, home_team, goals FROM raw")).all() == \
+            [(1, "Qatar", "0"), (2, None, None)]
+
+
+def test_sql_helpers_per_dialect():
+    assert sql_function("postgresql", "md5", "x") == "md5(x)"
+    assert sql_function("sqlite", "md5", "x") == "etl_md5(x)"
+    assert sql_mapping("stage", {"Group A": "group_a", "l'autre": "x"}) == (
+        "CASE stage WHEN 'Group A' THEN 'group_a' WHEN 'l''autre' THEN 'x' ELSE stage END"
+    )
+    with pytest.raises(ValueError):
+        sql_function("mssql", "md5", "x")
+
+
+@pytest.mark.parametrize("dialect", [
+    "sqlite",
+    pytest.param("postgresql", marks=pytest.mark.skipif(
+        not os.getenv("ETL_TEST_POSTGRES_DSN"), reason="ETL_TEST_POSTGRES_DSN non défini (serveur PostgreSQL de test)"
+    )),
+])
+def test_match_date_returns_null_for_impossible_days(dialect):
+    """Jour inexistant ou année nulle : NULL dans chaque dialecte, comme fct_to_match_date."""
+    values = ["20220230170000", "20230229", "00000101", "20240229120000", "20221220", "2010", None]
+    engine = create_engine("sqlite://") if dialect == "sqlite" else get_engine(os.environ["ETL_TEST_POSTGRES_DSN"])
+    register_sqlite_functions(engine)
+    expression = sql_function(dialect, "match_date", "CAST(:value AS TEXT)")
+
+    with engine.connect() as conn:
+        dates = [conn.execute(text(f"SELECT {expression}"), {"value": value}).scalar() for value in values]
+
+    expected = fct_to_match_date(pd.Series(values, dtype=object)).tolist()
+    assert [None if d is None else str(d) for d in dates] == \
+        [None if d is None else d.isoformat() for d in expected]
+    assert expected[:3] == [None, None, None] and expected[3] is not None
+
+
+def test_sql_pattern_keeps_one_capturing_group():
+    assert sql_pattern(SCORE_PATTERN_2010, "home_result") == r"^\s*(\d+)\s*-\s*(?:\d+)"
+    assert sql_pattern(SCORE_PATTERN_2010, "away_result") == r"^\s*(?:\d+)\s*-\s*(\d+)"
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de l'échange Arrow IPC entre étapes (module handoff).
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from etl.handoff import (
+    fct_default_handoff_dir,
+    fct_open_ipc,
+    fct_write_ipc,
+    fct_read_ipc,
+    fct_write_ipc_dict,
+    fct_read_ipc_dict,
+)
+
+
+@pytest.fixture
+def df_matches():
+    return pd.DataFrame({
+        "match_id": pd.array([20220001, 20220002], dtype="Int64"),
+        "date": ["20221120170000", None],
+        "home_team": ["Qatar", "England"],
+        "home_result": pd.array([0, pd.NA], dtype="Int64"),
+        "city": [None, None],
+    })
+
+
+def test_fct_write_read_ipc_roundtrip(tmp_path, df_matches):
+    path = fct_write_ipc(df_matches, tmp_path / "matches.arrow")
+
+    df_read = fct_read_ipc(path)
+
+    pd.testing.assert_frame_equal(df_read, df_matches)
+
+
+def test_fct_read_ipc_arrow_backed_and_columns(tmp_path, df_matches):
+    path = fct_write_ipc(df_matches, tmp_path / "matches.arrow")
+
+    df_read = fct_read_ipc(path, columns=["match_id", "home_team"], arrow_backed=True)
+
+    assert list(df_read.columns) == ["match_id", "home_team"]
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df_read.dtypes)
+    assert df_read["match_id"].tolist() == [20220001, 20220002]
+
+
+def test_fct_read_ipc_numeric_columns_without_copy(tmp_path):
+    """Colonne numérique sans NA : vue en lecture seule sur le memory-map."""
+    import numpy as np
+
+    df = pd.DataFrame({"edition": np.arange(1000, dtype="int64"), "team": ["Qatar"] * 1000})
+    path = fct_write_ipc(df, tmp_path / "numeric.arrow")
+
+    df_read = fct_read_ipc(path)
+
+    values = df_read["edition"].to_numpy()
+    assert not values.flags.writeable and not values.flags.owndata
+    pd.testing.assert_frame_equal(df_read, df)
+    # les modifications passent par une nouvelle colonne, sans toucher au fichier
+    df_read["edition"] = df_read["edition"] + 1
+    assert fct_read_ipc(path)["edition"].iloc[0] == 0
+
+
+def test_fct_write_ipc_batch_size(tmp_path, df_matches):
+    path = fct_write_ipc(df_matches, tmp_path / "matches.arrow", batch_size=1)
+
+    assert fct_open_ipc(path).num_record_batches == 2
+
+
+def test_fct_write_read_ipc_dict(tmp_path, df_matches):
+    dfs = {"matches": df_matches, "teams": pd.DataFrame({"id": [1], "name": ["Qatar"]})}
+
+    paths = fct_write_ipc_dict(dfs, tmp_path, "extract_2018")
+    dfs_read = fct_read_ipc_dict(paths)
+
+    assert set(paths) == {"matches", "teams"}
+    assert paths["teams"].name == "extract_2018_teams.arrow"
+    pd.testing.assert_frame_equal(dfs_read["teams"], dfs["teams"])
+
+
+def test_fct_default_handoff_dir_is_writable_directory():
+    handoff_dir = fct_default_handoff_dir()
+    assert handoff_dir.is_dir()
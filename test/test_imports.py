@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des imports : sans effet de bord et sans la pile base de données.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DB_STACK = ["sqlalchemy", "src.etl.load", "src.etl.elt", "src.etl.cache"]
+
+
+def _loaded_modules(module: str) -> set:
+    """Modules chargés par ``import module`` dans un interpréteur neuf."""
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return set(completed.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["main", "src.etl.extract", "src.etl.transform", "src.etl.merge"])
+def test_import_without_db_stack(module):
+    loaded = _loaded_modules(module)
+    assert not loaded.intersection(DB_STACK)
+    assert "pyparsing" not in loaded
+
+
+def test_import_main_without_side_effects():
+    completed = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, main; "
+         "print(hasattr(main, 'config'), 'dotenv' in sys.modules, 'prometheus_client' in sys.modules)"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.split() == ["False", "False", "False"]
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de l'instrumentation des étapes (instrumentation.py).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from etl.instrumentation import (
+    fct_count_rows, fct_finish_run_report, fct_format_run_report, fct_measure_iterator,
+    fct_measure_stage, fct_new_run_report, fct_write_run_report
+)
+
+MB = 1024 * 1024
+
+
+def test_measure_stage_records_rows_times_and_memory():
+    report = fct_new_run_report("test")
+    with fct_measure_stage(report, "transform", "2014", rows_in=3) as record:
+        sum(range(100_000))
+        record["rows_out"] = 2
+
+    (stage,) = report["stages"]
+    assert stage["stage"] == "transform" and stage["edition"] == "2014"
+    assert (stage["rows_in"], stage["rows_out"], stage["status"]) == (3, 2, "ok")
+    assert stage["wall_s"] > 0 and stage["cpu_s"] >= 0
+    assert stage["rows_per_s"] > 0
+    assert 0 < stage["rss_mb"] <= stage["peak_rss_mb"]
+
+
+def test_peak_rss_is_sampled_within_each_stage():
+    """Pic de l'étape, libéré avant sa fin, et non hérité par l'étape suivante."""
+    report = fct_new_run_report("test")
+    with fct_measure_stage(report, "transform"):
+        buffer = b"x" * (100 * MB)
+        time.sleep(0.1)
+        del buffer
+    with fct_measure_stage(report, "load"):
+        time.sleep(0.05)
+
+    big, small = report["stages"]
+    assert big["peak_rss_mb"] >= big["rss_mb"] + 50
+    assert small["peak_rss_mb"] < big["peak_rss_mb"] - 50
+    assert not any(key.startswith("_") for key in big)
+
+
+def test_measure_stage_records_failures_and_is_inert_without_report():
+    report = fct_new_run_report("test")
+    with pytest.raises(KeyError):
+        with fct_measure_stage(report, "extract", "2010"):
+            raise KeyError("root_csv_2010")
+    assert report["stages"][0]["status"] == "error"
+    assert report["stages"][0]["error"] == "KeyError"
+
+    with fct_measure_stage(None, "extract") as record:
+        record["rows_out"] = 1
+
+
+def test_measure_iterator_counts_chunks_lazily():
+    report = fct_new_run_report("test")
+    chunks = (pd.DataFrame({"a": range(n)}) for n in (2, 3))
+    measured = fct_measure_iterator(report, "merge", chunks)
+    assert report["stages"][0]["rows_out"] == 0
+
+    assert [len(chunk) for chunk in measured] == [2, 3]
+    assert report["stages"][0]["rows_out"] == 5
+    assert "peak_rss_mb" in report["stages"][0]
+
+    chunks = [pd.DataFrame({"a": [1]})]
+    assert fct_measure_iterator(None, "merge", chunks) is not chunks
+
+
+def test_run_report_is_written_as_json(tmp_path):
+    report = fct_new_run_report("20260101T000000_1")
+    with fct_measure_stage(report, "extract", "2018") as record:
+        record["rows_out"] = fct_count_rows({"a": pd.DataFrame({"x": [1, 2]}), "b": pd.DataFrame({"x": [3]})})
+    fct_finish_run_report(report)
+
+    path = fct_write_run_report(report, tmp_path / "reports")
+    content = json.loads(path.read_text(encoding="utf-8"))
+    assert path.name == "run_20260101T000000_1.json"
+    assert content["status"] == "ok"
+    assert content["stages"][0]["rows_out"] == 3
+    assert content["peak_rss_mb"] >= content["stages"][0]["peak_rss_mb"]
+    assert not any(key.startswith("_") for key in content)
+    assert fct_format_run_report(report)[0].startswith("extract 2018")
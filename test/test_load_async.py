@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du chargement asynchrone (SQLite via aiosqlite).
+"""
+
+import asyncio
+import datetime
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from etl.load_async import (
+    get_async_engine,
+    dispose_async_engine,
+    dispose_all_async_engines,
+    execute_select,
+    select_to_dataframe,
+    execute_query,
+    copy_chunks_to_table,
+)
+
+
+DSN = "sqlite+aiosqlite://"
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _create_matches(engine):
+    await execute_query(
+        engine,
+        "CREATE TABLE matches (match_id INTEGER PRIMARY KEY, date DATE, "
+        "home_team VARCHAR(100), home_result INTEGER)"
+    )
+
+
+def _chunk(start, n_rows):
+    return pd.DataFrame({
+        "match_id": pd.array(range(start, start + n_rows), dtype="Int64"),
+        "date": [datetime.date(2022, 11, 20)] * n_rows,
+        "home_team": [f"team_{i}" for i in range(start, start + n_rows)],
+        "home_result": pd.array([pd.NA] + [1] * (n_rows - 1), dtype="Int64"),
+    })
+
+
+def test_get_async_engine_registry():
+    async def scenario():
+        engine = get_async_engine(DSN, pool_size=2)
+        assert get_async_engine(DSN) is engine
+        assert await dispose_async_engine(DSN) is True
+        assert await dispose_async_engine(DSN) is False
+    _run(scenario())
+
+
+def test_async_select_and_query():
+    async def scenario():
+        engine = get_async_engine(DSN)
+        try:
+            await _create_matches(engine)
+            await execute_query(engine, "INSERT INTO matches (match_id, home_team) VALUES (:id, :team)",
+                                {"id": 1, "team": "France"})
+            rows = await execute_select(engine, "SELECT match_id, home_team FROM matches")
+            df = await select_to_dataframe(engine, "SELECT * FROM matches WHERE match_id = :id", {"id": 1})
+            return rows, df
+        finally:
+            await dispose_all_async_engines()
+
+    rows, df = _run(scenario())
+    assert rows == [{"match_id": 1, "home_team": "France"}]
+    assert df["home_team"].tolist() == ["France"]
+
+
+def test_async_execute_query_prints_errors(capsys):
+    async def scenario():
+        engine = get_async_engine(DSN)
+        try:
+            await execute_query(engine, "DELETE FROM missing_table")
+        finally:
+            await dispose_all_async_engines()
+
+    _run(scenario())
+    assert "Erreur SQL" in capsys.readouterr().out
+
+
+def test_async_copy_chunks_prepares_in_worker_thread():
+    """Chargement par tranches ; le flux amont est consommé hors de la boucle asyncio."""
+    producer_threads = set()
+
+    def chunks():
+        for start in (0, 3):
+            producer_threads.add(threading.get_ident())
+            yield _chunk(start, 3)
+
+    async def scenario():
+        engine = get_async_engine(DSN)
+        try:
+            await _create_matches(engine)
+            await execute_query(engine, "INSERT INTO matches (match_id) VALUES (99)")
+            n_rows = await copy_chunks_to_table(chunks(), "matches", engine, chunksize=2, truncate=True)
+            rows = await execute_select(engine, "SELECT * FROM matches ORDER BY match_id")
+            return n_rows, rows
+        finally:
+            await dispose_all_async_engines()
+
+    n_rows, rows = _run(scenario())
+    assert n_rows == 6
+    assert [row["match_id"] for row in rows] == list(range(6))
+    assert rows[0]["home_result"] is None and rows[1]["home_result"] == 1
+    assert threading.get_ident() not in producer_threads
+
+
+def test_async_copy_chunks_rolls_back_on_error():
+    def chunks():
+        yield _chunk(0, 2)
+        raise RuntimeError("source interrompue")
+
+    async def scenario():
+        engine = get_async_engine(DSN)
+        try:
+            await _create_matches(engine)
+            try:
+                await copy_chunks_to_table(chunks(), "matches", engine)
+                assert False, "l'erreur doit être propagée"
+            except RuntimeError:
+                pass
+            return await execute_select(engine, "SELECT COUNT(*) AS n FROM matches")
+        finally:
+            await dispose_all_async_engines()
+
+    assert _run(scenario()) == [{"n": 0}]
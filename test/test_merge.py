@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la fusion hors mémoire (fct_write_sorted_run, fct_merge_sorted_runs).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from etl.merge import fct_write_sorted_run, fct_merge_sorted_runs
+from etl.handoff import fct_read_ipc
+
+
+@pytest.fixture
+def partitions():
+    """Partitions transformées, non triées, avec des types hétérogènes."""
+    df_2010 = pd.DataFrame({
+        "match_id": pd.array([19300002, 19300001, 19340001], dtype="Int64"),
+        "date": ["1930", "1930", "1934"],
+        "home_team": ["Uruguay", "France", "Italy"],
+        "home_result": pd.array([4, 4, -999], dtype="Int64"),
+        "city": ["Montevideo", "Montevideo", "Rome"],
+    })
+    df_2022 = pd.DataFrame({
+        "match_id": pd.array([20220002, 20220001], dtype="Int64"),
+        "date": ["20221221160000", "20221120170000"],
+        "home_team": ["England", "Qatar"],
+        "home_result": pd.array([pd.NA, 0], dtype="Int64"),
+        "city": [None, None],  # colonne vide -> type null dans le run
+    })
+    df_2014 = pd.DataFrame({
+        "match_id": [20140001],
+        "date": ["20140612170000"],
+        "home_team": ["Brazil"],
+        "home_result": [3],
+        "city": ["Sao Paulo"],
+    })
+    return [df_2010, df_2022, df_2014]
+
+
+def test_fct_write_sorted_run_sorts_partition(tmp_path, partitions):
+    run_path = fct_write_sorted_run(partitions[1], tmp_path, "2022")
+
+    assert run_path.exists()
+    df_run = fct_read_ipc(run_path)
+    assert list(df_run["date"]) == ["20221120170000", "20221221160000"]
+
+
+def test_fct_merge_sorted_runs_streams_globally_sorted_chunks(tmp_path, partitions):
+    run_paths = [
+        fct_write_sorted_run(df, tmp_path, str(i)) for i, df in enumerate(partitions)
+    ]
+
+    chunks = list(fct_merge_sorted_runs(run_paths, key="date", chunksize=2, batch_size=1))
+
+    # morceaux de taille bornée
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+    df_merged = pd.concat(chunks, ignore_index=True)
+    assert list(df_merged["date"]) == sorted(pd.concat(partitions)["date"])
+    # l'ordre intra-clé de chaque partition est conservé (tri stable)
+    assert list(df_merged["match_id"][:2]) == [19300002, 19300001]
+    # types : entiers nullables, valeurs manquantes conservées
+    assert df_merged["home_result"].dtype.name == "Int64"
+    assert df_merged["home_result"].isna().sum() == 1
+    assert df_merged["city"].isna().sum() == 2
+
+
+def test_fct_merge_sorted_runs_missing_keys_last(tmp_path):
+    df = pd.DataFrame({"match_id": [1, 2, 3], "date": [None, "2018", "2014"]})
+    run_path = fct_write_sorted_run(df, tmp_path, "x")
+
+    df_merged = pd.concat(fct_merge_sorted_runs([run_path]), ignore_index=True)
+
+    assert list(df_merged["match_id"]) == [3, 2, 1]
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 7, 1_000])
+def test_fct_merge_sorted_runs_matches_stable_sort(tmp_path, batch_size):
+    """Même ordre qu'un tri stable des runs concaténés : clé, puis run, puis position."""
+    rng = np.random.default_rng(0)
+    partitions = []
+    for i in range(4):
+        dates = rng.choice(["1930", "1954", "1954", "2014", None], size=int(rng.integers(0, 40)))
+        partitions.append(pd.DataFrame({"match_id": np.arange(len(dates)) + 1000 * i, "date": dates}))
+    run_paths = [fct_write_sorted_run(df, tmp_path, str(i)) for i, df in enumerate(partitions)]
+
+    chunks = list(fct_merge_sorted_runs(run_paths, chunksize=16, batch_size=batch_size))
+
+    expected = pd.concat(
+        [df.sort_values("date", kind="stable", na_position="last") for df in partitions], ignore_index=True
+    ).sort_values("date", kind="stable", na_position="last")
+    assert all(len(chunk) == 16 for chunk in chunks[:-1])
+    assert pd.concat(chunks, ignore_index=True)["match_id"].tolist() == expected["match_id"].tolist()
+
+
+def test_fct_merge_sorted_runs_incompatible_columns(tmp_path):
+    run_a = fct_write_sorted_run(pd.DataFrame({"date": ["1"], "a": [1]}), tmp_path, "a")
+    run_b = fct_write_sorted_run(pd.DataFrame({"date": ["2"], "b": [1]}), tmp_path, "b")
+
+    with pytest.raises(ValueError):
+        list(fct_merge_sorted_runs([run_a, run_b]))
+
+
+def test_fct_merge_sorted_runs_empty():
+    assert list(fct_merge_sorted_runs([])) == []
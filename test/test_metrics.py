@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des métriques Prometheus (metrics.py).
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from functools import partial
+
+from etl.instrumentation import fct_add_stages, fct_finish_run_report, fct_measure_stage, fct_new_run_report
+from etl.metrics import (
+    fct_build_metrics, fct_observe_batches, fct_record_run_metrics, fct_record_stage_metrics,
+    fct_write_metrics_textfile
+)
+
+
+def _value(metrics, name, **labels):
+    return metrics["registry"].get_sample_value(name, labels or None)
+
+
+def _report(metrics):
+    return fct_new_run_report("test", on_stage_close=partial(fct_record_stage_metrics, metrics))
+
+
+def test_run_report_is_reported_per_stage_and_edition():
+    metrics = fct_build_metrics()
+    report = _report(metrics)
+    for edition, rows in (("2014", 64), ("2022", 64)):
+        with fct_measure_stage(report, "transform", edition) as record:
+            record["rows_out"] = rows
+    with fct_measure_stage(report, "load") as record:
+        record["rows_out"] = 128
+    fct_record_run_metrics(metrics, fct_finish_run_report(report))
+
+    assert _value(metrics, "etl_rows_total", stage="transform", edition="2022") == 64
+    assert _value(metrics, "etl_rows_total", stage="load", edition="all") == 128
+    assert _value(metrics, "etl_stage_duration_seconds_count", stage="transform") == 2
+    assert _value(metrics, "etl_stage_rows_per_second", stage="load", edition="all") > 0
+    assert _value(metrics, "etl_last_success_timestamp_seconds") > 0
+    assert _value(metrics, "etl_failures_total", stage="load") is None
+
+
+def test_stage_metrics_are_visible_before_the_run_ends():
+    """Un scrape pendant le run voit les étapes closes, y compris celles des processus de travail."""
+    metrics = fct_build_metrics()
+    report = _report(metrics)
+    worker = {"stages": []}
+    with fct_measure_stage(worker, "extract", "2010") as record:
+        record["rows_out"] = 10
+    fct_add_stages(report, worker["stages"])
+    with fct_measure_stage(report, "transform", "2014") as record:
+        record["rows_out"] = 64
+        assert _value(metrics, "etl_rows_total", stage="extract", edition="2010") == 10
+        assert _value(metrics, "etl_rows_total", stage="transform", edition="2014") is None
+
+    assert _value(metrics, "etl_rows_total", stage="transform", edition="2014") == 64
+    assert _value(metrics, "etl_stage_duration_seconds_count", stage="transform") == 1
+    assert _value(metrics, "etl_last_run_timestamp_seconds") == 0
+    assert report["stages"][0]["stage"] == "extract"
+
+
+def test_failures_are_counted_and_registries_are_isolated():
+    metrics = fct_build_metrics()
+    report = _report(metrics)
+    try:
+        with fct_measure_stage(report, "load"):
+            raise RuntimeError("COPY")
+    except RuntimeError:
+        pass
+    fct_record_run_metrics(metrics, fct_finish_run_report(report, "error"))
+
+    assert _value(metrics, "etl_failures_total", stage="load") == 1
+    assert _value(metrics, "etl_last_success_timestamp_seconds") == 0
+    assert _value(metrics, "etl_last_run_timestamp_seconds") > 0
+
+    # échec avant toute étape mesurée
+    fct_record_run_metrics(metrics, fct_finish_run_report(_report(metrics), "error"))
+    assert _value(metrics, "etl_failures_total", stage="run") == 1
+    assert _value(fct_build_metrics(), "etl_failures_total", stage="load") is None
+
+
+def test_observe_batches_and_textfile(tmp_path):
+    metrics = fct_build_metrics()
+    assert list(fct_observe_batches(metrics, [[1, 2], [3]], "sqlite")) == [[1, 2], [3]]
+    assert _value(metrics, "etl_load_batch_duration_seconds_count", sink="sqlite") == 2
+    assert list(fct_observe_batches(None, [[1]], "sqlite")) == [[1]]
+
+    path = tmp_path / "etl.prom"
+    fct_write_metrics_textfile(metrics, str(path))
+    content = path.read_text(encoding="utf-8")
+    assert 'etl_load_batch_duration_seconds_count{sink="sqlite"} 2.0' in content
+    assert "python_gc" not in content
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du profilage à la demande (profiling.py).
+"""
+
+import pstats
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Ajouter src au chemin Python
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+import etl.utils as utils
+from etl.profiling import (
+    fct_install_helper_profiling, fct_profile_stage, fct_profiling_settings,
+    fct_uninstall_helper_profiling, fct_write_profiles
+)
+
+
+def _settings(tmp_path, mode, **options):
+    config = {"profiling": {"enabled": True, "mode": mode, "output_dir": str(tmp_path), **options}}
+    return fct_profiling_settings(config)
+
+
+def _work():
+    df = pd.DataFrame({"a": range(20_000)})
+    return [str(value) for value in df["a"]]
+
+
+def test_disabled_profiling_wraps_nothing():
+    assert fct_profiling_settings({}) is None
+    assert isinstance(fct_profile_stage(None, "load"), nullcontext)
+    assert fct_install_helper_profiling(None) == []
+    assert fct_write_profiles(None) == []
+    with pytest.raises(ValueError):
+        fct_profiling_settings({"profiling": {"enabled": True, "mode": "perf"}})
+
+
+def test_cprofile_stage_dump_and_stage_selection(tmp_path):
+    settings = _settings(tmp_path, "cprofile", stages=["transform"])
+    assert isinstance(fct_profile_stage(settings, "load"), nullcontext)
+    for _ in range(2):
+        with fct_profile_stage(settings, "transform_2014"):
+            _work()
+
+    paths = {path.name: path for path in fct_write_profiles(settings)}
+    assert set(paths) == {"transform_2014.prof", "transform_2014.txt"}
+    functions = {func[2] for func in pstats.Stats(str(paths["transform_2014.prof"])).stats}
+    assert "_work" in functions
+    assert paths["transform_2014.txt"].read_text(encoding="utf-8").startswith("transform_2014 : 2 appel(s)")
+
+
+def test_tracemalloc_reports_allocation_sites(tmp_path):
+    settings = _settings(tmp_path, "tracemalloc", top_n=5)
+    with fct_profile_stage(settings, "extract_2010"):
+        kept = _work()
+
+    (path,) = fct_write_profiles(settings)
+    summary = path.read_text(encoding="utf-8").splitlines()
+    assert summary[1].startswith("pic :")
+    assert len(summary) == 2 + 5
+    assert any("test_profiling.py" in line for line in summary[2:])
+    assert kept
+
+
+def test_sampling_helper_profiling_rebinds_imported_names(tmp_path):
+    import etl.transform as transform
+
+    settings = _settings(tmp_path, "sampling", helpers=["fct_regex_extract"], sampling_interval=0.001)
+    original = utils.fct_regex_extract
+    try:
+        assert fct_install_helper_profiling(settings) == ["fct_regex_extract"]
+        assert fct_install_helper_profiling(settings) == ["fct_regex_extract"]  # idempotent
+        assert utils.fct_regex_extract.__wrapped__ is original
+        assert transform.fct_regex_extract.__profiled__  # référence importée par nom
+
+        series = pd.Series(["2-1 (1-0)", "0-0"] * 20_000)
+        start = time.perf_counter()
+        while time.perf_counter() - start < 0.05:
+            utils.fct_regex_extract(series, r"(?P<home>\d+)-(?P<away>\d+)")
+    finally:
+        fct_uninstall_helper_profiling()
+    assert utils.fct_regex_extract is original
+    assert not hasattr(transform.fct_regex_extract, "__profiled__")
+
+    paths = {path.name: path for path in fct_write_profiles(settings)}
+    folded = paths["helper_fct_regex_extract.folded"].read_text(encoding="utf-8")
+    assert "utils:fct_regex_extract" in folded
+    assert paths["helper_fct_regex_extract.txt"].read_text(encoding="utf-8").split("\n")[1].endswith("échantillons")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du générateur de données synthétiques des benchmarks (benchmark/synthetic.py) :
+les fichiers générés passent par les extractions et transformations réelles.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Ajouter la racine du dépôt au chemin Python
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from benchmark.synthetic import (
+    BASE_ROWS, MAX_SCALE, fct_synthetic_2010, fct_synthetic_2014, fct_synthetic_2018, fct_synthetic_2022,
+    fct_synthetic_editions, fct_write_synthetic_sources
+)
+from src.etl.extract import fct_read_csv, fct_read_json_nested
+from src.etl.transform import (
+    fct_transform_2010, fct_transform_data_2018, transform_2022_data, trf_file_wcup_2014
+)
+from src.etl.utils import MATCH_ID_EDITION_FACTOR, fct_assign_match_id, fct_load_config
+
+
+@pytest.fixture(scope="module")
+def config():
+    return fct_load_config(str(ROOT / "config.yaml"))
+
+
+@pytest.mark.parametrize("scale", [1, 3])
+def test_synthetic_sources_go_through_every_transform(tmp_path, config, scale):
+    paths = fct_write_synthetic_sources(tmp_path, scale, seed=1)
+    config = {**config, **paths}
+
+    frames = {
+        "2010": fct_transform_2010(fct_read_csv(paths["root_csv_2010"]), config),
+        "2014": trf_file_wcup_2014(fct_read_csv(paths["root_csv_2014"]), config),
+        "2018": fct_transform_data_2018(fct_read_json_nested(paths["root_json_2018"]), config),
+        "2022": transform_2022_data(fct_read_csv(paths["root_csv_2022"]), config),
+    }
+    for edition, df in frames.items():
+        assert df["match_id"].is_unique
+        assert df[["date", "home_team", "away_team", "home_result", "stage"]].notna().all().all()
+        assert (df["home_team"] != df["away_team"]).all()
+        expected = BASE_ROWS[edition] * scale
+        assert expected * 0.97 <= len(df) <= expected  # doublons 2010 supprimés
+    # toutes les étapes des sources sont connues des correspondances de config.yaml
+    assert set(frames["2014"]["stage"]) <= set(config["trf_file_wcup_2014"]["stage_mapping"].values())
+    assert set(frames["2022"]["stage"]) <= set(config["stage_mapping_2022"].values())
+    assert "Ivory Coast" in set(frames["2014"]["home_team"]) | set(frames["2014"]["away_team"])
+
+
+def test_synthetic_data_is_deterministic():
+    assert fct_synthetic_2010(50, seed=3).equals(fct_synthetic_2010(50, seed=3))
+    assert not fct_synthetic_2010(50, seed=3).equals(fct_synthetic_2010(50, seed=4))
+
+
+def test_top_scale_fits_match_id_encoding(tmp_path, config):
+    """A l'échelle maximale, chaque édition reste sous MATCH_ID_EDITION_FACTOR matchs."""
+    rows = {edition: BASE_ROWS[edition] * MAX_SCALE for edition in BASE_ROWS}
+    data_2018 = fct_synthetic_2018(rows["2018"])
+    editions = {
+        # doublons exacts supprimés comme par la transformation
+        "2010": fct_synthetic_2010(rows["2010"]).drop_duplicates()["year"],
+        "2014": fct_synthetic_2014(rows["2014"])["Year"],
+        "2018": [
+            int(match["date"][:4])
+            for part in ("groups", "knockout") for stage in data_2018[part].values() for match in stage["matches"]
+        ],
+    }
+    for edition, years in editions.items():
+        sizes = pd.Series(years).value_counts()
+        assert rows[edition] * 0.97 <= sizes.sum() <= rows[edition]
+        assert sizes.max() < MATCH_ID_EDITION_FACTOR
+        assert set(sizes.index) == set(fct_synthetic_editions(edition, rows[edition]))
+        fct_assign_match_id(pd.DataFrame({"edition": years, "date": 0, "home_team": "", "away_team": ""}))
+
+    # éditions synthétiques disjointes d'une source à l'autre
+    all_editions = [year for edition in BASE_ROWS for year in fct_synthetic_editions(edition, rows[edition])]
+    assert len(all_editions) == len(set(all_editions))
+
+    # parcours complet d'une source par la transformation réelle
+    path = tmp_path / "raw_2022.csv"
+    fct_synthetic_2022(rows["2022"]).to_csv(path, index=False)
+    df = transform_2022_data(fct_read_csv(str(path)), config)
+    assert len(df) == rows["2022"] and df["match_id"].is_unique
+    assert df["edition"].nunique() == len(fct_synthetic_editions("2022", rows["2022"]))
@@ -100,8 +100,55 @@ def test_fct_transform_2010_basic(sample_df_2010, sample_config_2010):
     # Vérifie que l'édition est correctement renseignée
     assert df_result.loc[0, "edition"] == 2010
 
-    # Vérifie que match_id est bien incrémenté
-    assert list(df_result["match_id"]) == [1, 2]
+    # Vérifie que match_id est dérivé de (édition, rang)
+    assert list(df_result["match_id"]) == [20100001, 20100002]
+
+def test_fct_transform_2010_score_markers_and_team_names(sample_config_2010):
+    """Scores à deux chiffres, prolongation, tirs au but et noms d'équipes."""
+    df = pd.DataFrame({
+        "date": ["1982", "1994", "1998"],
+        "home_team": ["Hungary (Ungarn)", "Brazil (Brasilien)", "France"],
+        "away_team": ["El Salvador (El Salvador)", "Italy (Italien)", "Brazil (Brasilien)"],
+        "score": ["10-1 (3-0)", "0-0 (0-0) a.e.t. 3-2 PSO", "x"],
+        "stage": ["Final", "Final", "Final"],
+        "city": ["Elche.", "Pasadena.", "Saint-Denis."]
+    })
+
+    df_result = fct_transform_2010(df, sample_config_2010).set_index("edition")
+
+    assert df_result.loc[1982, "home_result"] == 10
+    assert df_result.loc[1982, "away_result"] == 1
+    assert df_result.loc[1982, "home_team"] == "Hungary"
+    assert df_result.loc[1982, "away_team"] == "El Salvador"
+    # score final : ni la mi-temps ni les tirs au but ne sont repris
+    assert df_result.loc[1994, "home_result"] == 0
+    assert df_result.loc[1994, "away_result"] == 0
+    assert df_result.loc[1994, "away_team"] == "Italy"
+    # score non exploitable -> valeur sentinelle
+    assert df_result.loc[1998, "home_result"] == -999
+    assert df_result.loc[1998, "home_team"] == "France"
+
+@pytest.mark.parametrize("score, expected", [
+    ("2-1 a.p.", (2, 1)),
+    ("1-1 (4-3 t.a.b.)", (1, 1)),
+    ("1-1 (1-1) a.e.t. 4-3 PSO", (1, 1)),
+    ("3-2 (1-1, 2-2) a.e.t.", (3, 2)),
+])
+def test_fct_transform_2010_extra_time_and_penalty_markers(sample_config_2010, score, expected):
+    """Marqueurs de prolongation et de tirs au but ignorés : seuls les buts du score final sont repris."""
+    df = pd.DataFrame({
+        "date": ["1994"],
+        "home_team": ["Brazil (Brasilien)"],
+        "away_team": ["Italy (Italien)"],
+        "score": [score],
+        "stage": ["Final"],
+        "city": ["Pasadena."]
+    })
+
+    df_result = fct_transform_2010(df, sample_config_2010)
+
+    assert tuple(df_result[["home_result", "away_result"]].iloc[0]) == expected
+    assert "home_penalty" not in df_result.columns and "extra_time" not in df_result.columns
 
 ##########   test-2014   ##################################################################
 
@@ -352,6 +399,35 @@ def test_transform_2018_team_city_accents_spaces(sample_dfs_2018, sample_config_
         normalized = unicodedata.normalize('NFC', name)
         assert normalized == name, f"Accent mal formé détecté dans '{name}'"
 
+
+def test_transform_star_2018_surrogate_keys(sample_dfs_2018, sample_config_2018):
+    """Schéma en étoile : faits à clés entières, même match_id que la table plate."""
+    from etl.transform import fct_transform_star_2018
+
+    dfs = dict(sample_dfs_2018)
+    dfs["tvchannels"] = pd.DataFrame({
+        "id": [10, 20], "name": ["TF1", "beIN"], "country": ["France", None], "iso2": ["FR", "QA"]
+    })
+    dfs["bridge_match_channels"] = pd.DataFrame({"match_id": [1, 1, 2, 2], "channel_id": [10, 20, 20, 99]})
+
+    star = fct_transform_star_2018(dfs, sample_config_2018)
+    flat = fct_transform_data_2018(sample_dfs_2018, sample_config_2018)
+
+    fact = star["fact_match"]
+    assert fact["match_id"].tolist() == flat["match_id"].tolist()
+    assert fact["match_number"].tolist() == [1, 2]
+    teams = star["dim_team"].set_index("team_key")["name"]
+    assert [teams[k] for k in fact["home_team_key"]] == flat["home_team"].tolist()
+    stadiums = star["dim_stadium"].set_index("stadium_key")["city"]
+    assert [stadiums[k] for k in fact["stadium_key"]] == flat["city"].tolist()
+    assert fact["round_key"].tolist() == [1, 2]  # clés dans l'ordre des clés naturelles : round_16 < round_8
+    assert all(str(fact[c].dtype) == "Int64" for c in ["home_team_key", "away_team_key", "stadium_key"])
+    assert "home_team" not in fact.columns and "city" not in fact.columns
+
+    # la chaîne inconnue (99) est écartée de la liaison
+    assert star["bridge_match_channel"].values.tolist() == [[20180001, 1], [20180001, 2], [20180002, 2]]
+    assert star["dim_tvchannel"]["country"].tolist() == ["France", "notdefined"]
+
 ##########   test-2022   ##################################################################
 
 # Fixtures 2022
@@ -407,8 +483,8 @@ def test_transform_2022_data_happy_path(raw_matches_2022_df, config_2022):
     assert out.iloc[0]["date"] == "20220101090500"
     assert out.iloc[1]["date"] == "20220102170000"
 
-    # Vérifie match_id après tri
-    assert list(out["match_id"]) == [1, 2]
+    # Vérifie match_id après tri : édition * 10000 + rang
+    assert list(out["match_id"]) == [20220001, 20220002]
 
     # Vérifie normalisation des noms d'équipes
     assert out.iloc[0]["home_team"] == "Argentina"
@@ -481,3 +557,125 @@ def test_transform_2022_data_stage_mapping_keeps_unknown_values(config_2022):
     )
     out = transform_2022_data(df, config_2022)
     assert out.loc[0, "stage"] == "Friendly"
+
+
+##########   test-mémoire (copy-on-write)   ##############################################
+
+import tracemalloc
+import numpy as np
+
+
+def _deep_size(data) -> int:
+    """Taille mémoire (octets) d'un DataFrame ou d'un dictionnaire de DataFrames."""
+    if isinstance(data, dict):
+        return sum(_deep_size(df) for df in data.values())
+    return int(data.memory_usage(deep=True).sum())
+
+
+def _peak_memory(func, data, config) -> int:
+    """Pic d'allocation (octets) mesuré par tracemalloc pendant une transformation."""
+    func(data, config)  # préchauffage : imports et caches pandas hors mesure
+    tracemalloc.start()
+    try:
+        func(data, config)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.fixture
+def large_inputs():
+    """Entrées synthétiques de quelques centaines de lignes par édition."""
+    rng = np.random.default_rng(0)
+    teams = ["France", "Brazil", "Italy", "Germany", "Spain", "Uruguay"]
+    n = 1000
+    df_2010 = pd.DataFrame({
+        "date": rng.choice(np.arange(1930, 2011, 4), n).astype(str),
+        "home_team": [f"{t} ({t[:2]})" for t in rng.choice(teams, n)],
+        "away_team": [f"{t} ({t[:2]})" for t in rng.choice(teams, n)],
+        "score": [f"{h}-{a} (1-0)" for h, a in rng.integers(0, 5, (n, 2))],
+        "stage": rng.choice(["Final", "Semi-final"], n),
+        "city": rng.choice(["Paris.", "Rome."], n),
+    })
+    n_2014 = 300
+    df_2014 = pd.DataFrame({
+        "Datetime": [f"{d:02d} Jun 2014 - 17:00" for d in rng.integers(1, 29, n_2014)],
+        "home_team": rng.choice(teams, n_2014),
+        "away_team": rng.choice(teams, n_2014),
+        "home_result": rng.integers(0, 5, n_2014),
+        "away_result": rng.integers(0, 5, n_2014),
+        "stage": "Group",
+        "edition": 2014,
+        "city": "Rio de Janeiro",
+    })
+    n_2018 = 512
+    dfs_2018 = {
+        "stadiums": pd.DataFrame({"id": range(1, 13), "name": [f"stadium {i}" for i in range(12)],
+                                  "city": [f"City {i}." for i in range(12)]}),
+        "teams": pd.DataFrame({"id": range(1, 33), "name": [f"Team {i}" for i in range(32)]}),
+        "groups": pd.DataFrame({"group_id": ["A", "B"], "group_name": ["Group A", "Group B"],
+                                "winner_team_id": [1, 2], "runnerup_team_id": [2, 1]}),
+        "rounds": pd.DataFrame({"round_id": ["round_16"], "round_name": ["Round of 16"]}),
+        "matches": pd.DataFrame({
+            "match_id": range(1, n_2018 + 1),
+            "date": [f"2018-06-{d:02d}T18:00:00+03:00" for d in rng.integers(14, 29, n_2018)],
+            "home_team_id": rng.integers(1, 33, n_2018),
+            "away_team_id": rng.integers(1, 33, n_2018),
+            "home_result": rng.integers(0, 5, n_2018),
+            "away_result": rng.integers(0, 5, n_2018),
+            "stage": "group",
+            "type": "group",
+            "group_id": rng.choice(["A", "B"], n_2018),
+            "round_id": None,
+            "stadium_id": rng.integers(1, 13, n_2018),
+            "channels": [[1, 2]] * n_2018,
+        }),
+    }
+    df_2022 = pd.DataFrame({
+        "team1": rng.choice(teams, n),
+        "team2": rng.choice(teams, n),
+        "number of goals team1": rng.integers(0, 5, n).astype(str),
+        "number of goals team2": rng.integers(0, 5, n).astype(str),
+        "date": [f"{d:02d} Nov 2022" for d in rng.integers(1, 29, n)],
+        "hour": "17 : 00",
+        "category": "Group",
+    })
+    return {"2010": df_2010, "2014": df_2014, "2018": dfs_2018, "2022": df_2022}
+
+
+@pytest.mark.parametrize("edition, func, config_fixture, max_ratio", [
+    ("2010", fct_transform_2010, "sample_config_2010", 1.5),
+    ("2014", trf_file_wcup_2014, "sample_config_2014", 1.5),
+    ("2018", fct_transform_data_2018, "sample_config_2018", 3.0),
+    ("2022", transform_2022_data, "config_2022", 2.5),
+])
+def test_transform_peak_memory(edition, func, config_fixture, max_ratio, large_inputs, request):
+    """Le pic mémoire d'une transformation reste borné par la taille de son entrée."""
+    config = request.getfixturevalue(config_fixture)
+    data = large_inputs[edition]
+
+    peak = _peak_memory(func, data, config)
+
+    assert peak < max_ratio * _deep_size(data), (
+        f"{edition} : pic {peak} octets pour une entrée de {_deep_size(data)} octets"
+    )
+
+
+@pytest.mark.parametrize("edition, func, config_fixture", [
+    ("2010", fct_transform_2010, "sample_config_2010"),
+    ("2014", trf_file_wcup_2014, "sample_config_2014"),
+    ("2018", fct_transform_data_2018, "sample_config_2018"),
+    ("2022", transform_2022_data, "config_2022"),
+])
+def test_transform_does_not_modify_input(edition, func, config_fixture, large_inputs, request):
+    """Sans copie défensive, les entrées restent intactes (copy-on-write)."""
+    config = request.getfixturevalue(config_fixture)
+    data = large_inputs[edition]
+    frames = data if isinstance(data, dict) else {edition: data}
+    before = {name: df.copy(deep=True) for name, df in frames.items()}
+
+    func(data, config)
+
+    for name, df in frames.items():
+        pd.testing.assert_frame_equal(df, before[name])
@@ -130,4 +130,138 @@ def test_normalize_datetime_dayfirst_false():
     # Format américain avec month/day/year, dayfirst=True doit être géré correctement
     date_str = "06/12/2014 17:00"
     result = normalize_datetime(date_str)
-    assert result == "20140612170000"
\ No newline at end of file
+    assert result == "20140612170000"
+
+# ============================================================================
+# fct_assign_match_id
+# ============================================================================
+from etl.utils import fct_assign_match_id
+
+
+def test_fct_assign_match_id_per_edition_offsets():
+    """Les identifiants sont dérivés de (édition, rang) dans chaque édition."""
+    df = pd.DataFrame({
+        "date": ["19340527", "19300713", "19300714", "19340528"],
+        "home_team": ["Italy", "France", "Uruguay", "Germany"],
+        "away_team": ["USA", "Mexico", "Peru", "Belgium"],
+        "edition": [1934, 1930, 1930, 1934],
+    })
+
+    out = fct_assign_match_id(df)
+
+    assert list(out["match_id"]) == [19300001, 19300002, 19340001, 19340002]
+    assert list(out["home_team"]) == ["France", "Uruguay", "Italy", "Germany"]
+
+
+def test_fct_assign_match_id_is_stable_across_input_order():
+    """Le même match garde le même identifiant quel que soit l'ordre d'entrée."""
+    df = pd.DataFrame({
+        "date": ["2022112017", "2022112017", "2022112110"],
+        "home_team": ["Qatar", "England", "Senegal"],
+        "away_team": ["Ecuador", "Iran", "Netherlands"],
+        "edition": [2022, 2022, 2022],
+    })
+
+    ids = fct_assign_match_id(df.copy()).set_index("home_team")["match_id"]
+    ids_shuffled = fct_assign_match_id(df.iloc[::-1].copy()).set_index("home_team")["match_id"]
+
+    assert ids.to_dict() == ids_shuffled.to_dict()
+    assert ids["England"] == 20220001
+
+
+def test_fct_assign_match_id_rejects_rank_overflow():
+    """Une édition de MATCH_ID_EDITION_FACTOR matchs ou plus empiéterait sur l'édition suivante."""
+    from etl.utils import MATCH_ID_EDITION_FACTOR
+
+    df = pd.DataFrame({
+        "date": ["2022112017"] * MATCH_ID_EDITION_FACTOR,
+        "home_team": [f"team_{i:05d}" for i in range(MATCH_ID_EDITION_FACTOR)],
+        "away_team": ["Qatar"] * MATCH_ID_EDITION_FACTOR,
+        "edition": [2022] * MATCH_ID_EDITION_FACTOR,
+    })
+
+    assert fct_assign_match_id(df.iloc[:-1].copy())["match_id"].max() == 2022 * MATCH_ID_EDITION_FACTOR + 9999
+    with pytest.raises(ValueError, match="2022"):
+        fct_assign_match_id(df)
+
+
+def test_fct_assign_match_id_rejects_missing_edition():
+    """Une édition manquante donnerait une clé primaire nulle."""
+    df = pd.DataFrame({
+        "date": ["2022112017", "2022112110"],
+        "home_team": ["Qatar", "Senegal"],
+        "away_team": ["Ecuador", "Netherlands"],
+        "edition": [2022, None],
+    })
+
+    with pytest.raises(ValueError, match="édition"):
+        fct_assign_match_id(df)
+
+
+# ============================================================================
+# fct_regex_extract
+# ============================================================================
+from etl.utils import fct_regex_extract
+
+
+def test_fct_regex_extract_named_groups_and_missing_values():
+    """Groupes nommés extraits en une passe ; non-correspondances et groupes absents -> NA."""
+    series = pd.Series(["4-1", "1-1 a.e.t.", "x", None], index=[10, 11, 12, 13])
+
+    out = fct_regex_extract(series, r"^(?P<home>\d+)-(?P<away>\d+)(?:\s*(?P<aet>a\.e\.t\.))?")
+
+    assert list(out.columns) == ["home", "away", "aet"]
+    assert list(out.index) == [10, 11, 12, 13]
+    assert out.loc[10, "home"] == "4"
+    assert pd.isna(out.loc[10, "aet"])
+    assert out.loc[11, "aet"] == "a.e.t."
+    assert out.loc[[12, 13]].isna().all().all()
+
+
+# ============================================================================
+# fct_to_match_date
+# ============================================================================
+from etl.utils import fct_to_match_date
+
+
+def test_fct_to_match_date_formats():
+    """Année seule : date partielle, aucun jour inventé (None)."""
+    import datetime
+    out = fct_to_match_date(pd.Series(["1930", "20140612170000", None, "99999999999999"]))
+
+    assert out.tolist() == [
+        None,
+        datetime.date(2014, 6, 12),
+        None,
+        None,
+    ]
+
+
+def test_fct_invalid_match_dates_ignores_partial_and_missing():
+    from etl.utils import fct_invalid_match_dates
+
+    dates = pd.Series(["1930", "20140612170000", None, "99999999999999", "20140231", ""])
+
+    assert fct_invalid_match_dates(dates).tolist() == [False, False, False, True, True, False]
+
+
+# ============================================================================
+# fct_surrogate_keys / fct_lookup_keys
+# ============================================================================
+from etl.utils import fct_surrogate_keys, fct_lookup_keys
+
+
+def test_fct_surrogate_keys_and_lookup():
+    df = pd.DataFrame({"team_id": [7, 3, 7, 5], "name": ["C", "A", "C", "B"]})
+
+    dim, lookup = fct_surrogate_keys(df, "team_id", "team_key")
+
+    assert list(dim.columns) == ["team_key", "team_id", "name"]
+    assert dim["team_key"].tolist() == [1, 2, 3]
+    assert dim["team_id"].tolist() == [3, 5, 7]
+    assert lookup == {3: 1, 5: 2, 7: 3}
+
+    keys = fct_lookup_keys(pd.Series([7.0, 3, -999, None]), lookup)
+    assert str(keys.dtype) == "Int64"
+    assert keys.tolist()[:2] == [3, 1]
+    assert keys[2:].isna().all()